@@ -0,0 +1,134 @@
+"""
+Benchmarks Google Jobs result extraction: the legacy lazy-regex scan and
+recursive JSON walk against the anchored extractor in jobspy.google.util.
+
+Usage:
+    python benchmarks/google_extraction.py [--responses DIR] [--jobs N] [--repeat R]
+
+DIR may contain saved responses: initial*.html (the /search page) and
+page*.txt (async callback pages). Without it, synthetic responses shaped like
+Google's payloads are generated.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import time
+from pathlib import Path
+
+from jobspy.google.util import extract_jobs_next_page, find_job_info_initial_page
+
+
+def legacy_find_job_info(jobs_data):
+    if isinstance(jobs_data, dict):
+        for key, value in jobs_data.items():
+            if key == "520084652" and isinstance(value, list):
+                return value
+            else:
+                result = legacy_find_job_info(value)
+                if result:
+                    return result
+    elif isinstance(jobs_data, list):
+        for item in jobs_data:
+            result = legacy_find_job_info(item)
+            if result:
+                return result
+    return None
+
+
+def legacy_initial_page(html_text: str):
+    pattern = f'520084652":(' + r"\[.*?\]\s*])\s*}\s*]\s*]\s*]\s*]\s*]"
+    return [json.loads(m.group(1)) for m in re.finditer(pattern, html_text)]
+
+
+def legacy_next_page(job_data: str):
+    start_idx = job_data.find("[[[")
+    end_idx = job_data.rindex("]]]") + 3
+    parsed = json.loads(job_data[start_idx:end_idx])[0]
+    match_fc = re.search(r'data-async-fc="([^"]+)"', job_data)
+    jobs = []
+    for _, blob in parsed:
+        if blob.startswith("[[["):
+            jobs.append(legacy_find_job_info(json.loads(blob)))
+    return jobs, match_fc.group(1) if match_fc else None
+
+
+def synthetic_job(i: int) -> list:
+    job = [None] * 30
+    job[0] = f"Software Engineer {i}"
+    job[1] = f"Company {i % 97}"
+    job[2] = "San Francisco, CA, United States"
+    job[3] = [[f"https://example.com/jobs/{i}"]]
+    job[12] = f"{i % 30} days ago"
+    job[19] = ("Build and run distributed systems. " * 90) + f"Contact jobs{i}@x.io"
+    job[28] = f"job-{i}"
+    job[29] = [i, [i % 7]]
+    return job
+
+
+def synthetic_initial_page(num_jobs: int) -> str:
+    filler = "<div class='x'>" + ("lorem ipsum [dolor] sit amet " * 400) + "</div>"
+    parts = ['<html><div jsname="Yust4d" class="a" data-async-fc="CURSOR0"></div>']
+    for i in range(num_jobs):
+        job = json.dumps(synthetic_job(i))
+        parts.append(f'{filler}<script>x=[[[[[{{"520084652":{job}}}]]]]];</script>')
+    return "".join(parts) + "</html>"
+
+
+def synthetic_next_page(page: int, num_jobs: int) -> str:
+    arrays = []
+    for i in range(num_jobs):
+        job = synthetic_job(page * num_jobs + i)
+        blob = [[[{"meta": [1, 2, {"x": [3]}], "wrap": [{"520084652": job}]}]]]
+        arrays.append([f"id{i}", json.dumps(blob)])
+    return ")]}'\n" + json.dumps([arrays]) + f'<div data-async-fc="CURSOR{page}">'
+
+
+def load_responses(directory: Path | None, num_jobs: int):
+    if directory:
+        initial = [p.read_text() for p in sorted(directory.glob("initial*.html"))]
+        pages = [p.read_text() for p in sorted(directory.glob("page*.txt"))]
+        return initial, pages
+    return [synthetic_initial_page(num_jobs)], [
+        synthetic_next_page(page, num_jobs) for page in range(1, 91)
+    ]
+
+
+def bench(fn, inputs, repeat: int) -> tuple[float, list]:
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = [fn(text) for text in inputs]
+        best = min(best, time.perf_counter() - start)
+    return best, out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--responses", type=Path, default=None)
+    parser.add_argument("--jobs", type=int, default=10, help="synthetic jobs per page")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    initial, pages = load_responses(args.responses, args.jobs)
+    size_mb = sum(map(len, initial + pages)) / 1e6
+    print(f"{len(initial)} initial pages, {len(pages)} async pages, {size_mb:.1f} MB")
+
+    for name, legacy, current, inputs in (
+        ("initial page", legacy_initial_page, find_job_info_initial_page, initial),
+        ("async pages", legacy_next_page, extract_jobs_next_page, pages),
+    ):
+        t_legacy, out_legacy = bench(legacy, inputs, args.repeat)
+        t_current, out_current = bench(current, inputs, args.repeat)
+        same = "same output" if out_legacy == out_current else "OUTPUT DIFFERS"
+        print(
+            f"{name:>13}: legacy {t_legacy * 1000:8.1f} ms | "
+            f"extractor {t_current * 1000:8.1f} ms | "
+            f"{t_legacy / t_current:5.1f}x | {same}"
+        )
+
+
+if __name__ == "__main__":
+    main()
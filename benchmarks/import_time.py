@@ -0,0 +1,83 @@
+"""
+Benchmarks cold-start time of `import jobspy` plus loading the scrapers for a
+subset of sites, each measured in a fresh interpreter.
+
+Usage:
+    python benchmarks/import_time.py [--repeat R] [--sites indeed,linkedin ...]
+
+The "eager" row imports what `import jobspy` used to pull in up front (pandas
+and every scraper package) for comparison.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES = ["pandas", "numpy", "tls_client", "bs4", "markdownify", "regex"]
+
+SUBSETS = {
+    "none": [],
+    "indeed": ["indeed"],
+    "google": ["google"],
+    "linkedin": ["linkedin"],
+    "indeed,glassdoor": ["indeed", "glassdoor"],
+    "all": ["linkedin", "indeed", "zip_recruiter", "glassdoor", "google", "bayt"],
+}
+
+PROGRAM = """
+import sys, time
+start = time.perf_counter()
+import jobspy
+from jobspy.model import Site
+from jobspy.registry import get_scraper_class
+for site in {sites!r}:
+    get_scraper_class(Site(site))
+{extra}
+elapsed = time.perf_counter() - start
+loaded = [m for m in {heavy!r} if m in sys.modules]
+print(elapsed, ",".join(loaded))
+"""
+
+
+def measure(sites: list[str], repeat: int, eager: bool = False) -> tuple:
+    program = PROGRAM.format(
+        sites=sites, heavy=HEAVY_MODULES, extra="import pandas" if eager else ""
+    )
+    times, loaded = [], ""
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", program],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split()
+        times.append(float(output[0]))
+        loaded = output[1] if len(output) > 1 else "-"
+    return statistics.median(times), loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--sites", nargs="*", default=None)
+    args = parser.parse_args()
+
+    subsets = SUBSETS
+    if args.sites:
+        subsets = {subset: subset.split(",") for subset in args.sites}
+
+    eager, _ = measure(SUBSETS["all"], args.repeat, eager=True)
+    print(f"{'eager (old import jobspy)':>28}: {eager * 1000:7.1f} ms")
+    for label, sites in subsets.items():
+        elapsed, loaded = measure(sites, args.repeat)
+        print(
+            f"{label:>28}: {elapsed * 1000:7.1f} ms "
+            f"({eager / elapsed:4.1f}x faster) heavy modules loaded: {loaded}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Benchmarks JSON decode/encode per site for the stdlib and the accelerated
+backend used by jobspy.util.json_loads / json_dumps (orjson when installed).
+
+Usage:
+    python benchmarks/json_decode.py [--responses DIR] [--repeat R]
+
+DIR may contain saved response bodies named <site>*.json (indeed, glassdoor,
+ziprecruiter). Without it, synthetic payloads shaped like each API are used.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from jobspy.util import json_backend, json_dumps, json_loads
+
+DESCRIPTION_HTML = "<p>Build <b>distributed</b> systems &amp; APIs.</p>" * 80
+
+
+def indeed_page(num_jobs: int = 100) -> bytes:
+    results = []
+    for i in range(num_jobs):
+        results.append(
+            {
+                "trackingKey": f"tk{i}",
+                "job": {
+                    "key": f"{i:016x}",
+                    "title": "Software Engineer",
+                    "datePublished": 1700000000000,
+                    "description": {"html": DESCRIPTION_HTML},
+                    "location": {"city": "Austin", "admin1Code": "TX"},
+                    "attributes": [{"key": "CF3CP", "label": "Full-time"}] * 4,
+                    "employer": {
+                        "name": f"Company {i}",
+                        "dossier": {
+                            "employerDetails": {
+                                "addresses": ["1 Main St, Austin, TX"],
+                                "industry": "Technology",
+                                "briefDescription": "We make things. " * 40,
+                            },
+                            "images": {"squareLogoUrl": "https://x/logo.png"},
+                        },
+                    },
+                },
+            }
+        )
+    page_info = {"nextCursor": "c"}
+    body = {"data": {"jobSearch": {"pageInfo": page_info, "results": results}}}
+    return json.dumps(body).encode()
+
+
+def glassdoor_page(num_jobs: int = 30) -> bytes:
+    listings = [
+        {
+            "jobview": {
+                "header": {
+                    "ageInDays": i % 5,
+                    "employer": {"id": i, "name": f"Company {i}"},
+                    "jobTitleText": "Data Engineer",
+                    "locationName": "Boston, MA",
+                    "payPeriodAdjustedPay": {"p10": 100000, "p90": 150000},
+                },
+                "job": {"listingId": 1000 + i, "description": None},
+                "overview": {"squareLogoUrl": "https://x/logo.png"},
+            }
+        }
+        for i in range(num_jobs)
+    ]
+    cursors = [{"cursor": f"c{p}", "pageNumber": p} for p in range(1, 31)]
+    job_listings = {"jobListings": listings, "paginationCursors": cursors}
+    body = [{"data": {"jobListings": job_listings}}]
+    return json.dumps(body).encode()
+
+
+def ziprecruiter_page(num_jobs: int = 20) -> bytes:
+    jobs = [
+        {
+            "listing_key": f"lk{i}",
+            "name": "Backend Developer",
+            "job_description": DESCRIPTION_HTML,
+            "hiring_company": {"name": f"Company {i}"},
+            "posted_time": "2024-05-01T12:00:00Z",
+            "compensation_min": 90000,
+            "compensation_max": 130000,
+        }
+        for i in range(num_jobs)
+    ]
+    return json.dumps({"jobs": jobs, "continue": "token"}).encode()
+
+
+def load_payloads(directory: Path | None) -> dict[str, list[bytes]]:
+    payloads = {
+        "indeed": [indeed_page()],
+        "glassdoor": [glassdoor_page()],
+        "ziprecruiter": [ziprecruiter_page()],
+    }
+    if directory:
+        for site in payloads:
+            saved = [p.read_bytes() for p in sorted(directory.glob(f"{site}*.json"))]
+            if saved:
+                payloads[site] = saved
+    return payloads
+
+
+def bench(fn, inputs, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for data in inputs:
+            fn(data)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--responses", type=Path, default=None)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"accelerated backend: {json_backend}")
+    for site, inputs in load_payloads(args.responses).items():
+        size_kb = sum(map(len, inputs)) / 1e3
+        decoded = [json.loads(data) for data in inputs]
+        t_std = bench(json.loads, inputs, args.repeat)
+        t_fast = bench(json_loads, inputs, args.repeat)
+        t_std_enc = bench(json.dumps, decoded, args.repeat)
+        t_fast_enc = bench(json_dumps, decoded, args.repeat)
+        print(
+            f"{site:>12} ({size_kb:7.1f} KB): decode stdlib {t_std * 1000:6.2f} ms, "
+            f"{json_backend} {t_fast * 1000:6.2f} ms ({t_std / t_fast:4.1f}x) | "
+            f"encode stdlib {t_std_enc * 1000:6.2f} ms, "
+            f"{json_backend} {t_fast_enc * 1000:6.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
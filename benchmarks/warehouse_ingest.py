@@ -0,0 +1,71 @@
+"""
+Benchmarks JobWarehouse bulk upsert throughput and filtered query latency.
+
+Usage:
+    python benchmarks/warehouse_ingest.py [--rows N] [--path FILE]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+
+from jobspy.storage import JobWarehouse
+
+SITES = ["indeed", "linkedin", "glassdoor", "zip_recruiter", "google"]
+
+
+def synthetic_rows(num_rows: int, run: int = 0) -> list[dict]:
+    today = date.today()
+    return [
+        {
+            "id": f"{SITES[i % 5][:2]}-{i}",
+            "site": SITES[i % 5],
+            "job_url": f"https://example.com/jobs/{i}",
+            "title": f"Software Engineer {i % 300}",
+            "company": f"Company {i % 2000}",
+            "location": "Austin, TX, US",
+            "date_posted": today - timedelta(days=i % 30),
+            "interval": "yearly",
+            "min_amount": 80000.0 + (i % 50) * 1000,
+            "max_amount": 120000.0 + (i % 50) * 1000 + run,
+            "description": "Build and run distributed systems. " * 60,
+        }
+        for i in range(num_rows)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--path", default=None)
+    args = parser.parse_args()
+
+    path = args.path or os.path.join(tempfile.mkdtemp(), "jobs.db")
+    with JobWarehouse(path) as warehouse:
+        for run, label in ((0, "insert"), (1, "upsert")):
+            rows = synthetic_rows(args.rows, run)
+            start = time.perf_counter()
+            written = warehouse.upsert(rows)
+            elapsed = time.perf_counter() - start
+            print(
+                f"{label}: {written} rows in {elapsed:.2f}s "
+                f"({written / elapsed * 60:,.0f} rows/min)"
+            )
+
+        start = time.perf_counter()
+        df = warehouse.query(
+            site="indeed",
+            company="Company 42",
+            posted_after=date.today() - timedelta(days=7),
+            min_salary=100000,
+        )
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"filtered query: {len(df)} rows in {elapsed:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
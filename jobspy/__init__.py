@@ -1,17 +1,40 @@
 from __future__ import annotations
 
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Tuple
+import time
+from concurrent.futures import TimeoutError, as_completed
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Callable, Container, Tuple
 
-import pandas as pd
-
-from jobspy.bayt import BaytScraper
-from jobspy.glassdoor import Glassdoor
-from jobspy.google import Google
-from jobspy.indeed import Indeed
-from jobspy.linkedin import LinkedIn
+from jobspy.checkpoint import CheckpointStore
+from jobspy.circuit_breaker import (
+    BreakerState,
+    CircuitBreaker,
+    circuit_breaker_states,
+    configure_circuit_breakers,
+    get_circuit_breaker,
+)
+from jobspy.company_cache import CompanyCache
+from jobspy.content_cache import DerivedFieldCache
+from jobspy.description_store import DescriptionStore
+from jobspy.duplicates import DuplicateIndex
+from jobspy.early_stop import EarlyStop
+from jobspy.filters import ListingFilter
+from jobspy.governor import ExecutionGovernor, configure_governor, get_governor
+from jobspy.hedging import Hedger
 from jobspy.model import JobType, Location, JobResponse, Country
 from jobspy.model import SalarySource, ScraperInput, Site
+from jobspy.registry import SCRAPER_REGISTRY, get_scraper_class
+from jobspy.results import job_to_row, rows_to_dataframe, scrape_fields
+from jobspy.scheduler import SearchScheduler
+from jobspy.search_index import JobSearchIndex
+from jobspy.storage import JobWarehouse
+from jobspy.telemetry import (
+    MetricsHook,
+    ProgressCallback,
+    ProgressEvent,
+    ProgressEventType,
+    ScrapeStats,
+)
 from jobspy.util import (
     set_logger_level,
     extract_salary,
@@ -20,8 +43,24 @@ from jobspy.util import (
     map_str_to_site,
     convert_to_annual,
     desired_order,
+    when_done,
 )
-from jobspy.ziprecruiter import ZipRecruiter
+from jobspy.workqueue import Coordinator, Worker, open_queue, run_worker_processes
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# seconds scrapers get past the deadline to hand back their partial results
+DEADLINE_GRACE = 1.0
+
+# scraper classes stay importable from the package, but load on first access
+_LAZY_SCRAPERS = {name: site for site, (_, name) in SCRAPER_REGISTRY.items()}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_SCRAPERS:
+        return get_scraper_class(_LAZY_SCRAPERS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def scrape_jobs(
@@ -44,21 +83,50 @@ def scrape_jobs(
     hours_old: int = None,
     enforce_annual_salary: bool = False,
     verbose: int = 0,
+    return_stats: bool = False,
+    metrics_hooks: list[MetricsHook] | None = None,
+    progress_callback: ProgressCallback | None = None,
+    deadline: float | None = None,
+    per_site_timeout: float | None = None,
+    content_cache: DerivedFieldCache | str | None = None,
+    hedge_budget: float | None = None,
+    known_ids: Container[str] | JobWarehouse | JobSearchIndex | None = None,
+    posted_cutoff: date | datetime | None = None,
+    early_stop_after: int = 10,
+    pre_detail_filter: Callable[[dict], bool] | None = None,
+    checkpoint: CheckpointStore | str | None = None,
+    page_prefetch: int = 1,
+    fields: list[str] | None = None,
+    filters: ListingFilter | dict | None = None,
+    share_details: bool = False,
+    company_cache: CompanyCache | str | None = None,
+    description_store: DescriptionStore | bool | None = None,
     **kwargs,
-) -> pd.DataFrame:
+) -> pd.DataFrame | Tuple[pd.DataFrame, dict[str, dict]]:
     """
     Scrapes job data from job boards concurrently
-    :return: Pandas DataFrame containing job data
+    :param return_stats: also return per-site telemetry (requests, bytes, 429s, phase timings)
+    :param metrics_hooks: MetricsHook instances notified of every request and finished site
+    :param progress_callback: called with a ProgressEvent as each site fetches pages, parses jobs and finishes
+    :param deadline: seconds after which the call returns whatever jobs have been collected
+    :param per_site_timeout: seconds each site may spend before returning what it has
+    :param content_cache: DerivedFieldCache or its path; unchanged descriptions reuse derived fields
+    :param hedge_budget: fraction of detail requests that may be duplicated when slower than the site's p90 (opt-in)
+    :param known_ids: ids of stored postings, or a JobWarehouse / JobSearchIndex to look them up in
+    :param posted_cutoff: postings posted before this (naive local time) count as already seen
+    :param early_stop_after: consecutive known or pre-cutoff postings after which a site stops paginating
+    :param pre_detail_filter: called with each listing's search-card fields (id, title, company, location, compensation, date_posted); False drops it before any detail request
+    :param checkpoint: CheckpointStore or its path; pagination cursors and collected jobs are saved after every page, so repeating an interrupted call resumes it and deep offsets start from a stored cursor
+    :param page_prefetch: LinkedIn and Bayt search pages requested concurrently (each through the next proxy) instead of one at a time, with the inter-page sleep once per batch
+    :param fields: columns to return (see jobspy.util.desired_order); sites skip detail requests and query selections that only fill other columns (US salary columns still get descriptions, which salaries are parsed from)
+    :param filters: ListingFilter, or its kwargs (title_include, title_exclude, company_blocklist, min_compensation, max_compensation, remote_only); applied to search cards before detail requests and again to the final rows
+    :param share_details: the same posting found on several boards (same title, company and city, or direct url) gets one description request; the other boards attach the shared description (opt-in)
+    :param company_cache: CompanyCache or its path; employer metadata (company_* columns) is reused across runs, and Indeed leaves employer dossiers out of its search query while most employers on its pages are cached
+    :param description_store: DescriptionStore, or True for an in-memory one; the description column then holds compressed references, one per distinct text, that decode on str() / display / to_csv
+    :return: Pandas DataFrame containing job data, and a dict of site -> stats if return_stats
     """
-    SCRAPER_MAPPING = {
-        Site.LINKEDIN: LinkedIn,
-        Site.INDEED: Indeed,
-        Site.ZIP_RECRUITER: ZipRecruiter,
-        Site.GLASSDOOR: Glassdoor,
-        Site.GOOGLE: Google,
-        Site.BAYT: BaytScraper,
-    }
     set_logger_level(verbose)
+    call_deadline = time.monotonic() + deadline if deadline is not None else None
     job_type = get_enum_from_value(job_type) if job_type else None
 
     def get_site_type():
@@ -75,6 +143,38 @@ def scrape_jobs(
         return site_types
 
     country_enum = Country.from_string(country_indeed)
+    if fields is not None:
+        unknown = set(fields) - set(desired_order)
+        if unknown:
+            raise ValueError(
+                f"Invalid fields: {', '.join(sorted(unknown))}. "
+                f"Valid fields are: {', '.join(desired_order)}"
+            )
+        fields = sorted(set(fields))
+    owns_cache = isinstance(content_cache, str)
+    if owns_cache:
+        content_cache = DerivedFieldCache(content_cache)
+    if isinstance(filters, dict):
+        filters = ListingFilter(**filters)
+    card_filter = pre_detail_filter
+    if filters is not None and pre_detail_filter is not None:
+
+        def card_filter(card: dict) -> bool:
+            return filters(card) and pre_detail_filter(card)
+
+    elif filters is not None:
+        card_filter = filters
+    duplicates = DuplicateIndex() if share_details else None
+    owns_company_cache = isinstance(company_cache, str)
+    if owns_company_cache:
+        company_cache = CompanyCache(company_cache)
+    if description_store is True:
+        description_store = DescriptionStore()
+    elif description_store is False:
+        description_store = None
+    owns_checkpoint = isinstance(checkpoint, str)
+    if owns_checkpoint:
+        checkpoint = CheckpointStore(checkpoint)
 
     scraper_input = ScraperInput(
         site_type=get_site_type(),
@@ -92,111 +192,156 @@ def scrape_jobs(
         linkedin_company_ids=linkedin_company_ids,
         offset=offset,
         hours_old=hours_old,
+        fields=scrape_fields(fields, country_enum, filters),
     )
 
     def scrape_site(site: Site) -> Tuple[str, JobResponse]:
-        scraper_class = SCRAPER_MAPPING[site]
+        site_deadline = call_deadline
+        if per_site_timeout is not None:
+            site_limit = time.monotonic() + per_site_timeout
+            site_deadline = min(site_deadline or site_limit, site_limit)
+        site_input = scraper_input.model_copy(update={"deadline": site_deadline})
+
+        scraper_class = get_scraper_class(site)
         scraper = scraper_class(proxies=proxies, ca_cert=ca_cert)
-        scraped_data: JobResponse = scraper.scrape(scraper_input)
+        site_to_scraper[site.value] = scraper
+        scraper.content_cache = content_cache
+        breaker = get_circuit_breaker(site.value)
+        scraper.circuit_breaker = breaker
+        if hedge_budget:
+            scraper.hedger = Hedger(site.value, scraper.stats, hedge_budget)
+        if known_ids is not None or posted_cutoff is not None:
+            site_known_ids = known_ids
+            if hasattr(known_ids, "known_ids"):
+                site_known_ids = known_ids.known_ids(site=site.value)
+            scraper.early_stop = EarlyStop(
+                site_known_ids, posted_cutoff, early_stop_after
+            )
+        scraper.pre_detail_filter = card_filter
+        scraper.page_prefetch = max(page_prefetch, 1)
+        scraper.duplicates = duplicates
+        scraper.company_cache = company_cache
+        scraper.description_store = description_store
+        if checkpoint is not None:
+            scraper.checkpoint = checkpoint.crawl(site.value, site_input)
+        scraper.stats.hooks = [breaker, *(metrics_hooks or [])]
+        scraper.stats.progress_callback = progress_callback
+        scraper.stats.results_wanted = scraper_input.results_wanted
+        scraper.stats.start()
+        try:
+            scraped_data: JobResponse = scraper.scrape(site_input)
+        finally:
+            if site in probing_sites:
+                breaker.probe_finished()
+        if scraper.checkpoint is not None and scraper.stats.complete:
+            scraper.checkpoint.finish()
+        scraper.stats.incr("jobs_yielded", len(scraped_data.jobs))
+        scraper.stats.finish()
+        site_to_stats[site.value] = scraper.stats.as_dict()
         cap_name = site.value.capitalize()
         site_name = "ZipRecruiter" if cap_name == "Zip_recruiter" else cap_name
         create_logger(site_name).info(f"finished scraping")
         return site.value, scraped_data
 
     site_to_jobs_dict = {}
+    site_to_stats = {}
+    site_to_scraper = {}
+    skipped_sites = []
+    probing_sites = set()
 
     def worker(site):
         site_val, scraped_info = scrape_site(site)
         return site_val, scraped_info
 
-    with ThreadPoolExecutor() as executor:
-        future_to_site = {
-            executor.submit(worker, site): site for site in scraper_input.site_type
-        }
+    # boards whose circuit breaker is open are skipped without a request
+    sites_to_scrape = []
+    for site in scraper_input.site_type:
+        admission = get_circuit_breaker(site.value).admit()
+        if admission is None:
+            create_logger("JobSpy").warning(f"{site.value} skipped: circuit open")
+            stats = ScrapeStats(site.value)
+            stats.complete = False
+            stats.skipped = True
+            site_to_stats[site.value] = stats.as_dict()
+            skipped_sites.append(site.value)
+            continue
+        if admission == BreakerState.HALF_OPEN:
+            probing_sites.add(site)
+        sites_to_scrape.append(site)
 
-        for future in as_completed(future_to_site):
+    governor = get_governor()
+    future_to_site = {
+        governor.submit_site(worker, site): site for site in sites_to_scrape
+    }
+    wait_timeout = (
+        call_deadline - time.monotonic() + DEADLINE_GRACE
+        if call_deadline is not None
+        else None
+    )
+    try:
+        for future in as_completed(future_to_site, timeout=wait_timeout):
             site_value, scraped_data = future.result()
             site_to_jobs_dict[site_value] = scraped_data
+    except TimeoutError:
+        # sites that finished meanwhile are collected as usual; those still
+        # running past the deadline return the jobs of the pages they got
+        for future, site in future_to_site.items():
+            if site.value in site_to_jobs_dict:
+                continue
+            if future.done() and not future.cancelled():
+                site_value, scraped_data = future.result()
+                site_to_jobs_dict[site_value] = scraped_data
+                continue
+            create_logger("JobSpy").warning(f"{site.value} missed the deadline")
+            scraper = site_to_scraper.get(site.value)
+            stats = scraper.stats if scraper else ScrapeStats(site.value)
+            stats.complete = False
+            if scraper is not None and scraper.scraper_input is not None:
+                site_to_jobs_dict[site.value] = scraper.partial_response()
+                stats.incr("jobs_yielded", len(site_to_jobs_dict[site.value].jobs))
+            site_to_stats[site.value] = stats.as_dict()
+    finally:
+        for future, site in future_to_site.items():
+            if future.cancel() and site in probing_sites:
+                get_circuit_breaker(site.value).probe_finished()
 
-    jobs_dfs: list[pd.DataFrame] = []
-
-    for site, job_response in site_to_jobs_dict.items():
-        for job in job_response.jobs:
-            job_data = job.dict()
-            job_url = job_data["job_url"]
-            job_data["site"] = site
-            job_data["company"] = job_data["company_name"]
-            job_data["job_type"] = (
-                ", ".join(job_type.value[0] for job_type in job_data["job_type"])
-                if job_data["job_type"]
-                else None
-            )
-            job_data["emails"] = (
-                ", ".join(job_data["emails"]) if job_data["emails"] else None
-            )
-            if job_data["location"]:
-                job_data["location"] = Location(
-                    **job_data["location"]
-                ).display_location()
-
-            compensation_obj = job_data.get("compensation")
-            if compensation_obj and isinstance(compensation_obj, dict):
-                job_data["interval"] = (
-                    compensation_obj.get("interval").value
-                    if compensation_obj.get("interval")
-                    else None
-                )
-                job_data["min_amount"] = compensation_obj.get("min_amount")
-                job_data["max_amount"] = compensation_obj.get("max_amount")
-                job_data["currency"] = compensation_obj.get("currency", "USD")
-                job_data["salary_source"] = SalarySource.DIRECT_DATA.value
-                if enforce_annual_salary and (
-                    job_data["interval"]
-                    and job_data["interval"] != "yearly"
-                    and job_data["min_amount"]
-                    and job_data["max_amount"]
-                ):
-                    convert_to_annual(job_data)
+    rows = [
+        job_to_row(job, site, country_enum, enforce_annual_salary, content_cache)
+        for site, job_response in site_to_jobs_dict.items()
+        for job in job_response.jobs
+    ]
+    if filters is not None:
+        rows = [row for row in rows if filters.keep_row(row)]
+    if description_store is not None:
+        # jobs resumed from a checkpoint come back with plain texts
+        for row in rows:
+            row["description"] = description_store.add(row["description"])
+    jobs_df = rows_to_dataframe(rows, fields)
 
+    def close_stores():
+        if content_cache is not None:
+            if owns_cache:
+                content_cache.close()
             else:
-                if country_enum == Country.USA:
-                    (
-                        job_data["interval"],
-                        job_data["min_amount"],
-                        job_data["max_amount"],
-                        job_data["currency"],
-                    ) = extract_salary(
-                        job_data["description"],
-                        enforce_annual_salary=enforce_annual_salary,
-                    )
-                    job_data["salary_source"] = SalarySource.DESCRIPTION.value
-
-            job_data["salary_source"] = (
-                job_data["salary_source"]
-                if "min_amount" in job_data and job_data["min_amount"]
-                else None
-            )
-            job_df = pd.DataFrame([job_data])
-            jobs_dfs.append(job_df)
-
-    if jobs_dfs:
-        # Step 1: Filter out all-NA columns from each DataFrame before concatenation
-        filtered_dfs = [df.dropna(axis=1, how="all") for df in jobs_dfs]
-
-        # Step 2: Concatenate the filtered DataFrames
-        jobs_df = pd.concat(filtered_dfs, ignore_index=True)
-
-        # Step 3: Ensure all desired columns are present, adding missing ones as empty
-        for column in desired_order:
-            if column not in jobs_df.columns:
-                jobs_df[column] = None  # Add missing columns as empty
-
-        # Reorder the DataFrame according to the desired order
-        jobs_df = jobs_df[desired_order]
-
-        # Step 4: Sort the DataFrame as required
-        return jobs_df.sort_values(
-            by=["site", "date_posted"], ascending=[True, False]
-        ).reset_index(drop=True)
-    else:
-        return pd.DataFrame()
+                content_cache.flush()
+
+        if company_cache is not None:
+            if owns_company_cache:
+                company_cache.close()
+            else:
+                company_cache.flush()
+
+        if owns_checkpoint:
+            checkpoint.close()
+
+    # sites that missed the deadline keep writing to the stores until they
+    # notice it, so the stores are closed (or flushed) once they have finished
+    when_done([future for future in future_to_site if not future.done()], close_stores)
+
+    jobs_df.attrs["site_complete"] = {
+        site: stats["complete"] for site, stats in site_to_stats.items()
+    }
+    jobs_df.attrs["skipped_sites"] = skipped_sites
+    if return_stats:
+        return jobs_df, site_to_stats
+    return jobs_df
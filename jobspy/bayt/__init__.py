@@ -1,7 +1,7 @@
 from __future__ import annotations
 
+import hashlib
 import random
-import time
 
 from bs4 import BeautifulSoup
 
@@ -35,48 +35,88 @@ class BaytScraper(Scraper):
     def scrape(self, scraper_input: ScraperInput) -> JobResponse:
         self.scraper_input = scraper_input
         self.session = create_session(
-            proxies=self.proxies, ca_cert=self.ca_cert, is_tls=False, has_retry=True
+            proxies=self.proxies,
+            ca_cert=self.ca_cert,
+            is_tls=False,
+            has_retry=True,
+            stats=self.stats,
         )
-        job_list: list[JobPost] = []
-        page = 1
+        # Bayt pages by number; the checkpoint resumes an interrupted run
+        resume = self.crawl_start()
+        job_list: list[JobPost] = resume.jobs
+        page = resume.cursor if resume.resumed else 1
         results_wanted = (
             scraper_input.results_wanted if scraper_input.results_wanted else 10
         )
 
-        while len(job_list) < results_wanted:
-            log.info(f"Fetching Bayt jobs page {page}")
-            job_elements = self._fetch_jobs(self.scraper_input.search_term, page)
-            if not job_elements:
+        seen_ids = {job_post.id for job_post in job_list}
+        # listings paged through, kept or not
+        seen_urls = {job_post.job_url for job_post in job_list}
+        query = self.scraper_input.search_term
+
+        finished = False
+        while len(job_list) < results_wanted and not finished:
+            if self.should_stop():
+                log.warning(f"stopping early, returning after page {page - 1}")
                 break
+            # with page_prefetch > 1 the next pages are requested together and
+            # then processed in page order
+            batch = list(range(page, page + self.page_prefetch))
+            log.info(f"Fetching Bayt jobs pages {batch[0]}-{batch[-1]}")
+            pages = self.fetch_pages(lambda n: self._fetch_jobs(query, n), batch)
+            finished = len(pages) < len(batch)
+            for page, job_elements in zip(batch, pages):
+                if not job_elements:
+                    finished = True
+                    break
 
-            if job_elements:
                 log.debug(
                     "First job element snippet:\n" + job_elements[0].prettify()[:500]
                 )
 
-            initial_count = len(job_list)
-            for job in job_elements:
-                try:
-                    job_post = self._extract_job_info(job)
-                    if job_post:
-                        job_list.append(job_post)
-                        if len(job_list) >= results_wanted:
-                            break
-                    else:
-                        log.debug(
-                            "Extraction returned None. Job snippet:\n"
-                            + job.prettify()[:500]
-                        )
-                except Exception as e:
-                    log.error(f"Bayt: Error extracting job info: {str(e)}")
-                    continue
-
-            if len(job_list) == initial_count:
-                log.info(f"No new jobs found on page {page}. Ending pagination.")
-                break
+                # Bayt repeats its last page past the end of the results
+                page_urls = {self._listing_url(job) for job in job_elements}
+                page_urls.discard(None)
+                if not page_urls - seen_urls:
+                    log.info(f"No new jobs found on page {page}. Ending pagination.")
+                    finished = True
+                    break
+                seen_urls |= page_urls
+
+                initial_count = len(job_list)
+                for job in job_elements:
+                    try:
+                        with self.stats.phase("parse"):
+                            job_post = self._extract_job_info(job)
+                        if job_post and job_post.id not in seen_ids:
+                            seen_ids.add(job_post.id)
+                            job_list.append(job_post)
+                            if len(job_list) >= results_wanted:
+                                break
+                        elif not job_post:
+                            log.debug(
+                                "Extraction returned None. Job snippet:\n"
+                                + job.prettify()[:500]
+                            )
+                    except Exception as e:
+                        log.error(f"Bayt: Error extracting job info: {str(e)}")
+                        continue
+
+                self.stats.jobs_parsed(len(job_list) - initial_count)
+                self.checkpoint_page(len(job_list), page + 1, job_list[initial_count:])
+                # Bayt cards carry no posting date, so only known ids stop early
+                if self.observe_listings(
+                    (job_post.id, None) for job_post in job_list[initial_count:]
+                ):
+                    log.info(f"reached known postings on page {page}")
+                    finished = True
+                    break
+                if len(job_list) >= results_wanted:
+                    break
 
             page += 1
-            time.sleep(random.uniform(self.delay, self.delay + self.band_delay))
+            if not finished and len(job_list) < results_wanted:
+                self.sleep(random.uniform(self.delay, self.delay + self.band_delay))
 
         job_list = job_list[: scraper_input.results_wanted]
         return JobResponse(jobs=job_list)
@@ -87,10 +127,12 @@ class BaytScraper(Scraper):
         """
         try:
             url = f"{self.base_url}/en/international/jobs/{query}-jobs/?page={page}"
-            response = self.session.get(url)
+            response = self.session.get(url, timeout=self.request_timeout(None))
             response.raise_for_status()
-            soup = BeautifulSoup(response.text, "html.parser")
-            job_listings = soup.find_all("li", attrs={"data-js-job": ""})
+            self.stats.page_fetched()
+            with self.stats.phase("parse"):
+                soup = BeautifulSoup(response.text, "html.parser")
+                job_listings = soup.find_all("li", attrs={"data-js-job": ""})
             log.debug(f"Found {len(job_listings)} job listing elements")
             return job_listings
         except Exception as e:
@@ -123,11 +165,17 @@ class BaytScraper(Scraper):
         location_tag = job.find("div", class_="t-mute t-small")
         location = location_tag.get_text(strip=True) if location_tag else None
 
-        job_id = f"bayt-{abs(hash(job_url))}"
+        # stable across runs (unlike hash()), so ids can be matched to stored ones
+        url_digest = hashlib.blake2b(job_url.encode(), digest_size=8).digest()
+        job_id = f"bayt-{int.from_bytes(url_digest, 'big')}"
         location_obj = Location(
             city=location,
             country=Country.from_string(self.country),
         )
+        if not self.keep_listing(
+            id=job_id, title=job_title, company=company_name, location=location_obj
+        ):
+            return None
         return JobPost(
             id=job_id,
             title=job_title,
@@ -136,6 +184,13 @@ class BaytScraper(Scraper):
             job_url=job_url,
         )
 
+    def _listing_url(self, job: BeautifulSoup) -> str | None:
+        """The job URL of a listing element, before any filtering"""
+        job_general_information = job.find("h2")
+        if not job_general_information:
+            return None
+        return self._extract_job_url(job_general_information)
+
     def _extract_job_url(self, job_general_information: BeautifulSoup) -> str | None:
         """
         Pulls the job URL from the 'a' within the h2 element.
@@ -0,0 +1,219 @@
+"""
+jobspy.checkpoint
+~~~~~~~~~~~~~~~~~~~
+
+Persisted pagination state, so an interrupted crawl resumes where it stopped
+and a deep offset starts from a stored cursor instead of re-walking the pages
+before it. After every results page a scraper records the cursor for the next
+page at the listing position it continues from, and the page's jobs are
+appended to the run's checkpoint. A run that completes drops its checkpoint;
+its cursors stay available to later offsets of the same search until they are
+older than max_age (sites expire their cursors, and result sets drift).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import time
+from typing import Any
+
+from jobspy.model import ResumePoint
+from jobspy.util import json_dumps, json_loads
+
+# ScraperInput fields that do not change which listings a search pages through
+_NOT_SEARCH_FIELDS = {"site_type", "offset", "results_wanted", "deadline"}
+
+
+def _digest(*parts) -> str:
+    return hashlib.blake2b(json_dumps(parts), digest_size=16).hexdigest()
+
+
+class CheckpointStore:
+    def __init__(self, path: str = "jobs.db", max_age: float = 3600.0):
+        """
+        :param path: SQLite database file; may be shared with a JobWarehouse
+        :param max_age: seconds after which stored cursors and unfinished runs
+            are no longer used
+        """
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self._lock, self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS crawl_cursors "
+                "(search_key TEXT NOT NULL, position INTEGER NOT NULL, "
+                "cursor TEXT NOT NULL, saved_at REAL NOT NULL, "
+                "PRIMARY KEY (search_key, position))"
+            )
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS crawl_runs "
+                "(run_key TEXT PRIMARY KEY, site TEXT NOT NULL, "
+                "base INTEGER NOT NULL, position INTEGER NOT NULL, cursor TEXT, "
+                "saved_at REAL NOT NULL)"
+            )
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS crawl_jobs "
+                "(run_key TEXT NOT NULL, seq INTEGER NOT NULL, job TEXT NOT NULL, "
+                "PRIMARY KEY (run_key, seq))"
+            )
+        self.prune()
+
+    def crawl(self, site: str, scraper_input) -> CrawlCheckpoint:
+        """Checkpoint of one site's crawl for a ScraperInput"""
+        search = scraper_input.model_dump(mode="json", exclude=_NOT_SEARCH_FIELDS)
+        search_key = _digest(site, search)
+        run_key = _digest(
+            search_key, scraper_input.offset, scraper_input.results_wanted
+        )
+        return CrawlCheckpoint(self, site, search_key, run_key)
+
+    def nearest_cursor(self, search_key: str, offset: int) -> tuple[int, Any] | None:
+        """(position, cursor) stored closest at or before an offset, or None"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT position, cursor FROM crawl_cursors "
+                "WHERE search_key = ? AND position > 0 AND position <= ? "
+                "AND saved_at >= ? ORDER BY position DESC LIMIT 1",
+                (search_key, offset, time.time() - self.max_age),
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], json_loads(row[1])
+
+    def load_run(self, run_key: str) -> tuple[int, int, Any, list[str]] | None:
+        """(base, position, cursor, job JSON) of an unfinished run, or None"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT base, position, cursor FROM crawl_runs "
+                "WHERE run_key = ? AND saved_at >= ?",
+                (run_key, time.time() - self.max_age),
+            ).fetchone()
+            if row is None:
+                return None
+            jobs = [
+                job
+                for (job,) in self.conn.execute(
+                    "SELECT job FROM crawl_jobs WHERE run_key = ? ORDER BY seq",
+                    (run_key,),
+                )
+            ]
+        base, position, cursor = row
+        cursor = json_loads(cursor) if cursor is not None else None
+        return base, position, cursor, jobs
+
+    def save_page(
+        self,
+        site: str,
+        search_key: str,
+        run_key: str,
+        base: int,
+        position: int,
+        cursor: Any,
+        jobs: list[str],
+    ):
+        """
+        Records a fetched page in one transaction: the run's progress, the
+        page's jobs (as JSON) and the cursor continuing from position
+        """
+        now = time.time()
+        cursor_json = json_dumps(cursor).decode() if cursor is not None else None
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO crawl_runs VALUES (?, ?, ?, ?, ?, ?)",
+                (run_key, site, base, position, cursor_json, now),
+            )
+            (seq,) = self.conn.execute(
+                "SELECT COALESCE(MAX(seq), -1) + 1 FROM crawl_jobs WHERE run_key = ?",
+                (run_key,),
+            ).fetchone()
+            self.conn.executemany(
+                "INSERT INTO crawl_jobs VALUES (?, ?, ?)",
+                [(run_key, seq + i, job) for i, job in enumerate(jobs)],
+            )
+            if cursor_json is not None:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO crawl_cursors VALUES (?, ?, ?, ?)",
+                    (search_key, position, cursor_json, now),
+                )
+
+    def finish_run(self, run_key: str):
+        """Drops a completed run's checkpoint; its cursors are kept"""
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM crawl_runs WHERE run_key = ?", (run_key,))
+            self.conn.execute("DELETE FROM crawl_jobs WHERE run_key = ?", (run_key,))
+
+    def prune(self) -> int:
+        """Deletes cursors and runs older than max_age; returns the rows removed"""
+        cutoff = time.time() - self.max_age
+        with self._lock, self.conn:
+            removed = self.conn.execute(
+                "DELETE FROM crawl_cursors WHERE saved_at < ?", (cutoff,)
+            ).rowcount
+            removed += self.conn.execute(
+                "DELETE FROM crawl_jobs WHERE run_key IN "
+                "(SELECT run_key FROM crawl_runs WHERE saved_at < ?)",
+                (cutoff,),
+            ).rowcount
+            removed += self.conn.execute(
+                "DELETE FROM crawl_runs WHERE saved_at < ?", (cutoff,)
+            ).rowcount
+        return removed
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CrawlCheckpoint:
+    def __init__(
+        self, store: CheckpointStore, site: str, search_key: str, run_key: str
+    ):
+        """
+        One site's checkpoint within a scrape_jobs call; the run is identified
+        by the search, offset and results_wanted, so repeating an interrupted
+        call resumes it
+        """
+        self.store = store
+        self.site = site
+        self.search_key = search_key
+        self.run_key = run_key
+        self.base = 0
+
+    def start(self, offset: int | None = None) -> ResumePoint:
+        """
+        The unfinished run's progress, else (given an offset) the stored cursor
+        closest before the offset, else the first page. Jobs are JSON strings.
+        :param offset: None for sites whose own offsets are already direct
+        """
+        run = self.store.load_run(self.run_key)
+        if run is not None:
+            self.base, position, cursor, jobs = run
+            return ResumePoint(self.base, position, cursor, jobs, resumed=True)
+        # a run too old to resume starts over
+        self.store.finish_run(self.run_key)
+        self.base = 0
+        if offset:
+            stored = self.store.nearest_cursor(self.search_key, offset)
+            if stored is not None:
+                self.base, cursor = stored
+                return ResumePoint(self.base, self.base, cursor, [])
+        return ResumePoint(jobs=[])
+
+    def save_page(self, position: int, cursor: Any, jobs: list[str]):
+        self.store.save_page(
+            self.site, self.search_key, self.run_key, self.base, position, cursor, jobs
+        )
+
+    def finish(self):
+        self.store.finish_run(self.run_key)
@@ -0,0 +1,202 @@
+"""
+jobspy.circuit_breaker
+~~~~~~~~~~~~~~~~~~~
+
+Per-site circuit breakers shared by every scrape_jobs call in the process. A
+breaker watches the status codes and errors of a site's requests; after several
+429s within a short window, or enough consecutive failures (5xx, timeouts), it
+opens and calls skip the site immediately instead of burning retries against a
+board that is blocking us. After a cool-down one call is let through as a
+half-open probe: a successful request closes the breaker again, a failed one
+re-opens it.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from enum import Enum
+
+from jobspy.telemetry import MetricsHook
+
+DEFAULT_TRIP_STATUSES = frozenset({429})
+DEFAULT_FAILURE_STATUSES = frozenset({500, 502, 503, 504})
+
+
+class BreakerState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker(MetricsHook):
+    def __init__(
+        self,
+        site: str,
+        failure_threshold: int = 5,
+        cooldown: float = 60.0,
+        failure_statuses: frozenset[int] = DEFAULT_FAILURE_STATUSES,
+        trip_statuses: frozenset[int] = DEFAULT_TRIP_STATUSES,
+        trip_threshold: int = 3,
+        trip_window: float = 60.0,
+        enabled: bool = True,
+    ):
+        """
+        :param site: site value the breaker guards
+        :param failure_threshold: consecutive failed requests that open the breaker
+        :param cooldown: seconds the breaker stays open before a probe is allowed
+        :param failure_statuses: status codes counted as failures; requests that
+            raise (timeouts, connection errors) always count
+        :param trip_statuses: status codes that mean the site is blocking us;
+            trip_threshold of them within trip_window seconds open the breaker,
+            whatever came in between. Some sessions retry them first and some
+            (TLS sessions, Indeed's) don't, so a single one is not conclusive
+        :param trip_threshold: trip statuses within trip_window that open it
+        :param trip_window: seconds a trip status counts toward trip_threshold
+        :param enabled: when False the breaker never opens
+        """
+        self.site = site
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failure_statuses = failure_statuses
+        self.trip_statuses = trip_statuses
+        self.trip_threshold = trip_threshold
+        self.trip_window = trip_window
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._state = BreakerState.CLOSED
+        self._failures = 0
+        # time.monotonic() of the trip statuses within the window
+        self._trip_times: deque[float] = deque()
+        self._opened_at: float | None = None
+        self._trips = 0
+
+    @property
+    def state(self) -> BreakerState:
+        with self._lock:
+            return self._state
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == BreakerState.OPEN
+
+    def admit(self) -> BreakerState | None:
+        """
+        Decides whether a scrape of the site may start. Once the cool-down has
+        passed the first caller is admitted as the half-open probe; others keep
+        skipping until the probe's outcome is known.
+        :return: None to skip the site, else the state the scrape was admitted
+            under (HALF_OPEN for the probe, which must call probe_finished)
+        """
+        if not self.enabled:
+            return BreakerState.CLOSED
+        with self._lock:
+            if self._state == BreakerState.CLOSED:
+                return BreakerState.CLOSED
+            if self._state == BreakerState.HALF_OPEN:
+                return None
+            if time.monotonic() - self._opened_at < self.cooldown:
+                return None
+            self._state = BreakerState.HALF_OPEN
+            return BreakerState.HALF_OPEN
+
+    def on_request(
+        self, site: str, status_code: int | None, num_bytes: int, elapsed: float
+    ) -> None:
+        if status_code in self.trip_statuses:
+            self.record_failure(trip=True)
+        elif status_code is None or status_code in self.failure_statuses:
+            self.record_failure()
+        else:
+            self.record_success()
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            if self._state == BreakerState.HALF_OPEN:
+                self._state = BreakerState.CLOSED
+
+    def record_failure(self, trip: bool = False):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._failures += 1
+            if trip:
+                now = time.monotonic()
+                self._trip_times.append(now)
+                while self._trip_times[0] <= now - self.trip_window:
+                    self._trip_times.popleft()
+            tripped = len(self._trip_times) >= self.trip_threshold
+            if self._state == BreakerState.HALF_OPEN or (
+                self._state == BreakerState.CLOSED
+                and (tripped or self._failures >= self.failure_threshold)
+            ):
+                self._open()
+
+    def probe_finished(self):
+        """
+        Called when the half-open probe ends. A probe that made no conclusive
+        request leaves the breaker open for another cool-down.
+        """
+        with self._lock:
+            if self._state == BreakerState.HALF_OPEN:
+                self._open()
+
+    def _open(self):
+        self._state = BreakerState.OPEN
+        self._opened_at = time.monotonic()
+        self._trips += 1
+        self._trip_times.clear()
+
+    def reset(self):
+        with self._lock:
+            self._state = BreakerState.CLOSED
+            self._failures = 0
+            self._trip_times.clear()
+            self._opened_at = None
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            retry_in = None
+            if self._state == BreakerState.OPEN:
+                elapsed = time.monotonic() - self._opened_at
+                retry_in = round(max(self.cooldown - elapsed, 0.0), 3)
+            return {
+                "site": self.site,
+                "state": self._state.value,
+                "consecutive_failures": self._failures,
+                "trips": self._trips,
+                "retry_in_seconds": retry_in,
+            }
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breaker_settings: dict = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(site: str) -> CircuitBreaker:
+    """Returns the process-wide breaker for a site value, creating it on first use"""
+    with _breakers_lock:
+        if site not in _breakers:
+            _breakers[site] = CircuitBreaker(site, **_breaker_settings)
+        return _breakers[site]
+
+
+def configure_circuit_breakers(**kwargs):
+    """
+    Replaces every site's breaker with fresh, closed ones built with the given
+    CircuitBreaker arguments (e.g. failure_threshold, cooldown, enabled)
+    """
+    global _breaker_settings
+    with _breakers_lock:
+        _breaker_settings = dict(kwargs)
+        _breakers.clear()
+
+
+def circuit_breaker_states() -> dict[str, dict]:
+    """Snapshot of every breaker created so far, keyed by site value"""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.site: breaker.snapshot() for breaker in breakers}
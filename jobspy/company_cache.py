@@ -0,0 +1,107 @@
+"""
+jobspy.company_cache
+~~~~~~~~~~~~~~~~~~~
+
+Employer metadata (company_* fields) cached across runs, keyed by the site and
+its own employer id. Repeat employers are filled from the cache instead of
+being parsed again from every posting, and Indeed leaves the employer dossier
+out of its search query while most employers on its pages are already cached.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+from jobspy.util import json_dumps, json_loads
+
+
+class CompanyCache:
+    def __init__(
+        self,
+        path: str = "jobs.db",
+        max_age: timedelta = timedelta(days=30),
+        batch_size: int = 200,
+    ):
+        """
+        :param path: SQLite database file; may be shared with a JobWarehouse
+        :param max_age: entries older than this are refetched from the site
+        :param batch_size: buffered new entries before they are written out
+        """
+        self.path = path
+        self.max_age = max_age
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        # (site, employer id) -> fields, or None when known to be missing
+        self._memo: dict[tuple[str, str], dict | None] = {}
+        self._pending: dict[tuple[str, str], dict] = {}
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self._lock, self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS companies "
+                "(site TEXT NOT NULL, employer_id TEXT NOT NULL, "
+                "fields TEXT NOT NULL, updated_at TEXT NOT NULL, "
+                "PRIMARY KEY (site, employer_id))"
+            )
+
+    def get(self, site: str, employer_id: str | None) -> dict | None:
+        """Cached company_* fields of an employer, or None"""
+        if not employer_id:
+            return None
+        key = (site, employer_id)
+        with self._lock:
+            if key not in self._memo:
+                cutoff = datetime.now() - self.max_age
+                row = self.conn.execute(
+                    "SELECT fields FROM companies WHERE site = ? AND employer_id = ? "
+                    "AND updated_at >= ?",
+                    (site, employer_id, cutoff.isoformat(timespec="seconds")),
+                ).fetchone()
+                self._memo[key] = json_loads(row[0]) if row else None
+            fields = self._memo[key]
+            return dict(fields) if fields is not None else None
+
+    def put(self, site: str, employer_id: str | None, **fields):
+        """Stores an employer's company_* fields; None values are left out"""
+        if not employer_id:
+            return
+        fields = {name: value for name, value in fields.items() if value is not None}
+        key = (site, employer_id)
+        with self._lock:
+            self._memo[key] = fields
+            self._pending[key] = fields
+            flush = len(self._pending) >= self.batch_size
+        if flush:
+            self.flush()
+
+    def flush(self):
+        now = datetime.now().isoformat(timespec="seconds")
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO companies VALUES (?, ?, ?, ?)",
+                    [
+                        (site, employer_id, json_dumps(fields).decode(), now)
+                        for (site, employer_id), fields in pending.items()
+                    ],
+                )
+
+    def __len__(self):
+        self.flush()
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM companies").fetchone()[0]
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,188 @@
+"""
+jobspy.content_cache
+~~~~~~~~~~~~~~~~~~~
+
+Content-addressed cache of the fields derived from a posting's raw description.
+Scrapers hash the raw description HTML / text as it arrives; when the hash was
+seen on an earlier run the stored markdown, emails, job type and salary are
+reused instead of being recomputed, and the posting is flagged as unchanged so
+sinks can skip rewriting it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+from datetime import datetime
+from typing import NamedTuple
+
+from jobspy.model import DescriptionFormat, JobType
+from jobspy.telemetry import ScrapeStats
+from jobspy.util import (
+    extract_emails_from_text,
+    extract_job_type,
+    json_dumps,
+    json_loads,
+    markdown_converter,
+)
+
+
+class DerivedFields(NamedTuple):
+    description_hash: str | None
+    description: str | None
+    emails: list[str] | None
+    job_type: list[JobType] | None
+    unchanged: bool
+
+
+NO_DESCRIPTION = DerivedFields(None, None, None, None, False)
+
+
+def description_hash(raw: str, description_format: DescriptionFormat | None) -> str:
+    """Hash of a raw description; the output format is part of the key"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(description_format.value.encode() if description_format else b"")
+    digest.update(b"\x1f")
+    digest.update(raw.encode("utf-8", "surrogatepass"))
+    return digest.hexdigest()
+
+
+class DerivedFieldCache:
+    def __init__(self, path: str = "jobs.db", batch_size: int = 500):
+        """
+        :param path: SQLite database file; may be shared with a JobWarehouse
+        :param batch_size: buffered new entries before they are written out
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._pending: dict[str, dict] = {}
+        self._used: set[str] = set()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self._lock, self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS derived_fields "
+                "(hash TEXT PRIMARY KEY, fields TEXT NOT NULL, last_used TEXT)"
+            )
+
+    def get(self, key: str) -> dict | None:
+        """Derived fields stored for a description hash, or None"""
+        with self._lock:
+            fields = self._pending.get(key)
+            if fields is None:
+                row = self.conn.execute(
+                    "SELECT fields FROM derived_fields WHERE hash = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                fields = json_loads(row[0])
+            self._used.add(key)
+            return dict(fields)
+
+    def put(self, key: str, **fields):
+        """Stores (or adds to) the derived fields for a description hash"""
+        flush = False
+        with self._lock:
+            current = self._pending.get(key)
+            if current is None:
+                row = self.conn.execute(
+                    "SELECT fields FROM derived_fields WHERE hash = ?", (key,)
+                ).fetchone()
+                current = json_loads(row[0]) if row else {}
+            self._pending[key] = {**current, **fields}
+            flush = len(self._pending) >= self.batch_size
+        if flush:
+            self.flush()
+
+    def flush(self):
+        """Writes buffered entries and refreshes last_used for entries read"""
+        now = datetime.now().isoformat(timespec="seconds")
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            used, self._used = self._used - pending.keys(), set()
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT INTO derived_fields (hash, fields, last_used) "
+                    "VALUES (?, ?, ?) ON CONFLICT(hash) DO UPDATE SET "
+                    "fields = excluded.fields, last_used = excluded.last_used",
+                    [(k, json_dumps(v).decode(), now) for k, v in pending.items()],
+                )
+                self.conn.executemany(
+                    "UPDATE derived_fields SET last_used = ? WHERE hash = ?",
+                    [(now, key) for key in used],
+                )
+
+    def prune(self, unused_since: datetime) -> int:
+        """Deletes entries not used since `unused_since`"""
+        self.flush()
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                "DELETE FROM derived_fields WHERE last_used < ?",
+                (unused_since.isoformat(timespec="seconds"),),
+            )
+        return cursor.rowcount
+
+    def __len__(self):
+        self.flush()
+        with self._lock:
+            cursor = self.conn.execute("SELECT COUNT(*) FROM derived_fields")
+            return cursor.fetchone()[0]
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def derive_description(
+    raw: str | None,
+    description_format: DescriptionFormat | None,
+    stats: ScrapeStats,
+    cache: DerivedFieldCache | None = None,
+    with_job_type: bool = False,
+) -> DerivedFields:
+    """
+    Converts a raw description to `description_format` and extracts its emails
+    (and job type), reusing the cached results when the content is unchanged.
+    :param raw: description as received from the site (HTML or plain text)
+    :param stats: site stats charged for markdown time and cache reuse
+    :param cache: store of previously derived fields; None to always derive
+    :param with_job_type: also extract the job type from the description text
+    """
+    if not raw:
+        return NO_DESCRIPTION
+    key = description_hash(raw, description_format)
+    cached = cache.get(key) if cache is not None else None
+    if cached is not None and (not with_job_type or "job_type" in cached):
+        stats.incr("descriptions_reused")
+        job_type = cached.get("job_type")
+        return DerivedFields(
+            key,
+            cached["description"],
+            cached["emails"],
+            [JobType[name] for name in job_type] if job_type else None,
+            True,
+        )
+
+    description = raw
+    if description_format == DescriptionFormat.MARKDOWN:
+        with stats.phase("markdown"):
+            description = markdown_converter(raw)
+    emails = extract_emails_from_text(description)
+    fields = {"description": description, "emails": emails}
+    job_type = None
+    if with_job_type:
+        job_type = extract_job_type(description) or None
+        fields["job_type"] = [t.name for t in job_type] if job_type else None
+    if cache is not None:
+        cache.put(key, **fields)
+    return DerivedFields(key, description, emails, job_type, False)
@@ -0,0 +1,193 @@
+"""
+jobspy.description_store
+~~~~~~~~~~~~~~~~~~~
+
+Compact storage for the description column of large scrape_jobs frames. Each
+distinct description is compressed once, keyed by its content hash, so the
+same text found on several boards or postings is held once; the frame holds a
+small DescriptionRef per row that decodes the text when it is read (str(),
+display, to_csv). References are made as each JobPost is built, so the full
+texts are not all held at once; two references are equal when their texts
+are, and compare unequal to plain strings (compare str(ref) instead). Past memory_limit bytes of compressed text, blobs can spill
+to a memory-mapped file.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import mmap
+import sqlite3
+import tempfile
+import threading
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # optional codec, faster and tighter than zlib
+    zstandard = None
+
+
+class DescriptionRef:
+    """A description in a DescriptionStore; str() decodes it"""
+
+    __slots__ = ("store", "key")
+
+    def __init__(self, store: DescriptionStore, key: bytes):
+        self.store = store
+        self.key = key
+
+    @property
+    def text(self) -> str:
+        return self.store.get(self.key)
+
+    def __str__(self):
+        return self.store.get(self.key)
+
+    def __repr__(self):
+        return f"DescriptionRef({self.key.hex()})"
+
+    def __len__(self):
+        return len(self.text)
+
+    def __eq__(self, other):
+        if isinstance(other, DescriptionRef):
+            return self.key == other.key
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __conform__(self, protocol):
+        # stored as its text by sqlite3, e.g. in JobWarehouse
+        if protocol is sqlite3.PrepareProtocol:
+            return self.text
+
+
+class DescriptionStore:
+    def __init__(
+        self,
+        spill_path: str | bool | None = None,
+        memory_limit: int = 64 * 1024 * 1024,
+        level: int = 6,
+    ):
+        """
+        :param spill_path: file that blobs past memory_limit are written to
+            and read back from through mmap; True uses an anonymous temporary
+            file, None keeps every blob in memory
+        :param memory_limit: bytes of compressed blobs kept in memory
+        :param level: compression level (zstd when zstandard is installed,
+            else zlib)
+        """
+        self.memory_limit = memory_limit
+        self.level = level
+        self._lock = threading.Lock()
+        # content hash -> compressed blob, or (offset, length) in the spill file
+        self._blobs: dict[bytes, bytes | tuple[int, int]] = {}
+        self._refs: dict[bytes, DescriptionRef] = {}
+        self.memory_bytes = 0
+        self.text_bytes = 0
+        if zstandard is not None:
+            self._compress = zstandard.ZstdCompressor(level=level).compress
+            self._decompress = zstandard.ZstdDecompressor().decompress
+        else:
+            self._compress = lambda data: zlib.compress(data, level)
+            self._decompress = zlib.decompress
+        self._map = None
+        self._spill_size = 0
+        self.spill_path = spill_path if isinstance(spill_path, str) else None
+        if spill_path is True:
+            self._spill = tempfile.TemporaryFile(prefix="jobspy-")
+        elif spill_path:
+            self._spill = open(spill_path, "w+b")
+        else:
+            self._spill = None
+
+    def add(self, text: str | DescriptionRef | None) -> DescriptionRef | None:
+        """
+        Stores a description, once per distinct text
+        :return: its reference, the same object for equal texts; None if empty
+        """
+        if isinstance(text, DescriptionRef):
+            if text.store is self:
+                return text
+            text = text.text
+        if not text or not isinstance(text, str):
+            return None
+        data = text.encode()
+        key = hashlib.blake2b(data, digest_size=16).digest()
+        with self._lock:
+            ref = self._refs.get(key)
+            if ref is not None:
+                return ref
+        blob = self._compress(data)
+        with self._lock:
+            ref = self._refs.get(key)
+            if ref is not None:
+                return ref
+            self.text_bytes += len(data)
+            if self._spill is not None and (
+                self.memory_bytes + len(blob) > self.memory_limit
+            ):
+                self._spill.seek(self._spill_size)
+                self._spill.write(blob)
+                self._blobs[key] = (self._spill_size, len(blob))
+                self._spill_size += len(blob)
+            else:
+                self._blobs[key] = blob
+                self.memory_bytes += len(blob)
+            ref = self._refs[key] = DescriptionRef(self, key)
+            return ref
+
+    def get(self, key: bytes) -> str:
+        """Decodes a stored description"""
+        with self._lock:
+            blob = self._blobs[key]
+            if isinstance(blob, tuple):
+                offset, length = blob
+                blob = self._mapped()[offset : offset + length]
+        return self._decompress(blob).decode()
+
+    def _mapped(self) -> mmap.mmap:
+        """The spill file mapped up to its current size; called under _lock"""
+        if self._map is None or len(self._map) < self._spill_size:
+            if self._map is not None:
+                self._map.close()
+            self._spill.flush()
+            self._map = mmap.mmap(
+                self._spill.fileno(), self._spill_size, access=mmap.ACCESS_READ
+            )
+        return self._map
+
+    def decode(self, values) -> list[str | None]:
+        """
+        Decoded texts of a column of references, e.g. to replace
+        df["description"] with plain strings
+        """
+        return [
+            str(value) if isinstance(value, DescriptionRef) else value
+            for value in values
+        ]
+
+    @property
+    def spilled_bytes(self) -> int:
+        return self._spill_size
+
+    def __len__(self):
+        with self._lock:
+            return len(self._blobs)
+
+    def close(self):
+        """Releases the spill file; references into it no longer decode"""
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            if self._spill is not None:
+                self._spill.close()
+                self._spill = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,182 @@
+"""
+jobspy.duplicates
+~~~~~~~~~~~~~~~~~~~
+
+In-run index of postings shared by the boards of one scrape_jobs call. The same
+employer posting often comes back from several boards: the first board to get
+its description publishes it under the posting's keys (normalized title,
+company and city, plus the direct url where known), and the other boards attach
+it instead of making their own detail request. A board reaching a posting that
+another board is still fetching waits for that fetch rather than repeating it.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from typing import TYPE_CHECKING, NamedTuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+if TYPE_CHECKING:
+    from jobspy.content_cache import DerivedFields
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def _normalize(text: str) -> str:
+    return _NON_WORD.sub(" ", text).strip().casefold()
+
+
+def _normalize_url(url: str) -> str:
+    """Url without scheme, fragment, utm_ parameters or a trailing slash"""
+    parts = urlsplit(url.strip())
+    query = [
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not name.lower().startswith("utm_")
+    ]
+    path = parts.path.rstrip("/")
+    return urlunsplit(("", parts.netloc.lower(), path, urlencode(query), ""))
+
+
+def posting_keys(
+    title: str | None,
+    company: str | None,
+    city: str | None,
+    job_url_direct: str | None = None,
+) -> list[str]:
+    """Keys a posting is shared under; none if it has neither title+company nor url"""
+    keys = []
+    if title and company:
+        fields = (_normalize(title), _normalize(company), _normalize(city or ""))
+        keys.append("t:" + "\x1f".join(fields))
+    if job_url_direct:
+        keys.append("u:" + _normalize_url(job_url_direct))
+    return keys
+
+
+class SharedDetail(NamedTuple):
+    derived: DerivedFields
+    job_url_direct: str | None
+    site: str
+
+
+class _Entry:
+    def __init__(self, site: str):
+        self.site = site
+        self.detail: SharedDetail | None = None
+        self.done = threading.Event()
+
+
+class DetailClaim:
+    """
+    Outcome of claiming a posting's details. If `shared` is set another board
+    has them; otherwise the claimant fetches them and calls publish, and leaving
+    the `with` block releases any boards waiting on it.
+    """
+
+    def __init__(
+        self,
+        index: DuplicateIndex | None = None,
+        site: str | None = None,
+        keys: list[str] | None = None,
+        owned: list[str] | None = None,
+        shared: SharedDetail | None = None,
+    ):
+        """
+        :param keys: all of the posting's keys, which details are shared under
+        :param owned: keys whose in-flight entry is this claim's, to release
+        """
+        self.index = index
+        self.site = site
+        self.keys = keys or []
+        self.owned = owned or []
+        self.shared = shared
+
+    def publish(self, derived: DerivedFields, job_url_direct: str | None = None):
+        """Shares fetched details; failed fetches (no description) are not shared"""
+        if self.index is None or self.shared is not None:
+            return
+        keys = self.keys
+        if job_url_direct:
+            keys = [*keys, *posting_keys(None, None, None, job_url_direct)]
+        if derived.description:
+            detail = SharedDetail(derived, job_url_direct, self.site)
+            self.index.publish(self.site, keys, detail)
+        self.release()
+
+    def release(self):
+        if self.index is not None and self.shared is None:
+            self.index.release(self.owned)
+            self.index = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+# claim of a posting that has no keys, or of a scrape without an index
+NO_CLAIM = DetailClaim()
+
+
+class DuplicateIndex:
+    def __init__(self, max_wait: float = 30.0):
+        """
+        :param max_wait: seconds a board waits for another board's in-flight
+            fetch of the same posting before fetching it itself
+        """
+        self.max_wait = max_wait
+        self._lock = threading.Lock()
+        self._entries: dict[str, _Entry] = {}
+
+    def claim(
+        self, site: str, keys: list[str], wait: float | None = None
+    ) -> DetailClaim:
+        """
+        Details already shared under any of the keys; else, after waiting for a
+        fetch in flight on another board, a claim to fetch them
+        :param wait: cap on the wait, e.g. the time left before the deadline
+        """
+        if not keys:
+            return NO_CLAIM
+        wait = self.max_wait if wait is None else max(min(wait, self.max_wait), 0)
+        with self._lock:
+            entries = [self._entries[key] for key in keys if key in self._entries]
+        for entry in entries:
+            if entry.detail is None and entry.site != site:
+                entry.done.wait(wait)
+            if entry.detail is not None:
+                return DetailClaim(shared=entry.detail)
+        with self._lock:
+            owned = []
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None and entry.detail is not None:
+                    self._release(owned)
+                    return DetailClaim(shared=entry.detail)
+                if entry is None or entry.done.is_set():
+                    self._entries[key] = _Entry(site)
+                    owned.append(key)
+        return DetailClaim(self, site, keys, owned)
+
+    def publish(self, site: str, keys: list[str], detail: SharedDetail):
+        """Shares details under keys; the first details for a key are kept"""
+        with self._lock:
+            for key in keys:
+                entry = self._entries.setdefault(key, _Entry(site))
+                if entry.detail is None:
+                    entry.detail = detail
+                    entry.done.set()
+
+    def release(self, keys: list[str]):
+        """Wakes boards waiting on keys whose fetch ended without details"""
+        with self._lock:
+            self._release(keys)
+
+    def _release(self, keys: list[str]):
+        for key in keys:
+            entry = self._entries.get(key)
+            if entry is not None and entry.detail is None:
+                entry.done.set()
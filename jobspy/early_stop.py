@@ -0,0 +1,78 @@
+"""
+jobspy.early_stop
+~~~~~~~~~~~~~~~~~~~
+
+Stops pagination once a site's date-sorted results run into postings we
+already have or that are older than a cutoff. Boards mix sponsored and
+re-posted listings into the newest-first order, so pagination only stops after
+a run of consecutive stale postings, not at the first one.
+"""
+
+from __future__ import annotations
+
+import threading
+from datetime import date, datetime
+from typing import Container, Iterable
+
+# (JobPost id, date or datetime posted) of a listing on a results page
+Listing = tuple[str, "date | datetime | None"]
+
+
+def posted_before(posted: date | datetime, cutoff: date | datetime) -> bool:
+    """
+    True if a posting is older than the cutoff. A posting known only by its day
+    (a date) is older only if that whole day is before the cutoff.
+    """
+    if isinstance(posted, datetime) and isinstance(cutoff, datetime):
+        return posted < cutoff
+    if isinstance(posted, datetime):
+        posted = posted.date()
+    if isinstance(cutoff, datetime):
+        cutoff = cutoff.date()
+    return posted < cutoff
+
+
+class EarlyStop:
+    def __init__(
+        self,
+        known_ids: Container[str] | None = None,
+        posted_cutoff: date | datetime | None = None,
+        consecutive: int = 10,
+    ):
+        """
+        :param known_ids: JobPost ids (e.g. "li-123") of postings already stored
+        :param posted_cutoff: postings posted before this are stale; a date-only
+            posting is stale only if its whole day is before the cutoff
+        :param consecutive: stale postings in a row that stop pagination
+        """
+        self.known_ids = known_ids if known_ids is not None else frozenset()
+        self.posted_cutoff = posted_cutoff
+        self.consecutive = consecutive
+        self._lock = threading.Lock()
+        self._streak = 0
+        self.stale_seen = 0
+        self.triggered = False
+
+    def is_stale(self, job_id: str | None, posted: date | datetime | None) -> bool:
+        if job_id is not None and job_id in self.known_ids:
+            return True
+        if self.posted_cutoff is None or posted is None:
+            return False
+        return posted_before(posted, self.posted_cutoff)
+
+    def observe(self, listings: Iterable[Listing]) -> bool:
+        """
+        Feeds a results page's listings in page order
+        :return: True once pagination should stop
+        """
+        with self._lock:
+            for job_id, posted in listings:
+                if self.triggered:
+                    break
+                if self.is_stale(job_id, posted):
+                    self.stale_seen += 1
+                    self._streak += 1
+                    self.triggered = self._streak >= self.consecutive
+                else:
+                    self._streak = 0
+            return self.triggered
@@ -0,0 +1,140 @@
+"""
+jobspy.filters
+~~~~~~~~~~~~~~~~~~~
+
+Declarative listing filters for scrape_jobs. They are evaluated twice: on a
+listing's search-card fields before any detail request or description
+conversion (where a field the card lacks never drops a listing), and again on
+the final rows, where the detail pages have filled in what the cards lacked.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Iterable
+
+from jobspy.model import Compensation
+
+# multipliers to a yearly amount, as in util.convert_to_annual
+ANNUAL_FACTORS = {
+    "yearly": 1,
+    "monthly": 12,
+    "weekly": 52,
+    "daily": 260,
+    "hourly": 2080,
+}
+
+
+def _patterns(patterns: str | Iterable[str] | None) -> list[re.Pattern]:
+    if patterns is None:
+        return []
+    if isinstance(patterns, str):
+        patterns = [patterns]
+    return [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+
+
+class ListingFilter:
+    def __init__(
+        self,
+        title_include: str | Iterable[str] | None = None,
+        title_exclude: str | Iterable[str] | None = None,
+        company_blocklist: Iterable[str] | None = None,
+        min_compensation: float | None = None,
+        max_compensation: float | None = None,
+        remote_only: bool = False,
+    ):
+        """
+        :param title_include: regexes, one of which the title must match
+        :param title_exclude: regexes the title must not match
+        :param company_blocklist: company names to drop (case-insensitive)
+        :param min_compensation: yearly floor; drops postings whose top of range
+            is below it
+        :param max_compensation: yearly ceiling; drops postings whose bottom of
+            range is above it
+        :param remote_only: drops postings known not to be remote
+        Amounts are compared in the posting's own currency.
+        """
+        self.title_include = _patterns(title_include)
+        self.title_exclude = _patterns(title_exclude)
+        self.company_blocklist = {
+            company.strip().casefold() for company in company_blocklist or ()
+        }
+        self.min_compensation = min_compensation
+        self.max_compensation = max_compensation
+        self.remote_only = remote_only
+
+    @property
+    def columns(self) -> set[str]:
+        """Row columns keep_row reads, which a fields projection must still fill"""
+        columns = set()
+        if self.title_include or self.title_exclude:
+            columns.add("title")
+        if self.company_blocklist:
+            columns.add("company")
+        if self.min_compensation is not None or self.max_compensation is not None:
+            columns.update(("interval", "min_amount", "max_amount"))
+        if self.remote_only:
+            columns.add("is_remote")
+        return columns
+
+    def __call__(self, fields: dict) -> bool:
+        """
+        Evaluates a listing's search-card fields, as given to a scraper's
+        pre_detail_filter; fields the card lacks pass
+        """
+        compensation = fields.get("compensation")
+        if isinstance(compensation, Compensation):
+            interval = compensation.interval.value if compensation.interval else None
+            amounts = interval, compensation.min_amount, compensation.max_amount
+        else:
+            amounts = None, None, None
+        return self._keep(
+            fields.get("title"),
+            fields.get("company"),
+            *amounts,
+            fields.get("is_remote") is not False,
+        )
+
+    def keep_row(self, row: dict) -> bool:
+        """
+        Evaluates a final scrape_jobs row; remote_only drops rows with is_remote
+        False, while boards that never set it (None) pass
+        """
+        return self._keep(
+            row.get("title"),
+            row.get("company"),
+            row.get("interval"),
+            row.get("min_amount"),
+            row.get("max_amount"),
+            row.get("is_remote") is not False,
+        )
+
+    def _keep(
+        self,
+        title: str | None,
+        company: str | None,
+        interval: str | None,
+        min_amount: float | None,
+        max_amount: float | None,
+        maybe_remote: bool,
+    ) -> bool:
+        if title is not None:
+            if self.title_include and not any(
+                pattern.search(title) for pattern in self.title_include
+            ):
+                return False
+            if any(pattern.search(title) for pattern in self.title_exclude):
+                return False
+        if company and company.strip().casefold() in self.company_blocklist:
+            return False
+        factor = ANNUAL_FACTORS.get(interval)
+        if factor is not None:
+            top = max_amount if max_amount is not None else min_amount
+            bottom = min_amount if min_amount is not None else max_amount
+            if self.min_compensation is not None and top is not None:
+                if top * factor < self.min_compensation:
+                    return False
+            if self.max_compensation is not None and bottom is not None:
+                if bottom * factor > self.max_compensation:
+                    return False
+        return maybe_remote or not self.remote_only
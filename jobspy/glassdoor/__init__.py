@@ -1,11 +1,10 @@
 from __future__ import annotations
 
 import re
-import json
+import math
 import requests
 from typing import Tuple
 from datetime import datetime, timedelta
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from jobspy.glassdoor.constant import fallback_token, query_template, headers
 from jobspy.glassdoor.util import (
@@ -14,16 +13,18 @@ from jobspy.glassdoor.util import (
     parse_location,
 )
 from jobspy.util import (
-    extract_emails_from_text,
     create_logger,
     create_session,
-    markdown_converter,
+    json_dumps,
+    json_loads,
+    ConcurrentSet,
 )
+from jobspy.content_cache import NO_DESCRIPTION, DerivedFields, derive_description
 from jobspy.exception import GlassdoorException
 from jobspy.model import (
+    DESCRIPTION_FIELDS,
     JobPost,
     JobResponse,
-    DescriptionFormat,
     Scraper,
     ScraperInput,
     Site,
@@ -48,7 +49,8 @@ class Glassdoor(Scraper):
         self.scraper_input = None
         self.jobs_per_page = 30
         self.max_pages = 30
-        self.seen_urls = set()
+        self.seen_urls = ConcurrentSet()
+        self.headers = headers.copy()
 
     def scrape(self, scraper_input: ScraperInput) -> JobResponse:
         """
@@ -57,15 +59,19 @@ class Glassdoor(Scraper):
         :return: JobResponse containing a list of jobs.
         """
         self.scraper_input = scraper_input
-        self.scraper_input.results_wanted = min(900, scraper_input.results_wanted)
+        self.seen_urls = ConcurrentSet()
+        results_wanted = min(900, scraper_input.results_wanted)
         self.base_url = self.scraper_input.country.get_glassdoor_url()
 
         self.session = create_session(
-            proxies=self.proxies, ca_cert=self.ca_cert, has_retry=True
+            proxies=self.proxies,
+            ca_cert=self.ca_cert,
+            has_retry=True,
+            stats=self.stats,
         )
         token = self._get_csrf_token()
-        headers["gd-csrf-token"] = token if token else fallback_token
-        self.session.headers.update(headers)
+        self.headers["gd-csrf-token"] = token if token else fallback_token
+        self.session.headers.update(self.headers)
 
         location_id, location_type = self._get_location(
             scraper_input.location, scraper_input.is_remote
@@ -73,51 +79,93 @@ class Glassdoor(Scraper):
         if location_type is None:
             log.error("Glassdoor: location not parsed")
             return JobResponse(jobs=[])
-        job_list: list[JobPost] = []
-        cursor = None
-
         range_start = 1 + (scraper_input.offset // self.jobs_per_page)
-        tot_pages = (scraper_input.results_wanted // self.jobs_per_page) + 2
-        range_end = min(tot_pages, self.max_pages + 1)
+        # the first page holds the listings up to the offset within it
+        skip = scraper_input.offset % self.jobs_per_page
+        wanted = skip + results_wanted
+        # pages until wanted jobs are kept, which filters may take past the
+        # pages the listings alone would fill
+        range_end = self.max_pages + 1
+
+        # checkpointed cursors are {"page": n, "cursor": pageCursor for page n};
+        # pages are addressed by number, so a stored cursor is only used for
+        # the exact page an offset starts on
+        resume = self.crawl_start(scraper_input.offset)
+        job_list, cursor = resume.jobs, None
+        self.collected_skip = skip
+        for job in job_list:
+            self.seen_urls.add(job.job_url)
+        if resume.resumed or (resume.cursor and resume.cursor["page"] == range_start):
+            range_start, cursor = resume.cursor["page"], resume.cursor["cursor"]
+        # the next page, requested as soon as this page's cursor is known so it
+        # downloads while this page's descriptions are fetched
+        next_page = None
         for page in range(range_start, range_end):
+            if self.should_stop():
+                log.warning(f"stopping early, returning after page {page - 1}")
+                break
             log.info(f"search page: {page} / {range_end - 1}")
             try:
-                jobs, cursor = self._fetch_jobs_page(
-                    scraper_input, location_id, location_type, page, cursor
+                jobs_data, cursor = (
+                    next_page.result()
+                    if next_page
+                    else self._fetch_listings(location_id, location_type, page, cursor)
                 )
+                next_page = None
+                if (
+                    jobs_data
+                    and page + 1 < range_end
+                    and len(job_list) + len(jobs_data) < wanted
+                ):
+                    next_page = self.prefetch(
+                        self._fetch_listings,
+                        location_id,
+                        location_type,
+                        page + 1,
+                        cursor,
+                    )
+                if not jobs_data:
+                    break
+                jobs = self._process_listings(jobs_data)
                 job_list.extend(jobs)
-                if not jobs or len(job_list) >= scraper_input.results_wanted:
-                    job_list = job_list[: scraper_input.results_wanted]
+                resume_cursor = {"page": page + 1, "cursor": cursor}
+                self.checkpoint_page(page * self.jobs_per_page, resume_cursor, jobs)
+                if len(job_list) >= wanted:
+                    break
+                if self.stopped_early:
+                    log.info(f"reached known or old postings on page {page}")
                     break
             except Exception as e:
                 log.error(f"Glassdoor: {str(e)}")
                 break
-        return JobResponse(jobs=job_list)
+        if next_page is not None:
+            next_page.cancel()
+        return JobResponse(jobs=job_list[skip : skip + results_wanted])
 
-    def _fetch_jobs_page(
+    def _fetch_listings(
         self,
-        scraper_input: ScraperInput,
         location_id: int,
         location_type: str,
         page_num: int,
         cursor: str | None,
-    ) -> Tuple[list[JobPost], str | None]:
+    ) -> Tuple[list[dict], str | None]:
         """
-        Scrapes a page of Glassdoor for jobs with scraper_input criteria
+        Fetches a page of Glassdoor search results with scraper_input criteria
+        :return: raw job listings on page, cursor of the next page
         """
-        jobs = []
-        self.scraper_input = scraper_input
         try:
             payload = self._add_payload(location_id, location_type, page_num, cursor)
             response = self.session.post(
                 f"{self.base_url}/graph",
-                timeout_seconds=15,
+                timeout_seconds=math.ceil(self.request_timeout(15)),
                 data=payload,
             )
             if response.status_code != 200:
                 exc_msg = f"bad response status code: {response.status_code}"
                 raise GlassdoorException(exc_msg)
-            res_json = response.json()[0]
+            self.stats.page_fetched()
+            with self.stats.phase("decode"):
+                res_json = json_loads(response.content)[0]
             if "errors" in res_json:
                 raise ValueError("Error encountered in API response")
         except (
@@ -127,25 +175,43 @@ class Glassdoor(Scraper):
             Exception,
         ) as e:
             log.error(f"Glassdoor: {str(e)}")
-            return jobs, None
+            return [], None
 
-        jobs_data = res_json["data"]["jobListings"]["jobListings"]
+        return res_json["data"]["jobListings"]["jobListings"], get_cursor_for_page(
+            res_json["data"]["jobListings"]["paginationCursors"], page_num + 1
+        )
 
-        with ThreadPoolExecutor(max_workers=self.jobs_per_page) as executor:
-            future_to_job_data = {
-                executor.submit(self._process_job, job): job for job in jobs_data
-            }
-            for future in as_completed(future_to_job_data):
+    def _process_listings(self, jobs_data: list[dict]) -> list[JobPost]:
+        """
+        Processes a page of listings, fetching their descriptions concurrently
+        """
+        futures = [self.submit(self._process_job_timed, job) for job in jobs_data]
+        done = set()
+        try:
+            for future in self.completed_before_deadline(futures):
                 try:
-                    job_post = future.result()
-                    if job_post:
-                        jobs.append(job_post)
+                    future.result()
                 except Exception as exc:
                     raise GlassdoorException(f"Glassdoor generated an exception: {exc}")
-
-        return jobs, get_cursor_for_page(
-            res_json["data"]["jobListings"]["paginationCursors"], page_num + 1
+                done.add(future)
+        finally:
+            for future in futures:
+                future.cancel()
+        # in page order, so an offset within the first page skips the right jobs
+        jobs = [
+            job_post
+            for future in futures
+            if future in done and (job_post := future.result())
+        ]
+        self.stats.jobs_parsed(len(jobs))
+        self.observe_listings(
+            (
+                f'gd-{job["jobview"]["job"]["listingId"]}',
+                self._listing_date(job["jobview"]["header"]),
+            )
+            for job in jobs_data
         )
+        return jobs
 
     def _get_csrf_token(self):
         """
@@ -159,25 +225,26 @@ class Glassdoor(Scraper):
             token = matches[0]
         return token
 
+    def _process_job_timed(self, job_data):
+        with self.stats.phase("parse"):
+            return self._process_job(job_data)
+
     def _process_job(self, job_data):
         """
         Processes a single job and fetches its description.
         """
         job_id = job_data["jobview"]["job"]["listingId"]
         job_url = f"{self.base_url}job-listing/j?jl={job_id}"
-        if job_url in self.seen_urls:
+        if not self.seen_urls.add(job_url):
             return None
-        self.seen_urls.add(job_url)
         job = job_data["jobview"]
         title = job["job"]["jobTitleText"]
         company_name = job["header"]["employerNameFromSearch"]
         company_id = job_data["jobview"]["header"]["employer"]["id"]
         location_name = job["header"].get("locationName", "")
         location_type = job["header"].get("locationType", "")
-        age_in_days = job["header"].get("ageInDays")
         is_remote, location = False, None
-        date_diff = (datetime.now() - timedelta(days=age_in_days)).date()
-        date_posted = date_diff if age_in_days is not None else None
+        date_posted = self._listing_date(job["header"])
 
         if location_type == "S":
             is_remote = True
@@ -185,14 +252,37 @@ class Glassdoor(Scraper):
             location = parse_location(location_name)
 
         compensation = parse_compensation(job["header"])
-        try:
-            description = self._fetch_job_description(job_id)
-        except:
-            description = None
+        if not self.keep_listing(
+            self._listing_posted_at(job["header"]),
+            id=f"gd-{job_id}",
+            title=title,
+            company=company_name,
+            location=location,
+            is_remote=is_remote,
+            compensation=compensation,
+        ):
+            return None
+        derived = NO_DESCRIPTION
+        if self.wants(*DESCRIPTION_FIELDS) and not self.should_stop():
+            with self.claim_detail(title, company_name, location) as claim:
+                if claim.shared:
+                    derived = claim.shared.derived
+                else:
+                    try:
+                        derived = self._fetch_job_description(job_id)
+                    except:
+                        pass
+                    claim.publish(derived)
         company_url = f"{self.base_url}Overview/W-EI_IE{company_id}.htm"
         company_logo = (
             job_data["jobview"].get("overview", {}).get("squareLogoUrl", None)
         )
+        # listings of the same employer don't all carry its logo
+        employer_id = str(company_id) if company_id else None
+        if company_logo:
+            self.cache_company(employer_id, company_logo=company_logo)
+        else:
+            company_logo = (self.cached_company(employer_id) or {}).get("company_logo")
         listing_type = (
             job_data["jobview"]
             .get("header", {})
@@ -209,13 +299,33 @@ class Glassdoor(Scraper):
             location=location,
             compensation=compensation,
             is_remote=is_remote,
-            description=description,
-            emails=extract_emails_from_text(description) if description else None,
+            description=self.store_description(derived.description),
+            emails=derived.emails,
             company_logo=company_logo,
             listing_type=listing_type,
+            description_hash=derived.description_hash,
+            unchanged=derived.unchanged,
         )
 
-    def _fetch_job_description(self, job_id):
+    @staticmethod
+    def _listing_posted_at(header: dict) -> datetime | None:
+        """
+        Most recent moment the listing can have been posted: a listing aged N
+        days is at least N * 24 hours old
+        """
+        age_in_days = header.get("ageInDays")
+        if age_in_days is None:
+            return None
+        return datetime.now() - timedelta(days=age_in_days)
+
+    @staticmethod
+    def _listing_date(header: dict):
+        age_in_days = header.get("ageInDays")
+        if age_in_days is None:
+            return None
+        return (datetime.now() - timedelta(days=age_in_days)).date()
+
+    def _fetch_job_description(self, job_id) -> DerivedFields:
         """
         Fetches the job description for a single job ID.
         """
@@ -244,14 +354,27 @@ class Glassdoor(Scraper):
                 """,
             }
         ]
-        res = requests.post(url, json=body, headers=headers)
+        self.stats.incr("detail_fetches")
+        res = self.hedged(self._post_graph, url, json_dumps(body))
         if res.status_code != 200:
-            return None
-        data = res.json()[0]
-        desc = data["data"]["jobview"]["job"]["description"]
-        if self.scraper_input.description_format == DescriptionFormat.MARKDOWN:
-            desc = markdown_converter(desc)
-        return desc
+            return NO_DESCRIPTION
+        with self.stats.phase("decode"):
+            data = json_loads(res.content)[0]
+        return derive_description(
+            data["data"]["jobview"]["job"]["description"],
+            self.scraper_input.description_format,
+            self.stats,
+            self.content_cache,
+        )
+
+    def _post_graph(self, url: str, data: bytes):
+        """
+        Posts a GraphQL request through the session, so it takes the session's
+        next proxy and is recorded in the stats
+        """
+        return self.session.post(
+            url, data=data, timeout_seconds=math.ceil(self.request_timeout(15))
+        )
 
     def _get_location(self, location: str, is_remote: bool) -> (int, str):
         if not location or is_remote:
@@ -268,7 +391,7 @@ class Glassdoor(Scraper):
                 err += f" - {res.text}"
                 log.error(f"Glassdoor response status code {res.status_code}")
                 return None, None
-        items = res.json()
+        items = json_loads(res.content)
 
         if not items:
             raise ValueError(f"Location '{location}' not found on Glassdoor")
@@ -287,10 +410,12 @@ class Glassdoor(Scraper):
         location_type: str,
         page_num: int,
         cursor: str | None = None,
-    ) -> str:
+    ) -> bytes:
         fromage = None
         if self.scraper_input.hours_old:
-            fromage = max(self.scraper_input.hours_old // 24, 1)
+            # whole days, rounded up; keep_listing drops the extra hours before
+            # any description is fetched
+            fromage = math.ceil(self.scraper_input.hours_old / 24)
         filter_params = []
         if self.scraper_input.easy_apply:
             filter_params.append({"filterKey": "applicationType", "values": "1"})
@@ -317,4 +442,4 @@ class Glassdoor(Scraper):
             payload["variables"]["filterParams"].append(
                 {"filterKey": "jobType", "values": self.scraper_input.job_type.value[0]}
             )
-        return json.dumps([payload])
+        return json_dumps([payload])
@@ -2,12 +2,12 @@ from __future__ import annotations
 
 import math
 import re
-import json
 from typing import Tuple
 from datetime import datetime, timedelta
 
 from jobspy.google.constant import headers_jobs, headers_initial, async_param
 from jobspy.model import (
+    DESCRIPTION_FIELDS,
     Scraper,
     ScraperInput,
     Site,
@@ -16,8 +16,17 @@ from jobspy.model import (
     Location,
     JobType,
 )
-from jobspy.util import extract_emails_from_text, extract_job_type, create_session
-from jobspy.google.util import log, find_job_info_initial_page, find_job_info
+from jobspy.content_cache import NO_DESCRIPTION, derive_description
+from jobspy.util import (
+    create_session,
+    ConcurrentSet,
+)
+from jobspy.google.util import (
+    log,
+    find_async_cursor,
+    find_job_info_initial_page,
+    extract_jobs_next_page,
+)
 
 
 class Google(Scraper):
@@ -34,7 +43,7 @@ class Google(Scraper):
         self.session = None
         self.scraper_input = None
         self.jobs_per_page = 10
-        self.seen_urls = set()
+        self.seen_urls = ConcurrentSet()
         self.url = "https://www.google.com/search"
         self.jobs_url = "https://www.google.com/async/callback:550"
 
@@ -45,43 +54,87 @@ class Google(Scraper):
         :return: JobResponse containing a list of jobs.
         """
         self.scraper_input = scraper_input
-        self.scraper_input.results_wanted = min(900, scraper_input.results_wanted)
+        self.seen_urls = ConcurrentSet()
+        results_wanted = min(900, scraper_input.results_wanted)
 
         self.session = create_session(
-            proxies=self.proxies, ca_cert=self.ca_cert, is_tls=False, has_retry=True
+            proxies=self.proxies,
+            ca_cert=self.ca_cert,
+            is_tls=False,
+            has_retry=True,
+            stats=self.stats,
         )
-        forward_cursor, job_list = self._get_initial_cursor_and_jobs()
+        # position counts the listings paged through, recorded with the cursor in
+        # the checkpoint; a stored cursor skips the pages before a deep offset
+        resume = self.crawl_start(scraper_input.offset)
+        forward_cursor, position, job_list = (
+            resume.cursor,
+            resume.position,
+            resume.jobs,
+        )
+        for job in job_list:
+            self.seen_urls.add(job.job_url)
+        self.collected_skip = scraper_input.offset - resume.base
+        if resume.exhausted:
+            return self._offset_slice(job_list, resume.base, results_wanted)
         if forward_cursor is None:
-            log.warning(
-                "initial cursor not found, try changing your query or there was at most 10 results"
-            )
-            return JobResponse(jobs=job_list)
+            forward_cursor, job_list = self._get_initial_cursor_and_jobs()
+            position = len(self.seen_urls)
+            self.checkpoint_page(position, forward_cursor, job_list)
+            if forward_cursor is None:
+                log.warning(
+                    "initial cursor not found, try changing your query or there was at most 10 results"
+                )
+                return JobResponse(jobs=job_list)
 
         page = 1
+        # jobs to collect, job_list starting at listing base; filters may keep
+        # fewer jobs than the listings paged through
+        wanted = scraper_input.offset - resume.base + results_wanted
+        # the next page, requested as soon as this page's cursor is known
+        next_page = None
 
-        while (
-            len(self.seen_urls) < scraper_input.results_wanted + scraper_input.offset
-            and forward_cursor
-        ):
+        while len(job_list) < wanted and forward_cursor:
+            if self.should_stop():
+                log.warning(f"stopping early, returning after page {page - 1}")
+                break
             log.info(
-                f"search page: {page} / {math.ceil(scraper_input.results_wanted / self.jobs_per_page)}"
+                f"search page: {page} / {math.ceil(results_wanted / self.jobs_per_page)}"
             )
+            seen_before = len(self.seen_urls)
             try:
-                jobs, forward_cursor = self._get_jobs_next_page(forward_cursor)
+                jobs_raw, forward_cursor = (
+                    next_page.result()
+                    if next_page
+                    else self._fetch_next_page(forward_cursor)
+                )
+                next_page = None
+                if forward_cursor and len(job_list) + len(jobs_raw) < wanted:
+                    next_page = self.prefetch(self._fetch_next_page, forward_cursor)
+                jobs = self._parse_jobs(jobs_raw)
             except Exception as e:
                 log.error(f"failed to get jobs on page: {page}, {e}")
                 break
-            if not jobs:
+            position += len(self.seen_urls) - seen_before
+            if not jobs_raw:
                 log.info(f"found no jobs on page: {page}")
                 break
             job_list += jobs
+            self.checkpoint_page(position, forward_cursor, jobs)
+            if self.stopped_early:
+                log.info(f"reached known or old postings on page {page}")
+                break
             page += 1
-        return JobResponse(
-            jobs=job_list[
-                scraper_input.offset : scraper_input.offset
-                + scraper_input.results_wanted
-            ]
-        )
+        if next_page is not None:
+            next_page.cancel()
+        return self._offset_slice(job_list, resume.base, results_wanted)
+
+    def _offset_slice(
+        self, job_list: list[JobPost], base: int, results_wanted: int
+    ) -> JobResponse:
+        """The wanted jobs after the offset; job_list starts at listing base"""
+        skip = self.scraper_input.offset - base
+        return JobResponse(jobs=job_list[skip : skip + results_wanted])
 
     def _get_initial_cursor_and_jobs(self) -> Tuple[str, list[JobPost]]:
         """Gets initial cursor and jobs to paginate through job listings"""
@@ -121,82 +174,113 @@ class Google(Scraper):
             query = self.scraper_input.google_search_term
 
         params = {"q": query, "udm": "8"}
-        response = self.session.get(self.url, headers=headers_initial, params=params)
-
-        pattern_fc = r'<div jsname="Yust4d"[^>]+data-async-fc="([^"]+)"'
-        match_fc = re.search(pattern_fc, response.text)
-        data_async_fc = match_fc.group(1) if match_fc else None
-        jobs_raw = find_job_info_initial_page(response.text)
-        jobs = []
-        for job_raw in jobs_raw:
-            job_post = self._parse_job(job_raw)
-            if job_post:
-                jobs.append(job_post)
+        response = self.session.get(
+            self.url,
+            headers=headers_initial,
+            params=params,
+            timeout=self.request_timeout(None),
+        )
+        self.stats.page_fetched()
+
+        with self.stats.phase("parse"):
+            data_async_fc = find_async_cursor(response.text, 'jsname="Yust4d"')
+            jobs_raw = find_job_info_initial_page(response.text)
+            jobs = []
+            for job_raw in jobs_raw:
+                job_post = self._parse_job(job_raw)
+                if job_post:
+                    jobs.append(job_post)
+        self.stats.jobs_parsed(len(jobs))
+        self._observe_page(jobs_raw)
         return data_async_fc, jobs
 
-    def _get_jobs_next_page(self, forward_cursor: str) -> Tuple[list[JobPost], str]:
+    def _fetch_next_page(self, forward_cursor: str) -> Tuple[list, str]:
+        """Fetches the raw jobs on the page at a cursor, and the next cursor"""
         params = {"fc": [forward_cursor], "fcv": ["3"], "async": [async_param]}
-        response = self.session.get(self.jobs_url, headers=headers_jobs, params=params)
-        return self._parse_jobs(response.text)
+        response = self.session.get(
+            self.jobs_url,
+            headers=headers_jobs,
+            params=params,
+            timeout=self.request_timeout(None),
+        )
+        self.stats.page_fetched()
+        with self.stats.phase("decode"):
+            return extract_jobs_next_page(response.text)
 
-    def _parse_jobs(self, job_data: str) -> Tuple[list[JobPost], str]:
+    def _parse_jobs(self, jobs_raw: list) -> list[JobPost]:
         """
-        Parses jobs on a page with next page cursor
+        Parses the raw jobs on a page
         """
-        start_idx = job_data.find("[[[")
-        end_idx = job_data.rindex("]]]") + 3
-        s = job_data[start_idx:end_idx]
-        parsed = json.loads(s)[0]
-
-        pattern_fc = r'data-async-fc="([^"]+)"'
-        match_fc = re.search(pattern_fc, job_data)
-        data_async_fc = match_fc.group(1) if match_fc else None
-        jobs_on_page = []
-        for array in parsed:
-            _, job_data = array
-            if not job_data.startswith("[[["):
-                continue
-            job_d = json.loads(job_data)
-
-            job_info = find_job_info(job_d)
-            job_post = self._parse_job(job_info)
-            if job_post:
-                jobs_on_page.append(job_post)
-        return jobs_on_page, data_async_fc
+        with self.stats.phase("parse"):
+            jobs_on_page = []
+            for job_info in jobs_raw:
+                job_post = self._parse_job(job_info)
+                if job_post:
+                    jobs_on_page.append(job_post)
+        self.stats.jobs_parsed(len(jobs_on_page))
+        self._observe_page(jobs_raw)
+        return jobs_on_page
+
+    def _observe_page(self, jobs_raw: list):
+        self.observe_listings(
+            (f"go-{job_info[28]}", self._date_posted(job_info)) for job_info in jobs_raw
+        )
+
+    @staticmethod
+    def _date_posted(job_info: list):
+        days_ago_str = job_info[12]
+        if type(days_ago_str) == str:
+            match = re.search(r"\d+", days_ago_str)
+            days_ago = int(match.group()) if match else None
+            if days_ago is not None:
+                return (datetime.now() - timedelta(days=days_ago)).date()
+        return None
 
     def _parse_job(self, job_info: list):
         job_url = job_info[3][0][0] if job_info[3] and job_info[3][0] else None
-        if job_url in self.seen_urls:
+        if not self.seen_urls.add(job_url):
             return
-        self.seen_urls.add(job_url)
 
         title = job_info[0]
         company_name = job_info[1]
         location = city = job_info[2]
-        state = country = date_posted = None
+        state = country = None
         if location and "," in location:
             city, state, *country = [*map(lambda x: x.strip(), location.split(","))]
 
-        days_ago_str = job_info[12]
-        if type(days_ago_str) == str:
-            match = re.search(r"\d+", days_ago_str)
-            days_ago = int(match.group()) if match else None
-            date_posted = (datetime.now() - timedelta(days=days_ago)).date()
+        job_location = Location(
+            city=city, state=state, country=country[0] if country else None
+        )
+        date_posted = self._date_posted(job_info)
+        if not self.keep_listing(
+            date_posted,
+            id=f"go-{job_info[28]}",
+            title=title,
+            company=company_name,
+            location=job_location,
+        ):
+            return None
 
-        description = job_info[19]
+        derived = NO_DESCRIPTION
+        # is_remote and job_type are read from the description
+        if self.wants(*DESCRIPTION_FIELDS, "is_remote", "job_type"):
+            derived = derive_description(
+                job_info[19], None, self.stats, self.content_cache, with_job_type=True
+            )
+        description = derived.description or ""
 
         job_post = JobPost(
             id=f"go-{job_info[28]}",
             title=title,
             company_name=company_name,
-            location=Location(
-                city=city, state=state, country=country[0] if country else None
-            ),
+            location=job_location,
             job_url=job_url,
             date_posted=date_posted,
             is_remote="remote" in description.lower() or "wfh" in description.lower(),
-            description=description,
-            emails=extract_emails_from_text(description),
-            job_type=extract_job_type(description),
+            description=self.store_description(derived.description),
+            emails=derived.emails,
+            job_type=derived.job_type,
+            description_hash=derived.description_hash,
+            unchanged=derived.unchanged,
         )
         return job_post
@@ -1,41 +1,106 @@
-import re
+from __future__ import annotations
 
-from jobspy.util import create_logger
+import json
+from typing import Iterator
+
+from jobspy.util import create_logger, json_loads
 
 log = create_logger("Google")
 
+JOB_INFO_KEY = "520084652"
+_job_info_anchor = f'"{JOB_INFO_KEY}":'
+_json_decoder = json.JSONDecoder()
+
+
+def decode_json_at(text: str, idx: int) -> tuple[object, int]:
+    """
+    Decodes the single JSON value starting at text[idx]
+    :return: the value and the index just past it
+    """
+    while text[idx] in " \t\r\n":
+        idx += 1
+    return _json_decoder.raw_decode(text, idx)
+
+
+def iter_job_infos(text: str) -> Iterator[list]:
+    """
+    Yields every job array keyed by JOB_INFO_KEY in the text. Each occurrence is
+    located with str.find and only the array itself is decoded.
+    """
+    pos = text.find(_job_info_anchor)
+    while pos != -1:
+        end = pos + len(_job_info_anchor)
+        try:
+            value, end = decode_json_at(text, end)
+        except (ValueError, IndexError) as e:
+            log.error(f"Failed to parse job info: {str(e)}")
+        else:
+            if isinstance(value, list):
+                yield value
+        pos = text.find(_job_info_anchor, end)
+
 
 def find_job_info(jobs_data: list | dict) -> list | None:
-    """Iterates through the JSON data to find the job listings"""
-    if isinstance(jobs_data, dict):
-        for key, value in jobs_data.items():
-            if key == "520084652" and isinstance(value, list):
+    """Walks the decoded JSON data (iteratively) to find the job listing"""
+    stack = [jobs_data]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            value = item.get(JOB_INFO_KEY)
+            if isinstance(value, list):
                 return value
-            else:
-                result = find_job_info(value)
-                if result:
-                    return result
-    elif isinstance(jobs_data, list):
-        for item in jobs_data:
-            result = find_job_info(item)
-            if result:
-                return result
+            stack.extend(reversed(list(item.values())))
+        elif isinstance(item, list):
+            stack.extend(reversed(item))
     return None
 
 
-def find_job_info_initial_page(html_text: str):
-    pattern = f'520084652":(' + r"\[.*?\]\s*])\s*}\s*]\s*]\s*]\s*]\s*]"
-    results = []
-    matches = re.finditer(pattern, html_text)
+def find_job_info_initial_page(html_text: str) -> list[list]:
+    return list(iter_job_infos(html_text))
 
-    import json
 
-    for match in matches:
-        try:
-            parsed_data = json.loads(match.group(1))
-            results.append(parsed_data)
+def find_async_cursor(text: str, container: str | None = None) -> str | None:
+    """
+    Gets the data-async-fc pagination cursor, optionally only from the tag that
+    contains the `container` marker
+    """
+    start = 0
+    if container:
+        start = text.find(container)
+        if start == -1:
+            return None
+    marker = 'data-async-fc="'
+    idx = text.find(marker, start)
+    if idx == -1 or (container and ">" in text[start:idx]):
+        return None
+    idx += len(marker)
+    end = text.find('"', idx)
+    return text[idx:end] if end != -1 else None
+
+
+def extract_jobs_next_page(job_data: str) -> tuple[list[list], str | None]:
+    """
+    Extracts the job arrays and next page cursor from an async callback response.
+    The outer array is decoded once; each embedded job blob is anchor-scanned for
+    its job array, falling back to a full decode and search if the key is absent.
+    """
+    start_idx = job_data.find("[[[")
+    if start_idx == -1:
+        return [], find_async_cursor(job_data)
+    try:
+        end_idx = job_data.rindex("]]]") + 3
+        parsed = json_loads(job_data[start_idx:end_idx])[0]
+    except ValueError:
+        parsed = decode_json_at(job_data, start_idx)[0][0]
 
-        except json.JSONDecodeError as e:
-            log.error(f"Failed to parse match: {str(e)}")
-            results.append({"raw_match": match.group(0), "error": str(e)})
-    return results
+    jobs = []
+    for array in parsed:
+        _, blob = array
+        if not blob.startswith("[[["):
+            continue
+        job_info = next(iter_job_infos(blob), None)
+        if job_info is None:
+            job_info = find_job_info(json_loads(blob))
+        if job_info:
+            jobs.append(job_info)
+    return jobs, find_async_cursor(job_data)
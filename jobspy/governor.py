@@ -0,0 +1,189 @@
+"""
+jobspy.governor
+~~~~~~~~~~~~~~~~~~~
+
+Process-wide execution governor. Every scrape_jobs call runs its sites on one
+shared, bounded site pool, and every scraper's fan-out (detail fetches, page
+prefetches) goes through one shared, bounded worker pool with a per-site cap on
+in-flight tasks. Concurrent searches therefore share a fixed number of threads
+instead of each opening its own nested pools.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class ExecutionGovernor:
+    def __init__(
+        self,
+        max_workers: int = 64,
+        max_sites: int = 16,
+        per_site_limit: int = 16,
+        site_limits: dict[str, int] | None = None,
+    ):
+        """
+        :param max_workers: global cap on in-flight fan-out tasks across all sites
+        :param max_sites: cap on concurrently running site scrapes across all calls
+        :param per_site_limit: default cap on in-flight fan-out tasks per site
+        :param site_limits: per-site overrides of per_site_limit, keyed by site value
+        """
+        self.max_workers = max_workers
+        self.max_sites = max_sites
+        self.per_site_limit = per_site_limit
+        self.site_limits = dict(site_limits or {})
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="jobspy")
+        self._site_executor = ThreadPoolExecutor(
+            max_sites, thread_name_prefix="jobspy-site"
+        )
+        # every caller of submit_request holds a worker or site slot and waits on
+        # at most two requests, so this pool is sized to never queue
+        self._request_executor = ThreadPoolExecutor(
+            2 * (max_workers + max_sites), thread_name_prefix="jobspy-request"
+        )
+        self._lock = threading.Lock()
+        self._semaphores: dict[str, threading.BoundedSemaphore] = {}
+        self._queued = 0
+        self._in_flight = 0
+        self._site_in_flight: dict[str, int] = {}
+        self._site_queue_seconds: dict[str, float] = {}
+        self._sites_running = 0
+        self._sites_queued = 0
+        self._completed = 0
+
+    def _semaphore(self, site: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if site not in self._semaphores:
+                limit = self.site_limits.get(site, self.per_site_limit)
+                self._semaphores[site] = threading.BoundedSemaphore(limit)
+            return self._semaphores[site]
+
+    def submit(self, site: str, fn, *args, **kwargs) -> Future:
+        """
+        Submits a fan-out task for `site`. Blocks the caller while the site is at
+        its in-flight cap, which applies backpressure to the submitting scraper.
+        """
+        semaphore = self._semaphore(site)
+        semaphore.acquire()
+        submitted = time.perf_counter()
+        state = {"started": False}
+
+        def run():
+            with self._lock:
+                state["started"] = True
+                self._queued -= 1
+                self._in_flight += 1
+                self._site_in_flight[site] = self._site_in_flight.get(site, 0) + 1
+                self._site_queue_seconds[site] = self._site_queue_seconds.get(
+                    site, 0.0
+                ) + (time.perf_counter() - submitted)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._in_flight -= 1
+                    self._site_in_flight[site] -= 1
+                    self._completed += 1
+
+        def release(_future: Future):
+            with self._lock:
+                if not state["started"]:
+                    self._queued -= 1
+            semaphore.release()
+
+        with self._lock:
+            self._queued += 1
+        try:
+            future = self._executor.submit(run)
+        except BaseException:
+            with self._lock:
+                self._queued -= 1
+            semaphore.release()
+            raise
+        future.add_done_callback(release)
+        return future
+
+    def submit_site(self, fn, *args, **kwargs) -> Future:
+        """Submits a whole-site scrape to the shared site pool"""
+
+        def run():
+            with self._lock:
+                self._sites_queued -= 1
+                self._sites_running += 1
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._sites_running -= 1
+
+        with self._lock:
+            self._sites_queued += 1
+        future = self._site_executor.submit(run)
+
+        def dequeue_if_cancelled(f: Future):
+            if f.cancelled():
+                with self._lock:
+                    self._sites_queued -= 1
+
+        future.add_done_callback(dequeue_if_cancelled)
+        return future
+
+    def submit_request(self, fn, *args, **kwargs) -> Future:
+        """
+        Runs a single request for a caller that already holds a worker or site
+        slot and blocks on the result, e.g. the primary and duplicate of a hedged
+        request. Not subject to the per-site caps.
+        """
+        return self._request_executor.submit(fn, *args, **kwargs)
+
+    def metrics(self) -> dict:
+        """Snapshot of queue depth and utilization"""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "in_flight": self._in_flight,
+                "queue_depth": self._queued,
+                "utilization": round(self._in_flight / self.max_workers, 3),
+                "completed": self._completed,
+                "sites_running": self._sites_running,
+                "sites_queued": self._sites_queued,
+                "site_utilization": round(self._sites_running / self.max_sites, 3),
+                "site_in_flight": dict(self._site_in_flight),
+                "site_queue_seconds": {
+                    site: round(seconds, 4)
+                    for site, seconds in self._site_queue_seconds.items()
+                },
+            }
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = True):
+        self._executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+        self._site_executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+        self._request_executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+
+_governor: ExecutionGovernor | None = None
+_governor_lock = threading.Lock()
+
+
+def get_governor() -> ExecutionGovernor:
+    """Returns the process-wide governor, creating it with defaults on first use"""
+    global _governor
+    with _governor_lock:
+        if _governor is None:
+            _governor = ExecutionGovernor()
+        return _governor
+
+
+def configure_governor(**kwargs) -> ExecutionGovernor:
+    """
+    Replaces the process-wide governor; takes ExecutionGovernor's arguments.
+    Tasks already submitted to the previous governor are allowed to finish.
+    """
+    global _governor
+    with _governor_lock:
+        previous, _governor = _governor, ExecutionGovernor(**kwargs)
+    if previous is not None:
+        previous.shutdown(wait=False, cancel_futures=False)
+    return _governor
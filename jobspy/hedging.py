@@ -0,0 +1,139 @@
+"""
+jobspy.hedging
+~~~~~~~~~~~~~~~~~~~
+
+Hedged detail requests. A request that is still running after the site's
+observed p90 detail latency gets a duplicate; whichever response arrives first
+is used and the other is cancelled (or, if already on the wire, ignored). Each
+request takes the next proxy of the session's rotation per call, so with
+several proxies the duplicate goes out through a different one than the
+original. Duplicates are limited to a fraction of each scrape's detail
+requests.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+
+from jobspy.governor import get_governor
+from jobspy.telemetry import ScrapeStats
+
+
+class LatencyWindow:
+    def __init__(self, size: int = 200):
+        """
+        :param size: number of most recent latencies kept
+        """
+        self._lock = threading.Lock()
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def add(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._samples)
+
+    def quantile(self, q: float) -> float | None:
+        """Latency at quantile q of the window, or None while it is empty"""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        return samples[min(int(q * len(samples)), len(samples) - 1)]
+
+
+# detail latencies per site, shared across scrape_jobs calls so the p90 is
+# known from the first request of a call
+_windows: dict[str, LatencyWindow] = {}
+_windows_lock = threading.Lock()
+
+
+def get_latency_window(site: str) -> LatencyWindow:
+    with _windows_lock:
+        if site not in _windows:
+            _windows[site] = LatencyWindow()
+        return _windows[site]
+
+
+class Hedger:
+    def __init__(
+        self,
+        site: str,
+        stats: ScrapeStats,
+        budget: float,
+        quantile: float = 0.9,
+        min_samples: int = 20,
+    ):
+        """
+        :param site: site value whose latency window is used
+        :param stats: site stats charged with hedged_requests / hedge_wins
+        :param budget: max duplicates as a fraction of detail requests (0.1 = 10%)
+        :param quantile: latency quantile after which a request is hedged
+        :param min_samples: latencies observed before hedging starts
+        """
+        self.site = site
+        self.stats = stats
+        self.budget = budget
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self.window = get_latency_window(site)
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._hedges = 0
+
+    def _take_budget(self) -> bool:
+        with self._lock:
+            if self._hedges + 1 > self.budget * self._calls:
+                return False
+            self._hedges += 1
+            return True
+
+    def _submit(self, fn, args, kwargs) -> Future:
+        start = time.perf_counter()
+        future = get_governor().submit_request(fn, *args, **kwargs)
+
+        def record(f: Future):
+            if not f.cancelled() and f.exception() is None:
+                self.window.add(time.perf_counter() - start)
+
+        future.add_done_callback(record)
+        return future
+
+    def run(self, fn, *args, **kwargs):
+        """
+        Calls fn(*args, **kwargs), duplicating the call once if it outlasts the
+        site's latency quantile and the budget allows. Returns the first
+        successful result; raises only if every attempt failed.
+        """
+        with self._lock:
+            self._calls += 1
+        primary = self._submit(fn, args, kwargs)
+        futures = [primary]
+        delay = None
+        if len(self.window) >= self.min_samples:
+            delay = self.window.quantile(self.quantile)
+        if delay is not None:
+            done, _ = wait(futures, timeout=delay)
+            if not done and self._take_budget():
+                self.stats.incr("hedged_requests")
+                futures.append(self._submit(fn, args, kwargs))
+
+        pending = set(futures)
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = future.exception()
+                    continue
+                for loser in pending:
+                    loser.cancel()
+                if future is not primary:
+                    self.stats.incr("hedge_wins")
+                return future.result()
+        raise error
@@ -4,9 +4,15 @@ import math
 from datetime import datetime
 from typing import Tuple
 
-from jobspy.indeed.constant import job_search_query, api_headers
+from jobspy.indeed.constant import (
+    job_search_query,
+    api_headers,
+    description_selection,
+    dossier_selection,
+)
 from jobspy.indeed.util import is_job_remote, get_compensation, get_job_type
 from jobspy.model import (
+    DESCRIPTION_FIELDS,
     Scraper,
     ScraperInput,
     Site,
@@ -14,17 +20,33 @@ from jobspy.model import (
     Location,
     JobResponse,
     JobType,
-    DescriptionFormat,
 )
+from jobspy.content_cache import derive_description
 from jobspy.util import (
-    extract_emails_from_text,
-    markdown_converter,
     create_session,
     create_logger,
+    json_dumps,
+    json_loads,
+    ConcurrentSet,
 )
 
 log = create_logger("Indeed")
 
+# columns filled from the employer dossier
+DOSSIER_FIELDS = (
+    "company_url_direct",
+    "company_addresses",
+    "company_industry",
+    "company_num_employees",
+    "company_revenue",
+    "company_description",
+    "company_logo",
+)
+# share of a page's employers already cached above which the next page is
+# requested without dossiers; the few uncached employers on such a page get no
+# company_* columns, and are cached once the share drops and dossiers return
+WARM_CACHE_SHARE = 0.9
+
 
 class Indeed(Scraper):
     def __init__(
@@ -36,16 +58,18 @@ class Indeed(Scraper):
         super().__init__(Site.INDEED, proxies=proxies)
 
         self.session = create_session(
-            proxies=self.proxies, ca_cert=ca_cert, is_tls=False
+            proxies=self.proxies, ca_cert=ca_cert, is_tls=False, stats=self.stats
         )
         self.scraper_input = None
         self.jobs_per_page = 100
         self.num_workers = 10
-        self.seen_urls = set()
+        self.seen_urls = ConcurrentSet()
         self.headers = None
         self.api_country_code = None
         self.base_url = None
         self.api_url = "https://apis.indeed.com/graphql"
+        # share of the last page's employers found in the company cache
+        self.cached_share = 0.0
 
     def scrape(self, scraper_input: ScraperInput) -> JobResponse:
         """
@@ -54,37 +78,70 @@ class Indeed(Scraper):
         :return: job_response
         """
         self.scraper_input = scraper_input
+        self.seen_urls = ConcurrentSet()
+        self.cached_share = 0.0
         domain, self.api_country_code = self.scraper_input.country.indeed_domain_value
         self.base_url = f"https://{domain}.indeed.com"
         self.headers = api_headers.copy()
         self.headers["indeed-co"] = self.scraper_input.country.indeed_domain_value
-        job_list = []
+        # a stored cursor skips the pages before a deep offset; position counts
+        # the listings paged through, from the start of the search, and is only
+        # recorded in the checkpoint: filters may keep fewer jobs than that
+        resume = self.crawl_start(scraper_input.offset)
+        cursor, position, job_list = resume.cursor, resume.position, resume.jobs
+        skip = self.collected_skip = scraper_input.offset - resume.base
+        for job in job_list:
+            self.seen_urls.add(job.job_url)
         page = 1
+        # jobs to collect, job_list starting at listing base
+        wanted = skip + scraper_input.results_wanted
+        # the next page, requested as soon as this page's cursor is known
+        next_page = None
 
-        cursor = None
-
-        while len(self.seen_urls) < scraper_input.results_wanted + scraper_input.offset:
+        while len(job_list) < wanted and not resume.exhausted:
+            if self.should_stop():
+                log.warning(f"stopping early, returning after page {page - 1}")
+                break
             log.info(
                 f"search page: {page} / {math.ceil(scraper_input.results_wanted / self.jobs_per_page)}"
             )
-            jobs, cursor = self._scrape_page(cursor)
-            if not jobs:
+            results, cursor = (
+                next_page.result()
+                if next_page
+                else self._fetch_page(cursor, self._dossier_needed())
+            )
+            next_page = None
+            if not results:
                 log.info(f"found no jobs on page: {page}")
                 break
+            self._observe_employers(results)
+            if cursor and len(job_list) + len(results) < wanted:
+                next_page = self.prefetch(
+                    self._fetch_page, cursor, self._dossier_needed()
+                )
+            seen_before = len(self.seen_urls)
+            jobs = self._process_page(results)
+            position += len(self.seen_urls) - seen_before
             job_list += jobs
+            self.checkpoint_page(position, cursor, jobs)
+            if not cursor:
+                break
+            if self.stopped_early:
+                log.info(f"reached known or old postings on page {page}")
+                break
             page += 1
-        return JobResponse(
-            jobs=job_list[
-                scraper_input.offset : scraper_input.offset
-                + scraper_input.results_wanted
-            ]
-        )
+        if next_page is not None:
+            next_page.cancel()
+        return JobResponse(jobs=job_list[skip:wanted])
 
-    def _scrape_page(self, cursor: str | None) -> Tuple[list[JobPost], str | None]:
+    def _fetch_page(
+        self, cursor: str | None, dossier: bool = True
+    ) -> Tuple[list[dict], str | None]:
         """
-        Scrapes a page of Indeed for jobs with scraper_input criteria
+        Fetches a page of Indeed search results with scraper_input criteria
         :param cursor:
-        :return: jobs found on page, next page cursor
+        :param dossier: select the employer dossiers (company_* columns)
+        :return: raw results on page, next page cursor
         """
         jobs = []
         new_cursor = None
@@ -104,6 +161,13 @@ class Indeed(Scraper):
             dateOnIndeed=self.scraper_input.hours_old,
             cursor=f'cursor: "{cursor}"' if cursor else "",
             filters=filters,
+            # is_remote also looks for remote keywords in the description
+            description=(
+                description_selection
+                if self.wants(*DESCRIPTION_FIELDS, "is_remote")
+                else ""
+            ),
+            dossier=dossier_selection if dossier else "",
         )
         payload = {
             "query": query,
@@ -113,8 +177,8 @@ class Indeed(Scraper):
         response = self.session.post(
             self.api_url,
             headers=api_headers_temp,
-            json=payload,
-            timeout=10,
+            data=json_dumps(payload),
+            timeout=self.request_timeout(10),
             verify=False,
         )
         if not response.ok:
@@ -122,17 +186,58 @@ class Indeed(Scraper):
                 f"responded with status code: {response.status_code} (submit GitHub issue if this appears to be a bug)"
             )
             return jobs, new_cursor
-        data = response.json()
+        self.stats.page_fetched()
+        with self.stats.phase("decode"):
+            data = json_loads(response.content)
         jobs = data["data"]["jobSearch"]["results"]
         new_cursor = data["data"]["jobSearch"]["pageInfo"]["nextCursor"]
+        return jobs, new_cursor
+
+    def _dossier_needed(self) -> bool:
+        """
+        Whether to select employer dossiers: not if their columns aren't wanted,
+        or while most employers on the last page were already cached
+        """
+        if not self.wants(*DOSSIER_FIELDS):
+            return False
+        return self.company_cache is None or self.cached_share < WARM_CACHE_SHARE
 
-        job_list = []
-        for job in jobs:
-            processed_job = self._process_job(job["job"])
-            if processed_job:
-                job_list.append(processed_job)
+    def _observe_employers(self, results: list[dict]):
+        """Updates cached_share from a page's employers"""
+        employers = [
+            job["job"]["employer"]
+            for job in results
+            if job["job"].get("employer")
+            and job["job"]["employer"].get("relativeCompanyPageUrl")
+        ]
+        if not employers or self.company_cache is None:
+            return
+        cached = [
+            self.company_cache.get(self.site.value, employer["relativeCompanyPageUrl"])
+            is not None
+            for employer in employers
+        ]
+        self.cached_share = sum(cached) / len(cached)
 
-        return job_list, new_cursor
+    def _process_page(self, jobs: list[dict]) -> list[JobPost]:
+        """
+        Parses a page of raw results into job posts
+        """
+        with self.stats.phase("parse"):
+            job_list = []
+            for job in jobs:
+                processed_job = self._process_job(job["job"])
+                if processed_job:
+                    job_list.append(processed_job)
+        self.stats.jobs_parsed(len(job_list))
+        self.observe_listings(
+            (
+                f'in-{job["job"]["key"]}',
+                datetime.fromtimestamp(job["job"]["datePublished"] / 1000),
+            )
+            for job in jobs
+        )
+        return job_list
 
     def _build_filters(self):
         """
@@ -199,48 +304,88 @@ class Indeed(Scraper):
         :return: JobPost if it's a new job
         """
         job_url = f'{self.base_url}/viewjob?jk={job["key"]}'
-        if job_url in self.seen_urls:
+        if not self.seen_urls.add(job_url):
             return
-        self.seen_urls.add(job_url)
-        description = job["description"]["html"]
-        if self.scraper_input.description_format == DescriptionFormat.MARKDOWN:
-            description = markdown_converter(description)
+        compensation = get_compensation(job["compensation"])
+        company = job["employer"].get("name") if job.get("employer") else None
+        location = Location(
+            city=job.get("location", {}).get("city"),
+            state=job.get("location", {}).get("admin1Code"),
+            country=job.get("location", {}).get("countryCode"),
+        )
+        if not self.keep_listing(
+            datetime.fromtimestamp(job["datePublished"] / 1000),
+            id=f'in-{job["key"]}',
+            title=job["title"],
+            company=company,
+            location=location,
+            compensation=compensation,
+        ):
+            return None
+        recruit = job.get("recruit")
+        job_url_direct = recruit.get("viewJobUrl") if recruit else None
+        # the description comes with the listing, so never wait for another
+        # board's copy; sharing it spares the other boards' detail requests
+        with self.claim_detail(
+            job["title"], company, location, job_url_direct, wait=0
+        ) as claim:
+            if claim.shared:
+                derived = claim.shared.derived
+            else:
+                derived = derive_description(
+                    job["description"]["html"] if job.get("description") else None,
+                    self.scraper_input.description_format,
+                    self.stats,
+                    self.content_cache,
+                )
+                claim.publish(derived, job_url_direct)
+        description = derived.description
 
         job_type = get_job_type(job["attributes"])
         timestamp_seconds = job["datePublished"] / 1000
         date_posted = datetime.fromtimestamp(timestamp_seconds).strftime("%Y-%m-%d")
-        employer = job["employer"].get("dossier") if job["employer"] else None
-        employer_details = employer.get("employerDetails", {}) if employer else {}
         rel_url = job["employer"]["relativeCompanyPageUrl"] if job["employer"] else None
+        if job["employer"] and "dossier" in job["employer"]:
+            company_fields = self._parse_dossier(job["employer"]["dossier"])
+            self.cache_company(rel_url, **company_fields)
+        else:
+            company_fields = self.cached_company(rel_url) or {}
         return JobPost(
             id=f'in-{job["key"]}',
             title=job["title"],
-            description=description,
-            company_name=job["employer"].get("name") if job.get("employer") else None,
+            description=self.store_description(description),
+            company_name=company,
             company_url=(f"{self.base_url}{rel_url}" if job["employer"] else None),
-            company_url_direct=(
-                employer["links"]["corporateWebsite"] if employer else None
-            ),
-            location=Location(
-                city=job.get("location", {}).get("city"),
-                state=job.get("location", {}).get("admin1Code"),
-                country=job.get("location", {}).get("countryCode"),
-            ),
+            location=location,
             job_type=job_type,
-            compensation=get_compensation(job["compensation"]),
+            compensation=compensation,
             date_posted=date_posted,
             job_url=job_url,
-            job_url_direct=(
-                job["recruit"].get("viewJobUrl") if job.get("recruit") else None
+            job_url_direct=job_url_direct,
+            emails=derived.emails,
+            is_remote=is_job_remote(job, description or ""),
+            **{field: company_fields.get(field) for field in DOSSIER_FIELDS},
+            description_hash=derived.description_hash,
+            unchanged=derived.unchanged,
+        )
+
+    @staticmethod
+    def _parse_dossier(employer: dict | None) -> dict:
+        """
+        Parses an employer dossier into its company_* fields
+        :param employer: the dossier, None if Indeed has none for the employer
+        """
+        employer_details = employer.get("employerDetails", {}) if employer else {}
+        return {
+            "company_url_direct": (
+                employer["links"]["corporateWebsite"] if employer else None
             ),
-            emails=extract_emails_from_text(description) if description else None,
-            is_remote=is_job_remote(job, description),
-            company_addresses=(
+            "company_addresses": (
                 employer_details["addresses"][0]
                 if employer_details.get("addresses")
                 else None
             ),
-            company_industry=(
+            "company_industry": (
                 employer_details["industry"]
                 .replace("Iv1", "")
                 .replace("_", " ")
@@ -249,12 +394,12 @@ class Indeed(Scraper):
                 if employer_details.get("industry")
                 else None
             ),
-            company_num_employees=employer_details.get("employeesLocalizedLabel"),
-            company_revenue=employer_details.get("revenueLocalizedLabel"),
-            company_description=employer_details.get("briefDescription"),
-            company_logo=(
+            "company_num_employees": employer_details.get("employeesLocalizedLabel"),
+            "company_revenue": employer_details.get("revenueLocalizedLabel"),
+            "company_description": employer_details.get("briefDescription"),
+            "company_logo": (
                 employer["images"].get("squareLogoUrl")
                 if employer and employer.get("images")
                 else None
             ),
-        )
+        }
@@ -21,9 +21,7 @@ job_search_query = """
             title
             datePublished
             dateOnIndeed
-            description {{
-                html
-            }}
+            {description}
             location {{
                 countryName
                 countryCode
@@ -67,24 +65,7 @@ job_search_query = """
             employer {{
                 relativeCompanyPageUrl
                 name
-                dossier {{
-                    employerDetails {{
-                    addresses
-                    industry
-                    employeesLocalizedLabel
-                    revenueLocalizedLabel
-                    briefDescription
-                    ceoName
-                    ceoPhotoUrl
-                    }}
-                    images {{
-                        headerImageUrl
-                        squareLogoUrl
-                    }}
-                    links {{
-                    corporateWebsite
-                }}
-                }}
+                {dossier}
             }}
             recruit {{
                 viewJobUrl
@@ -97,6 +78,30 @@ job_search_query = """
     }}
     """
 
+# selections left out of job_search_query when their columns aren't wanted
+description_selection = """description {
+                html
+            }"""
+
+dossier_selection = """dossier {
+                    employerDetails {
+                    addresses
+                    industry
+                    employeesLocalizedLabel
+                    revenueLocalizedLabel
+                    briefDescription
+                    ceoName
+                    ceoPhotoUrl
+                    }
+                    images {
+                        headerImageUrl
+                        squareLogoUrl
+                    }
+                    links {
+                    corporateWebsite
+                }
+                }"""
+
 api_headers = {
     "Host": "apis.indeed.com",
     "content-type": "application/json",
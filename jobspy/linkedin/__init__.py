@@ -2,8 +2,7 @@ from __future__ import annotations
 
 import math
 import random
-import time
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 from urllib.parse import urlparse, urlunparse, unquote
 
@@ -11,6 +10,7 @@ import regex as re
 from bs4 import BeautifulSoup
 from bs4.element import Tag
 
+from jobspy.content_cache import NO_DESCRIPTION, derive_description
 from jobspy.exception import LinkedInException
 from jobspy.linkedin.constant import headers
 from jobspy.linkedin.util import (
@@ -20,20 +20,18 @@ from jobspy.linkedin.util import (
     parse_company_industry,
 )
 from jobspy.model import (
+    DESCRIPTION_FIELDS,
     JobPost,
     Location,
     JobResponse,
     Country,
     Compensation,
-    DescriptionFormat,
     Scraper,
     ScraperInput,
     Site,
 )
 from jobspy.util import (
-    extract_emails_from_text,
     currency_parser,
-    markdown_converter,
     create_session,
     remove_attributes,
     create_logger,
@@ -41,12 +39,22 @@ from jobspy.util import (
 
 log = create_logger("LinkedIn")
 
+POSTING_PAGE_FIELDS = ("job_type", "job_level", "job_function")
+# job page columns of the employer, kept in the company cache
+COMPANY_PAGE_FIELDS = ("company_industry", "company_logo")
+# columns only the job page fills, which a description shared by another board
+# (see claim_detail) lacks
+JOB_PAGE_FIELDS = (*POSTING_PAGE_FIELDS, *COMPANY_PAGE_FIELDS)
+# columns filled from the job page when linkedin_fetch_description is set
+DETAIL_FIELDS = (*DESCRIPTION_FIELDS, *JOB_PAGE_FIELDS, "job_url_direct")
+
 
 class LinkedIn(Scraper):
     base_url = "https://www.linkedin.com"
     delay = 3
     band_delay = 4
     jobs_per_page = 25
+    cards_per_page = 10
 
     def __init__(
         self, proxies: list[str] | str | None = None, ca_cert: str | None = None
@@ -62,6 +70,7 @@ class LinkedIn(Scraper):
             has_retry=True,
             delay=5,
             clear_cookies=True,
+            stats=self.stats,
         )
         self.session.headers.update(headers)
         self.scraper_input = None
@@ -75,101 +84,146 @@ class LinkedIn(Scraper):
         :return: job_response
         """
         self.scraper_input = scraper_input
-        job_list: list[JobPost] = []
-        seen_ids = set()
         start = scraper_input.offset // 10 * 10 if scraper_input.offset else 0
+        # offsets are direct, so the checkpoint only resumes an interrupted run
+        resume = self.crawl_start()
+        job_list: list[JobPost] = resume.jobs
+        seen_ids = {job.id.removeprefix("li-") for job in job_list}
+        if resume.resumed:
+            start = resume.cursor
         request_count = 0
-        seconds_old = (
-            scraper_input.hours_old * 3600 if scraper_input.hours_old else None
-        )
         continue_search = (
             lambda: len(job_list) < scraper_input.results_wanted and start < 1000
         )
         while continue_search():
-            request_count += 1
-            log.info(
-                f"search page: {request_count} / {math.ceil(scraper_input.results_wanted / 10)}"
-            )
-            params = {
-                "keywords": scraper_input.search_term,
-                "location": scraper_input.location,
-                "distance": scraper_input.distance,
-                "f_WT": 2 if scraper_input.is_remote else None,
-                "f_JT": (
-                    job_type_code(scraper_input.job_type)
-                    if scraper_input.job_type
-                    else None
-                ),
-                "pageNum": 0,
-                "start": start,
-                "f_AL": "true" if scraper_input.easy_apply else None,
-                "f_C": (
-                    ",".join(map(str, scraper_input.linkedin_company_ids))
-                    if scraper_input.linkedin_company_ids
-                    else None
-                ),
-            }
-            if seconds_old is not None:
-                params["f_TPR"] = f"r{seconds_old}"
-
-            params = {k: v for k, v in params.items() if v is not None}
-            try:
-                response = self.session.get(
-                    f"{self.base_url}/jobs-guest/jobs/api/seeMoreJobPostings/search?",
-                    params=params,
-                    timeout=10,
+            if self.should_stop():
+                log.warning(f"stopping early, returning after page {request_count}")
+                break
+            # with page_prefetch > 1 the next pages' offsets are guessed from a
+            # full page of cards and requested together
+            starts = [
+                start + i * self.cards_per_page for i in range(self.page_prefetch)
+            ]
+            starts = [page_start for page_start in starts if page_start < 1000]
+            finished = False
+            pages = self.fetch_pages(self._fetch_search_page, starts)
+            for page_start, job_cards in zip(starts, pages):
+                request_count += 1
+                log.info(
+                    f"search page: {request_count} / {math.ceil(scraper_input.results_wanted / 10)}"
                 )
-                if response.status_code not in range(200, 400):
-                    if response.status_code == 429:
-                        err = (
-                            f"429 Response - Blocked by LinkedIn for too many requests"
-                        )
-                    else:
-                        err = f"LinkedIn response status code {response.status_code}"
-                        err += f" - {response.text}"
-                    log.error(err)
+                if not job_cards:
                     return JobResponse(jobs=job_list)
-            except Exception as e:
-                if "Proxy responded with" in str(e):
-                    log.error(f"LinkedIn: Bad proxy")
-                else:
-                    log.error(f"LinkedIn: {str(e)}")
-                return JobResponse(jobs=job_list)
 
-            soup = BeautifulSoup(response.text, "html.parser")
-            job_cards = soup.find_all("div", class_="base-search-card")
-            if len(job_cards) == 0:
-                return JobResponse(jobs=job_list)
-
-            for job_card in job_cards:
-                href_tag = job_card.find("a", class_="base-card__full-link")
-                if href_tag and "href" in href_tag.attrs:
-                    href = href_tag.attrs["href"].split("?")[0]
-                    job_id = href.split("-")[-1]
-
-                    if job_id in seen_ids:
-                        continue
-                    seen_ids.add(job_id)
-
-                    try:
-                        fetch_desc = scraper_input.linkedin_fetch_description
-                        job_post = self._process_job(job_card, job_id, fetch_desc)
-                        if job_post:
-                            job_list.append(job_post)
-                        if not continue_search():
-                            break
-                    except Exception as e:
-                        raise LinkedInException(str(e))
-
-            if continue_search():
-                time.sleep(random.uniform(self.delay, self.delay + self.band_delay))
-                start += len(job_list)
+                page_start_count = len(job_list)
+                page_listings = []
+                for job_card in job_cards:
+                    href_tag = job_card.find("a", class_="base-card__full-link")
+                    if href_tag and "href" in href_tag.attrs:
+                        href = href_tag.attrs["href"].split("?")[0]
+                        job_id = href.split("-")[-1]
+
+                        if job_id in seen_ids:
+                            continue
+                        seen_ids.add(job_id)
+                        date_posted = self._parse_date_posted(job_card)
+                        page_listings.append((f"li-{job_id}", date_posted))
+
+                        try:
+                            fetch_desc = (
+                                scraper_input.linkedin_fetch_description
+                                and self.wants(*DETAIL_FIELDS)
+                            )
+                            with self.stats.phase("parse"):
+                                job_post = self._process_job(
+                                    job_card, job_id, date_posted, fetch_desc
+                                )
+                            if job_post:
+                                job_list.append(job_post)
+                            if not continue_search():
+                                break
+                        except Exception as e:
+                            raise LinkedInException(str(e))
+                self.stats.jobs_parsed(len(job_list) - page_start_count)
+                # advance past every card on the page, including repeats of
+                # cards already seen and ones keep_listing dropped
+                start = page_start + len(job_cards)
+                self.checkpoint_page(start, start, job_list[page_start_count:])
+                if self.observe_listings(page_listings):
+                    log.info(f"reached known or old postings on page {request_count}")
+                    finished = True
+                elif not page_listings or not continue_search():
+                    finished = True
+                if finished:
+                    break
+            if finished or not starts:
+                break
+            self.sleep(random.uniform(self.delay, self.delay + self.band_delay))
 
         job_list = job_list[: scraper_input.results_wanted]
         return JobResponse(jobs=job_list)
 
+    def _fetch_search_page(self, start: int) -> list[Tag] | None:
+        """
+        Job cards on the search results page at an offset
+        :return: None if the request failed or was blocked
+        """
+        scraper_input = self.scraper_input
+        params = {
+            "keywords": scraper_input.search_term,
+            "location": scraper_input.location,
+            "distance": scraper_input.distance,
+            "f_WT": 2 if scraper_input.is_remote else None,
+            "f_JT": (
+                job_type_code(scraper_input.job_type)
+                if scraper_input.job_type
+                else None
+            ),
+            "pageNum": 0,
+            "start": start,
+            "f_AL": "true" if scraper_input.easy_apply else None,
+            "f_C": (
+                ",".join(map(str, scraper_input.linkedin_company_ids))
+                if scraper_input.linkedin_company_ids
+                else None
+            ),
+        }
+        if scraper_input.hours_old:
+            params["f_TPR"] = f"r{scraper_input.hours_old * 3600}"
+
+        params = {k: v for k, v in params.items() if v is not None}
+        try:
+            response = self.session.get(
+                f"{self.base_url}/jobs-guest/jobs/api/seeMoreJobPostings/search?",
+                params=params,
+                timeout=self.request_timeout(10),
+            )
+            if response.status_code not in range(200, 400):
+                if response.status_code == 429:
+                    err = f"429 Response - Blocked by LinkedIn for too many requests"
+                else:
+                    err = f"LinkedIn response status code {response.status_code}"
+                    err += f" - {response.text}"
+                log.error(err)
+                return None
+        except Exception as e:
+            if "Proxy responded with" in str(e):
+                log.error(f"LinkedIn: Bad proxy")
+            else:
+                log.error(f"LinkedIn: {str(e)}")
+            return None
+
+        self.stats.page_fetched()
+        with self.stats.phase("parse"):
+            soup = BeautifulSoup(response.text, "html.parser")
+            return soup.find_all("div", class_="base-search-card")
+
     def _process_job(
-        self, job_card: Tag, job_id: str, full_descr: bool
+        self,
+        job_card: Tag,
+        job_id: str,
+        date_posted: date | None,
+        full_descr: bool,
     ) -> Optional[JobPost]:
         salary_tag = job_card.find("span", class_="job-search-card__salary-info")
 
@@ -202,21 +256,45 @@ class LinkedIn(Scraper):
         metadata_card = job_card.find("div", class_="base-search-card__metadata")
         location = self._get_location(metadata_card)
 
-        datetime_tag = (
-            metadata_card.find("time", class_="job-search-card__listdate")
-            if metadata_card
-            else None
-        )
-        date_posted = None
-        if datetime_tag and "datetime" in datetime_tag.attrs:
-            datetime_str = datetime_tag["datetime"]
-            try:
-                date_posted = datetime.strptime(datetime_str, "%Y-%m-%d")
-            except:
-                date_posted = None
+        if not self.keep_listing(
+            date_posted,
+            id=f"li-{job_id}",
+            title=title,
+            company=company,
+            location=location,
+            compensation=compensation,
+        ):
+            return None
+        # employers are keyed by their company page path; a cached employer's
+        # columns need none of its postings' job pages
+        company_id = urlparse(company_url).path if company_url else None
+        company_fields = self.cached_company(company_id)
+        page_fields = JOB_PAGE_FIELDS if company_fields is None else POSTING_PAGE_FIELDS
+        if not self.wants(*DESCRIPTION_FIELDS, *page_fields, "job_url_direct"):
+            full_descr = False
         job_details = {}
-        if full_descr:
-            job_details = self._get_job_details(job_id)
+        if full_descr and not self.should_stop():
+            with self.claim_detail(title, company, location) as claim:
+                if claim.shared and not self.wants(*page_fields):
+                    job_details = {
+                        "derived": claim.shared.derived,
+                        "job_url_direct": claim.shared.job_url_direct,
+                    }
+                else:
+                    job_details = self._get_job_details(
+                        job_id, parse_company=company_fields is None
+                    )
+                    claim.publish(
+                        job_details.get("derived", NO_DESCRIPTION),
+                        job_details.get("job_url_direct"),
+                    )
+                    if job_details and company_fields is None:
+                        self.cache_company(
+                            company_id,
+                            **{f: job_details.get(f) for f in COMPANY_PAGE_FIELDS},
+                        )
+        derived = job_details.get("derived", NO_DESCRIPTION)
+        company_fields = company_fields or {}
 
         return JobPost(
             id=f"li-{job_id}",
@@ -229,23 +307,52 @@ class LinkedIn(Scraper):
             compensation=compensation,
             job_type=job_details.get("job_type"),
             job_level=job_details.get("job_level", "").lower(),
-            company_industry=job_details.get("company_industry"),
-            description=job_details.get("description"),
+            company_industry=(
+                job_details.get("company_industry")
+                or company_fields.get("company_industry")
+            ),
+            description=self.store_description(derived.description),
             job_url_direct=job_details.get("job_url_direct"),
-            emails=extract_emails_from_text(job_details.get("description")),
-            company_logo=job_details.get("company_logo"),
+            emails=derived.emails,
+            company_logo=(
+                job_details.get("company_logo") or company_fields.get("company_logo")
+            ),
             job_function=job_details.get("job_function"),
+            description_hash=derived.description_hash,
+            unchanged=derived.unchanged,
         )
 
-    def _get_job_details(self, job_id: str) -> dict:
+    @staticmethod
+    def _parse_date_posted(job_card: Tag) -> date | None:
+        metadata_card = job_card.find("div", class_="base-search-card__metadata")
+        datetime_tag = (
+            metadata_card.find("time", class_="job-search-card__listdate")
+            if metadata_card
+            else None
+        )
+        date_posted = None
+        if datetime_tag and "datetime" in datetime_tag.attrs:
+            datetime_str = datetime_tag["datetime"]
+            try:
+                date_posted = datetime.strptime(datetime_str, "%Y-%m-%d").date()
+            except:
+                date_posted = None
+        return date_posted
+
+    def _get_job_details(self, job_id: str, parse_company: bool = True) -> dict:
         """
         Retrieves job description and other job details by going to the job page url
         :param job_page_url:
+        :param parse_company: parse the company industry and logo, which are
+            left out for employers already in the company cache
         :return: dict
         """
+        self.stats.incr("detail_fetches")
         try:
-            response = self.session.get(
-                f"{self.base_url}/jobs/view/{job_id}", timeout=5
+            response = self.hedged(
+                self.session.get,
+                f"{self.base_url}/jobs/view/{job_id}",
+                timeout=self.request_timeout(5),
             )
             response.raise_for_status()
         except:
@@ -257,12 +364,15 @@ class LinkedIn(Scraper):
         div_content = soup.find(
             "div", class_=lambda x: x and "show-more-less-html__markup" in x
         )
-        description = None
+        derived = NO_DESCRIPTION
         if div_content is not None:
             div_content = remove_attributes(div_content)
-            description = div_content.prettify(formatter="html")
-            if self.scraper_input.description_format == DescriptionFormat.MARKDOWN:
-                description = markdown_converter(description)
+            derived = derive_description(
+                div_content.prettify(formatter="html"),
+                self.scraper_input.description_format,
+                self.stats,
+                self.content_cache,
+            )
 
         h3_tag = soup.find(
             "h3", text=lambda text: text and "Job function" in text.strip()
@@ -276,20 +386,21 @@ class LinkedIn(Scraper):
             if job_function_span:
                 job_function = job_function_span.text.strip()
 
-        company_logo = (
-            logo_image.get("data-delayed-url")
-            if (logo_image := soup.find("img", {"class": "artdeco-entity-image"}))
-            else None
-        )
-        return {
-            "description": description,
+        details = {
+            "derived": derived,
             "job_level": parse_job_level(soup),
-            "company_industry": parse_company_industry(soup),
             "job_type": parse_job_type(soup),
             "job_url_direct": self._parse_job_url_direct(soup),
-            "company_logo": company_logo,
             "job_function": job_function,
         }
+        if parse_company:
+            details["company_industry"] = parse_company_industry(soup)
+            details["company_logo"] = (
+                logo_image.get("data-delayed-url")
+                if (logo_image := soup.find("img", {"class": "artdeco-entity-image"}))
+                else None
+            )
+        return details
 
     def _get_location(self, metadata_card: Optional[Tag]) -> Location:
         """
@@ -1,10 +1,18 @@
 from __future__ import annotations
 
+import time
 from abc import ABC, abstractmethod
-from typing import Optional
-from datetime import date
+from concurrent.futures import Future, TimeoutError, as_completed
+from typing import Any, Iterator, NamedTuple, Optional
+from datetime import date, datetime, timedelta
 from enum import Enum
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, field_serializer
+
+from jobspy.description_store import DescriptionRef, DescriptionStore
+from jobspy.duplicates import NO_CLAIM, DetailClaim, posting_keys
+from jobspy.early_stop import posted_before
+from jobspy.governor import get_governor
+from jobspy.telemetry import ScrapeStats
 
 
 class JobType(Enum):
@@ -228,6 +236,8 @@ class DescriptionFormat(Enum):
 
 
 class JobPost(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     id: str | None = None
     title: str
     company_name: str | None
@@ -235,7 +245,8 @@ class JobPost(BaseModel):
     job_url_direct: str | None = None
     location: Optional[Location]
 
-    description: str | None = None
+    # a DescriptionRef when scrape_jobs is given a DescriptionStore
+    description: str | DescriptionRef | None = None
     company_url: str | None = None
     company_url_direct: str | None = None
 
@@ -263,6 +274,14 @@ class JobPost(BaseModel):
     # linkedin only atm
     job_function: str | None = None
 
+    # hash of the raw description, and whether it was already seen on an earlier run
+    description_hash: str | None = None
+    unchanged: bool | None = None
+
+    @field_serializer("description", when_used="json")
+    def _description_text(self, description: str | DescriptionRef | None):
+        return str(description) if description is not None else None
+
 
 class JobResponse(BaseModel):
     jobs: list[JobPost] = []
@@ -283,6 +302,10 @@ class SalarySource(Enum):
 
 
 class ScraperInput(BaseModel):
+    # shared by every site's scraper in a scrape_jobs call, so never mutated;
+    # derive per-site variants with model_copy(update=...)
+    model_config = ConfigDict(frozen=True)
+
     site_type: list[Site]
     search_term: str | None = None
     google_search_term: str | None = None
@@ -300,6 +323,32 @@ class ScraperInput(BaseModel):
 
     results_wanted: int = 15
     hours_old: int | None = None
+    # sorted scrape_jobs columns to fill; None for all
+    fields: list[str] | None = None
+
+    # time.monotonic() timestamp after which the scraper returns what it has
+    deadline: float | None = None
+
+
+# columns that need a posting's full description
+DESCRIPTION_FIELDS = ("description", "emails", "description_hash", "unchanged")
+
+
+class ResumePoint(NamedTuple):
+    # listing position of the first job in jobs
+    base: int = 0
+    # listing position the cursor continues from
+    position: int = 0
+    # the site's cursor for the next page; None starts at the first page
+    cursor: Any = None
+    jobs: list = []
+    # True if jobs and cursor come from an interrupted run of the same call
+    resumed: bool = False
+
+    @property
+    def exhausted(self) -> bool:
+        """True if the resumed run had already fetched its last page"""
+        return self.resumed and self.cursor is None
 
 
 class Scraper(ABC):
@@ -309,6 +358,254 @@ class Scraper(ABC):
         self.site = site
         self.proxies = proxies
         self.ca_cert = ca_cert
+        self.stats = ScrapeStats(site.value)
+        self.scraper_input: ScraperInput | None = None
+        # DerivedFieldCache reused across runs for unchanged descriptions
+        self.content_cache = None
+        # the site's process-wide CircuitBreaker, set by scrape_jobs
+        self.circuit_breaker = None
+        # Hedger for detail requests, set by scrape_jobs when hedging is enabled
+        self.hedger = None
+        # EarlyStop that ends pagination at known or old postings, set by
+        # scrape_jobs when known_ids or posted_cutoff is given
+        self.early_stop = None
+        # callable given a listing's search-card fields that returns False to
+        # drop it before its detail request, set by scrape_jobs
+        self.pre_detail_filter = None
+        # CrawlCheckpoint persisting pagination cursors and collected jobs, set
+        # by scrape_jobs when a checkpoint store is given
+        self.checkpoint = None
+        # search pages requested at once by sites whose page URLs are known in
+        # advance, set by scrape_jobs
+        self.page_prefetch = 1
+        # DuplicateIndex shared by the boards of a scrape_jobs call, set when
+        # share_details is on
+        self.duplicates = None
+        # CompanyCache of employer metadata reused across runs, set by
+        # scrape_jobs when a company cache is given
+        self.company_cache = None
+        # DescriptionStore that descriptions are compressed into as each
+        # JobPost is built, set by scrape_jobs when a store is given
+        self.description_store: DescriptionStore | None = None
+        # jobs collected page by page (see checkpoint_page), returned by
+        # scrape_jobs if the scrape misses the deadline; the first
+        # collected_skip of them come before the offset
+        self.collected: list[JobPost] = []
+        self.collected_skip = 0
 
     @abstractmethod
     def scrape(self, scraper_input: ScraperInput) -> JobResponse: ...
+
+    def wants(self, *fields: str) -> bool:
+        """
+        True if any of the columns is wanted. Scrapers skip detail requests and
+        query selections that only fill columns left out of scrape_jobs fields.
+        """
+        wanted = self.scraper_input.fields if self.scraper_input else None
+        return wanted is None or any(field in wanted for field in fields)
+
+    def claim_detail(
+        self,
+        title: str | None,
+        company: str | None,
+        location: Location | None = None,
+        job_url_direct: str | None = None,
+        wait: float | None = None,
+    ) -> DetailClaim:
+        """
+        Claims a posting's description before fetching it: claim.shared holds
+        the one another board already got for the same posting; otherwise the
+        caller gets it and publishes it through the claim
+        :param wait: seconds to wait for another board's fetch in flight;
+            defaults to the index's max_wait, capped by the deadline
+        """
+        if self.duplicates is None:
+            return NO_CLAIM
+        left = self.time_left()
+        if wait is None or (left is not None and left < wait):
+            wait = left
+        keys = posting_keys(
+            title, company, location.city if location else None, job_url_direct
+        )
+        claim = self.duplicates.claim(self.site.value, keys, wait)
+        if claim.shared is not None:
+            self.stats.incr("shared_details")
+        return claim
+
+    def cached_company(self, employer_id: str | None) -> dict | None:
+        """
+        An employer's cached company_* fields (possibly empty), or None if the
+        employer isn't cached
+        :param employer_id: the site's own employer id, e.g. a company page path
+        """
+        if self.company_cache is None:
+            return None
+        fields = self.company_cache.get(self.site.value, employer_id)
+        if fields is not None:
+            self.stats.incr("companies_cached")
+        return fields
+
+    def cache_company(self, employer_id: str | None, **fields):
+        """Stores an employer's company_* fields as parsed from the site"""
+        if self.company_cache is not None:
+            self.company_cache.put(self.site.value, employer_id, **fields)
+
+    def store_description(self, description: str | None) -> str | DescriptionRef | None:
+        """The description a JobPost holds: a DescriptionRef given a store"""
+        if self.description_store is None:
+            return description
+        return self.description_store.add(description)
+
+    def time_left(self) -> float | None:
+        """Seconds until the scrape deadline, or None if there is no deadline"""
+        if self.scraper_input is None or self.scraper_input.deadline is None:
+            return None
+        return self.scraper_input.deadline - time.monotonic()
+
+    def should_stop(self) -> bool:
+        """
+        True once the deadline has passed or the site's circuit breaker has
+        opened; the scrape is then marked incomplete
+        """
+        left = self.time_left()
+        blocked = self.circuit_breaker is not None and self.circuit_breaker.is_open
+        if blocked or (left is not None and left <= 0):
+            self.stats.complete = False
+            return True
+        return False
+
+    @property
+    def stopped_early(self) -> bool:
+        """True once pagination has reached a run of known or old postings"""
+        return self.early_stop is not None and self.early_stop.triggered
+
+    def observe_listings(self, listings) -> bool:
+        """
+        Feeds a results page's (JobPost id, date posted) pairs, in page order,
+        to the early stop
+        :return: True once pagination should stop
+        """
+        if self.early_stop is None:
+            return False
+        stale_before = self.early_stop.stale_seen
+        stopped = self.early_stop.observe(listings)
+        self.stats.incr("stale_listings", self.early_stop.stale_seen - stale_before)
+        return stopped
+
+    def keep_listing(
+        self, date_posted: date | datetime | None = None, **fields
+    ) -> bool:
+        """
+        Decides from search-card data, before any detail request or description
+        conversion, whether a listing is kept: it must be within hours_old and
+        pass pre_detail_filter
+        :param date_posted: a datetime, or a date when the site only gives the day
+        :param fields: card fields (id, title, company, ...) for pre_detail_filter
+        """
+        keep = True
+        hours_old = self.scraper_input.hours_old if self.scraper_input else None
+        if hours_old and date_posted is not None:
+            cutoff = datetime.now() - timedelta(hours=hours_old)
+            keep = not posted_before(date_posted, cutoff)
+        if keep and self.pre_detail_filter is not None:
+            keep = self.pre_detail_filter({**fields, "date_posted": date_posted})
+        if not keep:
+            self.stats.incr("listings_filtered")
+        return keep
+
+    def crawl_start(self, offset: int | None = None) -> ResumePoint:
+        """
+        Where pagination starts: an interrupted run of the same search resumes
+        with the jobs it had collected; otherwise, given an offset, the stored
+        cursor closest before it skips the pages in between
+        :param offset: None for sites that page by a numeric offset anyway
+        """
+        if self.checkpoint is None:
+            self.collected = []
+            return ResumePoint(jobs=[])
+        start = self.checkpoint.start(offset)
+        jobs = [JobPost.model_validate_json(job) for job in start.jobs]
+        self.collected = list(jobs)
+        return start._replace(jobs=jobs)
+
+    def checkpoint_page(self, position: int, cursor, jobs: list[JobPost]):
+        """
+        Records a fetched page's jobs and the cursor for the next page
+        :param position: listings paged through so far, where cursor continues
+        :param cursor: JSON-serializable state the site needs for the next page
+        """
+        self.collected.extend(jobs)
+        if self.checkpoint is not None:
+            self.checkpoint.save_page(
+                position, cursor, [job.model_dump_json() for job in jobs]
+            )
+
+    def partial_response(self) -> JobResponse:
+        """The wanted jobs among those collected so far"""
+        results_wanted = self.scraper_input.results_wanted
+        jobs = self.collected[self.collected_skip :]
+        return JobResponse(jobs=jobs[:results_wanted])
+
+    def request_timeout(self, default: float | None) -> float | None:
+        """Request timeout capped to the time left before the deadline"""
+        left = self.time_left()
+        if left is None:
+            return default
+        left = max(left, 1)
+        return min(default, left) if default is not None else left
+
+    def sleep(self, seconds: float):
+        """Sleeps between pages without overrunning the deadline"""
+        left = self.time_left()
+        time.sleep(seconds if left is None else max(min(seconds, left), 0))
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        """Runs fn on the process-wide governor's pool under this site's cap"""
+        return get_governor().submit(self.site.value, fn, *args, **kwargs)
+
+    def fetch_pages(self, fetch, keys: list) -> list:
+        """
+        Fetches search pages concurrently on the governor's pool, within the
+        site's in-flight cap, each request taking the session's next proxy
+        :param fetch: called with each key (e.g. a page offset) to get a page
+        :return: the pages in key order; pages still pending at the deadline,
+            and all that follow them, are dropped
+        """
+        if len(keys) <= 1:
+            return [fetch(key) for key in keys]
+        futures = [self.submit(fetch, key) for key in keys]
+        pages = []
+        try:
+            for future in futures:
+                left = self.time_left()
+                pages.append(future.result(None if left is None else max(left, 0)))
+        except TimeoutError:
+            self.stats.complete = False
+            for future in futures:
+                future.cancel()
+        return pages
+
+    def prefetch(self, fetch, *args) -> Future:
+        """
+        Starts fetching the next results page while the caller processes the
+        current one (its detail requests, parsing and description conversion)
+        """
+        return get_governor().submit_request(fetch, *args)
+
+    def hedged(self, fn, *args, **kwargs):
+        """Makes a detail request via fn, hedging it if hedging is enabled"""
+        if self.hedger is None:
+            return fn(*args, **kwargs)
+        return self.hedger.run(fn, *args, **kwargs)
+
+    def completed_before_deadline(self, futures: list[Future]) -> Iterator[Future]:
+        """
+        Yields futures as they complete. Once the deadline passes the remaining
+        futures are cancelled and the scrape is marked incomplete.
+        """
+        try:
+            yield from as_completed(futures, timeout=self.time_left())
+        except TimeoutError:
+            self.stats.complete = False
+            for future in futures:
+                future.cancel()
@@ -0,0 +1,30 @@
+"""
+jobspy.registry
+~~~~~~~~~~~~~~~~~~~
+
+Registry of scraper classes keyed by Site. Scraper packages are only imported
+when their site is first used, so `import jobspy` does not pay for the bs4,
+regex and tls_client imports of sites that are never scraped.
+"""
+
+from __future__ import annotations
+
+import importlib
+
+from jobspy.model import Scraper, Site
+
+# site -> (module, class name)
+SCRAPER_REGISTRY: dict[Site, tuple[str, str]] = {
+    Site.LINKEDIN: ("jobspy.linkedin", "LinkedIn"),
+    Site.INDEED: ("jobspy.indeed", "Indeed"),
+    Site.ZIP_RECRUITER: ("jobspy.ziprecruiter", "ZipRecruiter"),
+    Site.GLASSDOOR: ("jobspy.glassdoor", "Glassdoor"),
+    Site.GOOGLE: ("jobspy.google", "Google"),
+    Site.BAYT: ("jobspy.bayt", "BaytScraper"),
+}
+
+
+def get_scraper_class(site: Site) -> type[Scraper]:
+    """Imports (on first use) and returns the scraper class for a site"""
+    module_name, class_name = SCRAPER_REGISTRY[site]
+    return getattr(importlib.import_module(module_name), class_name)
@@ -0,0 +1,168 @@
+"""
+jobspy.results
+~~~~~~~~~~~~~~~~~~~
+
+Flattening of scraped JobPosts into the rows and DataFrame returned by
+scrape_jobs, shared with the work-queue coordinator.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from jobspy.model import Country, JobPost, Location, SalarySource
+from jobspy.util import convert_to_annual, desired_order, extract_salary
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from jobspy.content_cache import DerivedFieldCache
+    from jobspy.filters import ListingFilter
+
+
+# columns job_to_row fills from the description of a US posting without
+# direct compensation
+DESCRIPTION_SALARY_FIELDS = (
+    "interval",
+    "min_amount",
+    "max_amount",
+    "currency",
+    "salary_source",
+)
+
+
+def scrape_fields(
+    fields: list[str] | None,
+    country: Country,
+    filters: ListingFilter | None = None,
+) -> list[str] | None:
+    """
+    Columns the scrapers fill for a scrape_jobs fields projection: the
+    projection itself, the columns the filters read from the final rows, plus
+    the description when salaries may be parsed from it
+    """
+    if fields is None:
+        return fields
+    if filters is not None:
+        fields = sorted({*fields, *filters.columns})
+    if country != Country.USA or not set(fields) & set(DESCRIPTION_SALARY_FIELDS):
+        return fields
+    return sorted({*fields, "description"})
+
+
+def description_salary(
+    job_data: dict,
+    enforce_annual_salary: bool,
+    content_cache: DerivedFieldCache | None = None,
+) -> tuple:
+    """extract_salary on the description, reused from the cache if unchanged"""
+    key = job_data["description_hash"]
+    field = "salary_annual" if enforce_annual_salary else "salary"
+    cached = content_cache.get(key) if content_cache and key else None
+    if cached and field in cached:
+        return tuple(cached[field])
+    description = job_data["description"]
+    salary = extract_salary(
+        str(description) if description is not None else None,
+        enforce_annual_salary=enforce_annual_salary,
+    )
+    if content_cache and key:
+        content_cache.put(key, **{field: list(salary)})
+    return salary
+
+
+def job_to_row(
+    job: JobPost,
+    site: str,
+    country: Country,
+    enforce_annual_salary: bool = False,
+    content_cache: DerivedFieldCache | None = None,
+) -> dict:
+    """
+    Flattens a JobPost into a scrape_jobs row: location as display text, job
+    types and emails joined, compensation split into interval / amounts, with
+    a salary parsed from the description for US postings without one
+    """
+    job_data = job.dict()
+    job_data["site"] = site
+    job_data["company"] = job_data["company_name"]
+    job_data["job_type"] = (
+        ", ".join(job_type.value[0] for job_type in job_data["job_type"])
+        if job_data["job_type"]
+        else None
+    )
+    job_data["emails"] = ", ".join(job_data["emails"]) if job_data["emails"] else None
+    if job_data["location"]:
+        job_data["location"] = Location(**job_data["location"]).display_location()
+
+    compensation_obj = job_data.get("compensation")
+    if compensation_obj and isinstance(compensation_obj, dict):
+        job_data["interval"] = (
+            compensation_obj.get("interval").value
+            if compensation_obj.get("interval")
+            else None
+        )
+        job_data["min_amount"] = compensation_obj.get("min_amount")
+        job_data["max_amount"] = compensation_obj.get("max_amount")
+        job_data["currency"] = compensation_obj.get("currency", "USD")
+        job_data["salary_source"] = SalarySource.DIRECT_DATA.value
+        if enforce_annual_salary and (
+            job_data["interval"]
+            and job_data["interval"] != "yearly"
+            and job_data["min_amount"]
+            and job_data["max_amount"]
+        ):
+            convert_to_annual(job_data)
+
+    else:
+        if country == Country.USA:
+            (
+                job_data["interval"],
+                job_data["min_amount"],
+                job_data["max_amount"],
+                job_data["currency"],
+            ) = description_salary(job_data, enforce_annual_salary, content_cache)
+            job_data["salary_source"] = SalarySource.DESCRIPTION.value
+
+    job_data["salary_source"] = (
+        job_data["salary_source"]
+        if "min_amount" in job_data and job_data["min_amount"]
+        else None
+    )
+    return job_data
+
+
+def rows_to_dataframe(
+    rows: list[dict], columns: list[str] | None = None
+) -> pd.DataFrame:
+    """
+    Builds the scrape_jobs DataFrame, in desired_order and sorted by site, date
+    :param columns: only these columns, still in desired_order
+    """
+    import pandas as pd
+
+    jobs_dfs = [pd.DataFrame([row]) for row in rows]
+    if not jobs_dfs:
+        return pd.DataFrame()
+
+    # Step 1: Filter out all-NA columns from each DataFrame before concatenation
+    filtered_dfs = [df.dropna(axis=1, how="all") for df in jobs_dfs]
+
+    # Step 2: Concatenate the filtered DataFrames
+    jobs_df = pd.concat(filtered_dfs, ignore_index=True)
+
+    # Step 3: Ensure all desired columns are present, adding missing ones as empty
+    for column in desired_order:
+        if column not in jobs_df.columns:
+            jobs_df[column] = None  # Add missing columns as empty
+
+    # Reorder the DataFrame according to the desired order
+    jobs_df = jobs_df[desired_order]
+
+    # Step 4: Sort the DataFrame as required
+    jobs_df = jobs_df.sort_values(
+        by=["site", "date_posted"], ascending=[True, False]
+    ).reset_index(drop=True)
+    if columns is not None:
+        jobs_df = jobs_df[[column for column in desired_order if column in columns]]
+    return jobs_df
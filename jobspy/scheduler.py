@@ -0,0 +1,352 @@
+"""
+jobspy.scheduler
+~~~~~~~~~~~~~~~~~~~
+
+Yield-aware recurring searches. Each (site, search term, location) combination
+keeps its own poll interval, which shrinks while polls keep turning up postings
+the warehouse has not seen and grows while they come back empty. Due searches
+run through scrape_jobs in order of new postings per request, and only while
+the requests they are expected to cost fit in a global budget per window.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from jobspy.model import Site
+from jobspy.storage import JobWarehouse
+from jobspy.util import create_logger, json_dumps, json_loads, map_str_to_site
+
+log = create_logger("Scheduler")
+
+# weight of the latest poll in the per-search yield and cost averages
+EWMA_ALPHA = 0.3
+# yield floor when ranking, so quiet searches are still polled once overdue
+MIN_PRIORITY_YIELD = 0.01
+
+_schema = """
+CREATE TABLE IF NOT EXISTS search_schedule (
+    key TEXT PRIMARY KEY,
+    site TEXT NOT NULL,
+    search_term TEXT,
+    location TEXT,
+    options TEXT NOT NULL,
+    interval REAL NOT NULL,
+    next_run REAL NOT NULL,
+    last_run REAL,
+    runs INTEGER NOT NULL DEFAULT 0,
+    requests INTEGER NOT NULL DEFAULT 0,
+    new_jobs INTEGER NOT NULL DEFAULT 0,
+    last_new_jobs INTEGER,
+    yield_ewma REAL,
+    cost_ewma REAL
+)
+"""
+
+_columns = [
+    "key",
+    "site",
+    "search_term",
+    "location",
+    "options",
+    "interval",
+    "next_run",
+    "last_run",
+    "runs",
+    "requests",
+    "new_jobs",
+    "last_new_jobs",
+    "yield_ewma",
+    "cost_ewma",
+]
+
+
+def search_key(site: str, search_term: str | None, location: str | None, options):
+    spec = json_dumps([site, search_term, location, options])
+    return hashlib.blake2b(spec, digest_size=12).hexdigest()
+
+
+def _ewma(previous: float | None, value: float) -> float:
+    if previous is None:
+        return value
+    return EWMA_ALPHA * value + (1 - EWMA_ALPHA) * previous
+
+
+class SearchScheduler:
+    def __init__(
+        self,
+        warehouse: JobWarehouse | str = "jobs.db",
+        request_budget: int = 5000,
+        budget_window: float = 3600.0,
+        min_interval: float = 900.0,
+        max_interval: float = 86400.0,
+        initial_interval: float = 3600.0,
+        target_new_jobs: float = 1.0,
+        backoff: float = 1.5,
+        default_cost: float = 10.0,
+        concurrency: int = 4,
+        scrape_kwargs: dict | None = None,
+    ):
+        """
+        :param warehouse: JobWarehouse (or its path) that results are upserted
+            into and new postings are judged against; the schedule is kept in
+            the same database file
+        :param request_budget: HTTP requests all searches may spend per window
+        :param budget_window: seconds the request budget applies to
+        :param min_interval: shortest poll interval of a search, in seconds
+        :param max_interval: longest poll interval of a search, in seconds
+        :param initial_interval: poll interval of a newly added search
+        :param target_new_jobs: new postings per poll the interval steers toward
+        :param backoff: factor the interval grows by after a poll with nothing new
+        :param default_cost: requests a search is assumed to cost before its
+            first poll
+        :param concurrency: searches polled at once
+        :param scrape_kwargs: scrape_jobs arguments shared by every search
+            (proxies, results_wanted, hours_old, ...)
+        """
+        owns_warehouse = isinstance(warehouse, str)
+        self.warehouse = JobWarehouse(warehouse) if owns_warehouse else warehouse
+        self._owns_warehouse = owns_warehouse
+        self.request_budget = request_budget
+        self.budget_window = budget_window
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.initial_interval = initial_interval
+        self.target_new_jobs = target_new_jobs
+        self.backoff = backoff
+        self.default_cost = default_cost
+        self.concurrency = concurrency
+        self.scrape_kwargs = dict(scrape_kwargs or {})
+        self._lock = threading.Lock()
+        # serializes the known-ids check and upsert so a posting found by two
+        # overlapping searches is only counted as new once
+        self._ingest_lock = threading.Lock()
+        # (time.time(), requests) spent inside the current window
+        self._spent: deque[tuple[float, float]] = deque()
+        with self.warehouse.transaction() as conn:
+            conn.execute(_schema)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_search_schedule_next_run "
+                "ON search_schedule (next_run)"
+            )
+
+    def add(
+        self,
+        site: str | Site,
+        search_term: str | None = None,
+        location: str | None = None,
+        **options,
+    ) -> str:
+        """
+        Schedules a search, due immediately. Adding an existing combination
+        keeps its learned interval.
+        :param options: further scrape_jobs arguments for this search only
+        :return: key identifying the search
+        """
+        site = site.value if isinstance(site, Site) else map_str_to_site(site).value
+        key = search_key(site, search_term, location, options)
+        with self.warehouse.transaction() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO search_schedule "
+                "(key, site, search_term, location, options, interval, next_run) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    site,
+                    search_term,
+                    location,
+                    json_dumps(options).decode(),
+                    self.initial_interval,
+                    time.time(),
+                ),
+            )
+        return key
+
+    def remove(self, key: str):
+        with self.warehouse.transaction() as conn:
+            conn.execute("DELETE FROM search_schedule WHERE key = ?", (key,))
+
+    def searches(self) -> list[dict]:
+        """Every scheduled search with its interval, yield and cost so far"""
+        with self.warehouse.transaction() as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(_columns)} FROM search_schedule ORDER BY next_run"
+            ).fetchall()
+        return [self._row(values) for values in rows]
+
+    @staticmethod
+    def _row(values) -> dict:
+        row = dict(zip(_columns, values))
+        row["options"] = json_loads(row["options"])
+        return row
+
+    def _cost(self, search: dict) -> float:
+        return search["cost_ewma"] or self.default_cost
+
+    def _priority(self, search: dict, now: float) -> float:
+        """Expected new postings per request, weighted by how overdue it is"""
+        if search["yield_ewma"] is None:
+            return float("inf")
+        overdue = 1 + (now - search["next_run"]) / search["interval"]
+        return max(search["yield_ewma"], MIN_PRIORITY_YIELD) * overdue
+
+    def due(self, now: float | None = None) -> list[dict]:
+        """Searches whose next poll is due, best expected yield first"""
+        now = now or time.time()
+        with self.warehouse.transaction() as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(_columns)} FROM search_schedule "
+                "WHERE next_run <= ?",
+                (now,),
+            ).fetchall()
+        searches = [self._row(values) for values in rows]
+        searches.sort(key=lambda search: self._priority(search, now), reverse=True)
+        return searches
+
+    def budget_remaining(self, now: float | None = None) -> float:
+        now = now or time.time()
+        with self._lock:
+            while self._spent and self._spent[0][0] <= now - self.budget_window:
+                self._spent.popleft()
+            return self.request_budget - sum(cost for _, cost in self._spent)
+
+    def _reserve(self, cost: float, now: float) -> bool:
+        if self.budget_remaining(now) < cost:
+            return False
+        with self._lock:
+            self._spent.append((now, cost))
+        return True
+
+    def _settle(self, reserved: float, spent: float, now: float):
+        """Replaces a search's reserved cost by the requests it actually made"""
+        with self._lock:
+            self._spent.append((now, spent - reserved))
+
+    def _next_interval(self, interval: float, new_jobs: int) -> float:
+        if new_jobs:
+            factor = self.target_new_jobs / new_jobs
+            interval *= min(max(factor, 0.5), self.backoff)
+        else:
+            interval *= self.backoff
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    def _poll(self, search: dict) -> dict:
+        from jobspy import scrape_jobs
+
+        kwargs = {**self.scrape_kwargs, **search["options"]}
+        jobs_df, site_stats = scrape_jobs(
+            site_name=search["site"],
+            search_term=search["search_term"],
+            location=search["location"],
+            return_stats=True,
+            **kwargs,
+        )
+        stats = site_stats.get(search["site"], {})
+        new_jobs = 0
+        if not jobs_df.empty:
+            with self._ingest_lock:
+                ids = [job_id for job_id in jobs_df["id"] if job_id]
+                new_jobs = len(set(ids) - self.warehouse.known_ids(ids=ids))
+                self.warehouse.upsert(jobs_df)
+        return {
+            "requests": stats.get("requests", 0),
+            "new_jobs": new_jobs,
+            "skipped": stats.get("skipped", False),
+        }
+
+    def _record(self, search: dict, result: dict | None, started: float):
+        now = time.time()
+        if result is None or result["skipped"]:
+            # failed, or the site's circuit is open: retry later, learn nothing
+            with self.warehouse.transaction() as conn:
+                conn.execute(
+                    "UPDATE search_schedule SET next_run = ? WHERE key = ?",
+                    (now + self.min_interval, search["key"]),
+                )
+            return
+        requests, new_jobs = result["requests"], result["new_jobs"]
+        interval = self._next_interval(search["interval"], new_jobs)
+        with self.warehouse.transaction() as conn:
+            conn.execute(
+                "UPDATE search_schedule SET interval = ?, next_run = ?, "
+                "last_run = ?, runs = runs + 1, requests = requests + ?, "
+                "new_jobs = new_jobs + ?, last_new_jobs = ?, yield_ewma = ?, "
+                "cost_ewma = ? WHERE key = ?",
+                (
+                    interval,
+                    started + interval,
+                    started,
+                    requests,
+                    new_jobs,
+                    new_jobs,
+                    _ewma(search["yield_ewma"], new_jobs / max(requests, 1)),
+                    _ewma(search["cost_ewma"], requests),
+                    search["key"],
+                ),
+            )
+
+    def _run_one(self, search: dict) -> dict | None:
+        started = time.time()
+        reserved = self._cost(search)
+        result = None
+        try:
+            result = self._poll(search)
+        except Exception as e:
+            log.error(
+                f"{search['site']} {search['search_term']!r} "
+                f"{search['location']!r} failed: {e}"
+            )
+        self._settle(reserved, result["requests"] if result else 0, time.time())
+        self._record(search, result, started)
+        if result is not None:
+            result = {"key": search["key"], **result}
+        return result
+
+    def run_pending(self, now: float | None = None) -> list[dict]:
+        """
+        Polls the due searches that fit in the remaining request budget, best
+        expected yield first; the rest stay due for the next call
+        :return: key, requests, new_jobs and skipped of each search polled
+        """
+        now = now or time.time()
+        selected = []
+        for search in self.due(now):
+            if not self._reserve(self._cost(search), now):
+                continue
+            selected.append(search)
+        if not selected:
+            return []
+        with ThreadPoolExecutor(
+            self.concurrency, thread_name_prefix="jobspy-scheduler"
+        ) as executor:
+            results = list(executor.map(self._run_one, selected))
+        results = [result for result in results if result is not None]
+        log.info(
+            f"polled {len(results)} searches: "
+            f"{sum(r['new_jobs'] for r in results)} new jobs, "
+            f"{sum(r['requests'] for r in results)} requests"
+        )
+        return results
+
+    def run_forever(
+        self, poll_interval: float = 30.0, stop: threading.Event | None = None
+    ):
+        """Calls run_pending every poll_interval seconds until stop is set"""
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            self.run_pending()
+            stop.wait(poll_interval)
+
+    def close(self):
+        if self._owns_warehouse:
+            self.warehouse.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,213 @@
+"""
+jobspy.search_index
+~~~~~~~~~~~~~~~~~~~
+
+Full-text search over scraped postings, backed by a SQLite FTS5 inverted index
+on title, company and description. Postings are added, updated and deleted
+incrementally by JobPost id, and queries (FTS5 syntax, e.g.
+"kubernetes AND remote") return bm25-ranked, paginated results.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from typing import Iterable, Iterator
+
+from jobspy.storage import _normalize
+
+INDEXED_COLUMNS = [
+    "id",
+    "site",
+    "title",
+    "company",
+    "location",
+    "job_url",
+    "date_posted",
+    "description",
+]
+
+# bm25 weights for the FTS columns: title, company, description
+RANK_WEIGHTS = (10.0, 5.0, 1.0)
+
+_schema = """
+CREATE TABLE IF NOT EXISTS search_jobs (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT UNIQUE NOT NULL,
+    site TEXT,
+    title TEXT,
+    company TEXT,
+    location TEXT,
+    job_url TEXT,
+    date_posted TEXT,
+    description TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS search_jobs_fts USING fts5(
+    title, company, description,
+    content='search_jobs', content_rowid='rowid',
+    tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS search_jobs_ai AFTER INSERT ON search_jobs BEGIN
+    INSERT INTO search_jobs_fts(rowid, title, company, description)
+    VALUES (new.rowid, new.title, new.company, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS search_jobs_ad AFTER DELETE ON search_jobs BEGIN
+    INSERT INTO search_jobs_fts(search_jobs_fts, rowid, title, company, description)
+    VALUES ('delete', old.rowid, old.title, old.company, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS search_jobs_au AFTER UPDATE ON search_jobs BEGIN
+    INSERT INTO search_jobs_fts(search_jobs_fts, rowid, title, company, description)
+    VALUES ('delete', old.rowid, old.title, old.company, old.description);
+    INSERT INTO search_jobs_fts(rowid, title, company, description)
+    VALUES (new.rowid, new.title, new.company, new.description);
+END;
+"""
+
+
+class JobSearchIndex:
+    def __init__(self, path: str = "jobs.db", batch_size: int = 2000):
+        """
+        :param path: SQLite database file; may be shared with a JobWarehouse
+        :param batch_size: rows per transaction when adding
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self._lock, self.conn:
+            self.conn.executescript(_schema)
+
+    def add(self, jobs) -> int:
+        """
+        Adds or updates postings by id. Rows whose indexed text is unchanged are
+        left alone, so re-adding a scrape only re-indexes what changed.
+        :param jobs: DataFrame from scrape_jobs, or an iterable of row dicts
+        :return: number of rows processed
+        """
+        updates = ", ".join(f"{c} = excluded.{c}" for c in INDEXED_COLUMNS[1:])
+        changed = " OR ".join(
+            f"search_jobs.{c} IS NOT excluded.{c}" for c in INDEXED_COLUMNS[1:]
+        )
+        sql = (
+            f"INSERT INTO search_jobs ({', '.join(INDEXED_COLUMNS)}) "
+            f"VALUES ({', '.join('?' for _ in INDEXED_COLUMNS)}) "
+            f"ON CONFLICT(id) DO UPDATE SET {updates} WHERE {changed}"
+        )
+        processed = 0
+        batch = []
+        for row in self._iter_input_rows(jobs):
+            if not row.get("id"):
+                continue
+            batch.append([_normalize(row.get(c)) for c in INDEXED_COLUMNS])
+            if len(batch) >= self.batch_size:
+                processed += self._write_batch(sql, batch)
+                batch = []
+        if batch:
+            processed += self._write_batch(sql, batch)
+        return processed
+
+    def delete(self, ids: Iterable[str]) -> int:
+        """Removes postings from the index by id"""
+        ids = [(job_id,) for job_id in ids]
+        with self._lock, self.conn:
+            cursor = self.conn.executemany("DELETE FROM search_jobs WHERE id = ?", ids)
+        return cursor.rowcount
+
+    def _write_batch(self, sql: str, batch: list[list]) -> int:
+        with self._lock, self.conn:
+            self.conn.executemany(sql, batch)
+        return len(batch)
+
+    @staticmethod
+    def _iter_input_rows(jobs) -> Iterator[dict]:
+        if hasattr(jobs, "to_dict"):
+            columns = [c for c in INDEXED_COLUMNS if c in jobs.columns]
+            for values in jobs[columns].itertuples(index=False, name=None):
+                yield dict(zip(columns, values))
+        else:
+            yield from jobs
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        offset: int = 0,
+        site: str | list[str] | None = None,
+    ) -> list[dict]:
+        """
+        Ranked full-text search. Supports FTS5 syntax (AND/OR/NOT, "phrases",
+        prefix*, column filters like title:engineer); queries that aren't valid
+        FTS5 are retried as a plain AND of their terms.
+        :return: matching postings, best first, each with a description snippet
+        """
+        try:
+            return self._search(query, limit, offset, site)
+        except sqlite3.OperationalError:
+            return self._search(_quote_terms(query), limit, offset, site)
+
+    def _search(self, query, limit, offset, site) -> list[dict]:
+        columns = INDEXED_COLUMNS[:-1]
+        sql = (
+            f"SELECT {', '.join('j.' + c for c in columns)}, "
+            "snippet(search_jobs_fts, 2, '**', '**', '…', 24), "
+            "bm25(search_jobs_fts, ?, ?, ?) AS rank "
+            "FROM search_jobs_fts "
+            "JOIN search_jobs j ON j.rowid = search_jobs_fts.rowid "
+            "WHERE search_jobs_fts MATCH ?"
+        )
+        params = [*RANK_WEIGHTS, query]
+        if site:
+            sites = [site] if isinstance(site, str) else list(site)
+            sql += f" AND j.site IN ({', '.join('?' for _ in sites)})"
+            params += sites
+        sql += " ORDER BY rank LIMIT ? OFFSET ?"
+        params += [limit, offset]
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return [dict(zip(columns + ["snippet", "rank"], row)) for row in rows]
+
+    def count(self, query: str | None = None) -> int:
+        """Number of indexed postings, or of postings matching the query"""
+        with self._lock:
+            if not query:
+                cursor = self.conn.execute("SELECT COUNT(*) FROM search_jobs")
+                return cursor.fetchone()[0]
+            sql = "SELECT COUNT(*) FROM search_jobs_fts WHERE search_jobs_fts MATCH ?"
+            try:
+                return self.conn.execute(sql, [query]).fetchone()[0]
+            except sqlite3.OperationalError:
+                return self.conn.execute(sql, [_quote_terms(query)]).fetchone()[0]
+
+    def known_ids(self, site: str | None = None) -> set[str]:
+        """Ids of indexed postings, optionally of one site"""
+        sql, params = "SELECT id FROM search_jobs", []
+        if site:
+            sql += " WHERE site = ?"
+            params.append(site)
+        with self._lock:
+            return {row[0] for row in self.conn.execute(sql, params)}
+
+    def optimize(self):
+        """Merges the FTS index segments; worth running after large loads"""
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO search_jobs_fts(search_jobs_fts) VALUES ('optimize')"
+            )
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _quote_terms(query: str) -> str:
+    """Turns free text into an FTS5 query matching all of its terms literally"""
+    terms = [term.replace('"', '""') for term in query.split()]
+    return " AND ".join(f'"{term}"' for term in terms if term)
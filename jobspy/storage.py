@@ -0,0 +1,295 @@
+"""
+jobspy.storage
+~~~~~~~~~~~~~~~~~~~
+
+Local job warehouse: a SQLite store that accumulates scrape_jobs results across
+runs. Rows are bulk-upserted by job id in batched transactions, keeping
+first_seen / last_seen timestamps and a content hash per posting, and queries
+push their filters into SQL instead of loading everything into pandas.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Iterable, Iterator
+
+from jobspy.util import desired_order
+
+REAL_COLUMNS = {"min_amount", "max_amount"}
+BOOL_COLUMNS = {"is_remote", "unchanged"}
+TRACKING_COLUMNS = ["first_seen", "last_seen", "content_hash"]
+# per-run flags that say nothing about the posting itself
+UNHASHED_COLUMNS = {"id", "unchanged"}
+
+
+def _normalize(value):
+    """Converts a DataFrame cell into a SQLite-storable value"""
+    if value is None:
+        return None
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (str, int, float, bool)):
+        return value
+    if hasattr(value, "item"):  # numpy scalars
+        return _normalize(value.item())
+    if value != value:  # pandas NaT / NA
+        return None
+    return str(value)
+
+
+def content_hash(row: dict) -> str:
+    """Hash of a row's posting content, ignoring the id and tracking columns"""
+    digest = hashlib.blake2b(digest_size=16)
+    for column in desired_order:
+        if column in UNHASHED_COLUMNS:
+            continue
+        value = row.get(column)
+        digest.update(b"\x1f" if value is None else str(value).encode() + b"\x1f")
+    return digest.hexdigest()
+
+
+class JobWarehouse:
+    def __init__(self, path: str = "jobs.db", batch_size: int = 5000):
+        """
+        :param path: SQLite database file (":memory:" for a throwaway store)
+        :param batch_size: rows per transaction when upserting
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    @staticmethod
+    def _column_type(column: str) -> str:
+        if column in REAL_COLUMNS:
+            return "REAL"
+        if column in BOOL_COLUMNS:
+            return "INTEGER"
+        return "TEXT"
+
+    def _create_schema(self):
+        columns = ["id TEXT PRIMARY KEY"]
+        for column in desired_order[1:] + TRACKING_COLUMNS:
+            columns.append(f"{column} {self._column_type(column)}")
+        with self._lock, self.conn:
+            self.conn.execute(f"CREATE TABLE IF NOT EXISTS jobs ({', '.join(columns)})")
+            # stores created by older versions lack columns added since
+            existing = {row[1] for row in self.conn.execute("PRAGMA table_info(jobs)")}
+            for column in desired_order + TRACKING_COLUMNS:
+                if column not in existing:
+                    self.conn.execute(
+                        f"ALTER TABLE jobs ADD COLUMN {column} "
+                        f"{self._column_type(column)}"
+                    )
+            for column in ("site", "company", "date_posted", "last_seen"):
+                self.conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_jobs_{column} ON jobs ({column})"
+                )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_jobs_salary "
+                "ON jobs (min_amount, max_amount)"
+            )
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        The warehouse connection, held under its lock for one transaction that
+        commits on exit (rolls back on error); for tables kept alongside jobs,
+        e.g. the scheduler's
+        """
+        with self._lock, self.conn:
+            yield self.conn
+
+    def _upsert_sql(self, touch_only: bool = False) -> str:
+        columns = desired_order + TRACKING_COLUMNS
+        placeholders = ", ".join("?" for _ in columns)
+        if touch_only:
+            updates = "last_seen = excluded.last_seen, unchanged = 1"
+        else:
+            updates = ", ".join(
+                f"{column} = excluded.{column}"
+                for column in columns
+                if column not in ("id", "first_seen")
+            )
+        return (
+            f"INSERT INTO jobs ({', '.join(columns)}) VALUES ({placeholders}) "
+            f"ON CONFLICT(id) DO UPDATE SET {updates}"
+        )
+
+    def upsert(self, jobs, seen_at: datetime | None = None) -> int:
+        """
+        Inserts new postings and refreshes existing ones keyed on id. first_seen
+        is only set on insert; last_seen is always updated. Rows flagged unchanged
+        (their description was seen before) whose stored content hash matches
+        only get last_seen refreshed instead of being rewritten; a new salary,
+        title or date still rewrites them.
+        :param jobs: DataFrame from scrape_jobs, or an iterable of row dicts
+        :param seen_at: timestamp recorded as last_seen (default: now)
+        :return: number of rows written
+        """
+        seen = (seen_at or datetime.now()).isoformat(timespec="seconds")
+        sql = self._upsert_sql()
+        written = 0
+        batches = {False: [], True: []}
+        for row in self._iter_input_rows(jobs):
+            if not row.get("id"):
+                continue
+            values = [_normalize(row.get(column)) for column in desired_order]
+            unchanged = _normalize(row.get("unchanged")) is True
+            batch = batches[unchanged]
+            batch.append(values + [seen, seen, content_hash(row)])
+            if len(batch) >= self.batch_size:
+                written += self._write_batch(sql, batch, unchanged)
+                batches[unchanged] = []
+        for unchanged, batch in batches.items():
+            if batch:
+                written += self._write_batch(sql, batch, unchanged)
+        return written
+
+    def _write_batch(self, sql: str, batch: list[list], unchanged: bool = False) -> int:
+        """
+        Writes a batch in one transaction; of a batch of unchanged rows, those
+        stored with the same content hash are only touched
+        """
+        written = len(batch)
+        with self._lock, self.conn:
+            if unchanged:
+                stored = self._stored_hashes([values[0] for values in batch])
+                touched = [v for v in batch if stored.get(v[0]) == v[-1]]
+                self.conn.executemany(self._upsert_sql(touch_only=True), touched)
+                batch = [v for v in batch if stored.get(v[0]) != v[-1]]
+            self.conn.executemany(sql, batch)
+        return written
+
+    def _stored_hashes(self, ids: list[str]) -> dict[str, str]:
+        """content_hash of the stored postings among ids; called under _lock"""
+        hashes = {}
+        # chunked to stay under SQLite's bound-parameter limit
+        for start in range(0, len(ids), 500):
+            chunk = ids[start : start + 500]
+            hashes.update(
+                self.conn.execute(
+                    "SELECT id, content_hash FROM jobs "
+                    f"WHERE id IN ({', '.join('?' for _ in chunk)})",
+                    chunk,
+                )
+            )
+        return hashes
+
+    @staticmethod
+    def _iter_input_rows(jobs) -> Iterator[dict]:
+        if hasattr(jobs, "to_dict"):
+            columns = [column for column in desired_order if column in jobs.columns]
+            for values in jobs[columns].itertuples(index=False, name=None):
+                yield dict(zip(columns, values))
+        else:
+            yield from jobs
+
+    def _where(
+        self,
+        site: str | list[str] | None = None,
+        company: str | None = None,
+        posted_after: date | str | None = None,
+        posted_before: date | str | None = None,
+        seen_after: datetime | str | None = None,
+        min_salary: float | None = None,
+        max_salary: float | None = None,
+        ids: Iterable[str] | None = None,
+    ) -> tuple[str, list]:
+        clauses, params = [], []
+        if site:
+            sites = [site] if isinstance(site, str) else list(site)
+            clauses.append(f"site IN ({', '.join('?' for _ in sites)})")
+            params += sites
+        if company:
+            clauses.append("company LIKE ?")
+            params.append(f"%{company}%")
+        if posted_after:
+            clauses.append("date_posted >= ?")
+            params.append(_normalize(posted_after))
+        if posted_before:
+            clauses.append("date_posted <= ?")
+            params.append(_normalize(posted_before))
+        if seen_after:
+            clauses.append("last_seen >= ?")
+            params.append(_normalize(seen_after))
+        # salary filters match postings whose advertised range overlaps the window
+        if min_salary is not None:
+            clauses.append("COALESCE(max_amount, min_amount) >= ?")
+            params.append(min_salary)
+        if max_salary is not None:
+            clauses.append("COALESCE(min_amount, max_amount) <= ?")
+            params.append(max_salary)
+        if ids is not None:
+            ids = list(ids)
+            clauses.append(f"id IN ({', '.join('?' for _ in ids)})")
+            params += ids
+        return (f" WHERE {' AND '.join(clauses)}" if clauses else ""), params
+
+    def iter_rows(
+        self,
+        columns: list[str] | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+        order_by: str = "date_posted DESC",
+        **filters,
+    ) -> Iterator[dict]:
+        """
+        Streams matching rows as dicts. Filters: site, company (substring),
+        posted_after/posted_before, seen_after, min_salary/max_salary, ids.
+        """
+        columns = columns or desired_order + TRACKING_COLUMNS
+        where, params = self._where(**filters)
+        sql = f"SELECT {', '.join(columns)} FROM jobs{where} ORDER BY {order_by}"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        with self._lock:
+            cursor = self.conn.execute(sql, params)
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(1000)
+            if not rows:
+                break
+            for row in rows:
+                yield dict(zip(columns, row))
+
+    def query(self, **kwargs):
+        """Same arguments as iter_rows, returning a pandas DataFrame"""
+        import pandas as pd
+
+        columns = kwargs.get("columns") or desired_order + TRACKING_COLUMNS
+        return pd.DataFrame(list(self.iter_rows(**kwargs)), columns=columns)
+
+    def count(self, **filters) -> int:
+        where, params = self._where(**filters)
+        with self._lock:
+            cursor = self.conn.execute(f"SELECT COUNT(*) FROM jobs{where}", params)
+            return cursor.fetchone()[0]
+
+    def known_ids(self, **filters) -> set[str]:
+        """Ids already stored, e.g. to skip postings seen on earlier runs"""
+        where, params = self._where(**filters)
+        with self._lock:
+            rows = self.conn.execute(f"SELECT id FROM jobs{where}", params).fetchall()
+        return {row[0] for row in rows}
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
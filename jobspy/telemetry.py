@@ -0,0 +1,217 @@
+"""
+jobspy.telemetry
+~~~~~~~~~~~~~~~~~~~
+
+Per-site instrumentation for scrapers: request counts, bytes received, retries,
+429s, time spent per phase and job counts. Each scraper owns a ScrapeStats that
+its sessions report into, and scrape_jobs forwards it to any registered hooks
+and progress callbacks.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from enum import Enum
+from typing import Callable, NamedTuple
+
+
+class ProgressEventType(Enum):
+    PAGE_FETCHED = "page_fetched"
+    JOBS_PARSED = "jobs_parsed"
+    SITE_DONE = "site_done"
+
+
+class ProgressEvent(NamedTuple):
+    site: str
+    type: ProgressEventType
+    page: int
+    jobs: int
+    total_jobs: int
+    results_wanted: int | None
+
+
+ProgressCallback = Callable[[ProgressEvent], None]
+
+
+class MetricsHook:
+    """
+    Receives telemetry from running scrapers. Subclass and override the events
+    you care about; every method is a no-op by default. Hooks are called from
+    scraper worker threads, so implementations must be thread-safe.
+    """
+
+    def on_request(
+        self, site: str, status_code: int | None, num_bytes: int, elapsed: float
+    ) -> None: ...
+
+    def on_site_done(self, stats: "ScrapeStats") -> None: ...
+
+
+class ScrapeStats:
+    """
+    Thread-safe counters and phase timers for a single site's scrape.
+
+    Phase times are exclusive: time spent in a nested phase (e.g. a network
+    request made while parsing) is attributed to the inner phase only.
+    """
+
+    counters = (
+        "requests",
+        "bytes_received",
+        "retries",
+        "status_429",
+        "errors",
+        "detail_fetches",
+        "pages_fetched",
+        "jobs_yielded",
+        "descriptions_reused",
+        "hedged_requests",
+        "hedge_wins",
+        "stale_listings",
+        "listings_filtered",
+        "shared_details",
+        "companies_cached",
+    )
+    phases = ("network", "parse", "decode", "markdown")
+
+    def __init__(
+        self,
+        site: str,
+        hooks: list[MetricsHook] | None = None,
+        progress_callback: ProgressCallback | None = None,
+    ):
+        self.site = site
+        self.hooks = list(hooks) if hooks else []
+        self.progress_callback = progress_callback
+        self.results_wanted = None
+        self.complete = True
+        self.skipped = False
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._counts = dict.fromkeys(self.counters, 0)
+        self._seconds = dict.fromkeys(self.phases, 0.0)
+        self._jobs_parsed = 0
+        self._started = None
+        self._finished = None
+
+    def start(self):
+        self._started = time.perf_counter()
+
+    def finish(self):
+        self._finished = time.perf_counter()
+        for hook in self.hooks:
+            hook.on_site_done(self)
+        self._emit(ProgressEventType.SITE_DONE, 0)
+
+    def incr(self, counter: str, amount: int = 1):
+        with self._lock:
+            self._counts[counter] += amount
+
+    def page_fetched(self):
+        """Counts a fetched search page and reports it to the progress callback"""
+        self.incr("pages_fetched")
+        self._emit(ProgressEventType.PAGE_FETCHED, 0)
+
+    def jobs_parsed(self, count: int):
+        """Reports `count` jobs parsed from the latest page"""
+        with self._lock:
+            self._jobs_parsed += count
+        self._emit(ProgressEventType.JOBS_PARSED, count)
+
+    def _emit(self, event_type: ProgressEventType, jobs: int):
+        if self.progress_callback is None:
+            return
+        with self._lock:
+            page = self._counts["pages_fetched"]
+            total_jobs = self._jobs_parsed
+        self.progress_callback(
+            ProgressEvent(
+                site=self.site,
+                type=event_type,
+                page=page,
+                jobs=jobs,
+                total_jobs=total_jobs,
+                results_wanted=self.results_wanted,
+            )
+        )
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Times the enclosed block as phase `name`, excluding nested phases
+        """
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        frame = [time.perf_counter(), 0.0]
+        stack.append(frame)
+        try:
+            yield
+        finally:
+            stack.pop()
+            elapsed = time.perf_counter() - frame[0]
+            if stack:
+                stack[-1][1] += elapsed
+            with self._lock:
+                self._seconds[name] += elapsed - frame[1]
+
+    def record_response(self, response, elapsed: float):
+        """
+        Records a completed HTTP exchange from either a requests or tls_client
+        response object
+        """
+        status_code = getattr(response, "status_code", None)
+        content = getattr(response, "content", None) or b""
+        retries = 0
+        raw = getattr(response, "raw", None)
+        if raw is not None and getattr(raw, "retries", None) is not None:
+            retries = len(raw.retries.history)
+        with self._lock:
+            self._counts["requests"] += 1
+            self._counts["bytes_received"] += len(content)
+            self._counts["retries"] += retries
+            if status_code == 429:
+                self._counts["status_429"] += 1
+        for hook in self.hooks:
+            hook.on_request(self.site, status_code, len(content), elapsed)
+
+    def record_error(self, elapsed: float):
+        """
+        Records a request that raised without a response (timeouts, connection
+        errors). Statuses the sessions retry come back as the final response,
+        since they don't raise on status, and go through record_response.
+        """
+        with self._lock:
+            self._counts["requests"] += 1
+            self._counts["errors"] += 1
+        for hook in self.hooks:
+            hook.on_request(self.site, None, 0, elapsed)
+
+    @property
+    def total_seconds(self) -> float | None:
+        if self._started is None:
+            return None
+        end = self._finished if self._finished is not None else time.perf_counter()
+        return end - self._started
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            data = {
+                "site": self.site,
+                "complete": self.complete,
+                "skipped": self.skipped,
+                **self._counts,
+            }
+            for name, seconds in self._seconds.items():
+                data[f"{name}_seconds"] = round(seconds, 4)
+            detail_fetches = self._counts["detail_fetches"]
+            data["hedge_rate"] = (
+                round(self._counts["hedged_requests"] / detail_fetches, 4)
+                if detail_fetches
+                else 0.0
+            )
+        total = self.total_seconds
+        data["total_seconds"] = round(total, 4) if total is not None else None
+        return data
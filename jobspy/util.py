@@ -1,25 +1,56 @@
 from __future__ import annotations
 
+import functools
+import json
 import logging
 import re
+import threading
+import time
 from itertools import cycle
+from typing import Callable
 
-import numpy as np
 import requests
-import tls_client
 import urllib3
-from markdownify import markdownify as md
 from requests.adapters import HTTPAdapter, Retry
 
 from jobspy.model import CompensationInterval, JobType, Site
 
+try:
+    import orjson
+except ImportError:  # optional accelerated JSON backend
+    orjson = None
+
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+json_backend = "orjson" if orjson is not None else "json"
+
+
+def json_loads(data: str | bytes):
+    """
+    Decodes JSON with orjson when installed, falling back to the stdlib.
+    Pass response.content rather than response.text to skip a str decode.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj) -> bytes:
+    """Encodes compact UTF-8 JSON for a request body with orjson when installed"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+_logger_lock = threading.Lock()
+
 
 def create_logger(name: str):
     logger = logging.getLogger(f"JobSpy:{name}")
     logger.propagate = False
-    if not logger.handlers:
+    with _logger_lock:
+        if logger.handlers:
+            return logger
         logger.setLevel(logging.INFO)
         console_handler = logging.StreamHandler()
         format = "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
@@ -29,8 +60,52 @@ def create_logger(name: str):
     return logger
 
 
+class ConcurrentSet:
+    """
+    Set shared by scraper worker threads, where add() atomically reports whether
+    the item was new so check-then-add can't race
+    """
+
+    def __init__(self):
+        self._items = set()
+        self._lock = threading.Lock()
+
+    def add(self, item) -> bool:
+        with self._lock:
+            if item in self._items:
+                return False
+            self._items.add(item)
+            return True
+
+    def __contains__(self, item) -> bool:
+        return item in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+def when_done(futures: list, callback: Callable[[], None]):
+    """Calls callback once every future is done, right away if they already are"""
+    remaining = len(futures)
+    lock = threading.Lock()
+
+    def on_done(_):
+        nonlocal remaining
+        with lock:
+            remaining -= 1
+            last = remaining == 0
+        if last:
+            callback()
+
+    if not futures:
+        callback()
+    for future in futures:
+        future.add_done_callback(on_done)
+
+
 class RotatingProxySession:
-    def __init__(self, proxies=None):
+    def __init__(self, proxies=None, stats=None):
+        self.stats = stats
         if isinstance(proxies, str):
             self.proxy_cycle = cycle([self.format_proxy(proxies)])
         elif isinstance(proxies, list):
@@ -49,11 +124,32 @@ class RotatingProxySession:
             return {"http": proxy, "https": proxy}
         return {"http": f"http://{proxy}", "https": f"http://{proxy}"}
 
+    def instrumented(self, send, *args, **kwargs):
+        """Runs the request through `send`, reporting it to the stats if set"""
+        if self.stats is None:
+            return send(*args, **kwargs)
+        start = time.perf_counter()
+        with self.stats.phase("network"):
+            try:
+                response = send(*args, **kwargs)
+            except Exception:
+                self.stats.record_error(time.perf_counter() - start)
+                raise
+        self.stats.record_response(response, time.perf_counter() - start)
+        return response
+
 
 class RequestsRotating(RotatingProxySession, requests.Session):
 
-    def __init__(self, proxies=None, has_retry=False, delay=1, clear_cookies=False):
-        RotatingProxySession.__init__(self, proxies=proxies)
+    def __init__(
+        self,
+        proxies=None,
+        has_retry=False,
+        delay=1,
+        clear_cookies=False,
+        stats=None,
+    ):
+        RotatingProxySession.__init__(self, proxies=proxies, stats=stats)
         requests.Session.__init__(self)
         self.clear_cookies = clear_cookies
         self.allow_redirects = True
@@ -67,6 +163,10 @@ class RequestsRotating(RotatingProxySession, requests.Session):
                 status=3,
                 status_forcelist=[500, 502, 503, 504, 429],
                 backoff_factor=delay,
+                # return the last response once retries run out, so its status
+                # (e.g. a 429) reaches the stats and circuit breaker instead of
+                # surfacing as a RetryError without one
+                raise_on_status=False,
             )
             adapter = HTTPAdapter(max_retries=retries)
             self.mount("http://", adapter)
@@ -77,30 +177,48 @@ class RequestsRotating(RotatingProxySession, requests.Session):
             self.cookies.clear()
 
         if self.proxy_cycle:
+            # passed per request rather than set on the session, which is shared
+            # by the scraper's worker threads
             next_proxy = next(self.proxy_cycle)
             if next_proxy["http"] != "http://localhost":
-                self.proxies = next_proxy
-            else:
-                self.proxies = {}
-        return requests.Session.request(self, method, url, **kwargs)
+                kwargs.setdefault("proxies", next_proxy)
+        return self.instrumented(requests.Session.request, self, method, url, **kwargs)
 
 
-class TLSRotating(RotatingProxySession, tls_client.Session):
+@functools.cache
+def _tls_rotating_class() -> type:
+    """
+    Defines TLSRotating on first use, since importing tls_client loads its
+    native library
+    """
+    import tls_client
+
+    class TLSRotating(RotatingProxySession, tls_client.Session):
+
+        def __init__(self, proxies=None, stats=None):
+            RotatingProxySession.__init__(self, proxies=proxies, stats=stats)
+            tls_client.Session.__init__(self, random_tls_extension_order=True)
+
+        def execute_request(self, *args, **kwargs):
+            if self.proxy_cycle:
+                # passed per request rather than set on the session, which is
+                # shared by the scraper's worker threads
+                next_proxy = next(self.proxy_cycle)
+                if next_proxy["http"] != "http://localhost":
+                    kwargs.setdefault("proxy", next_proxy)
+            response = self.instrumented(
+                tls_client.Session.execute_request, self, *args, **kwargs
+            )
+            response.ok = response.status_code in range(200, 400)
+            return response
 
-    def __init__(self, proxies=None):
-        RotatingProxySession.__init__(self, proxies=proxies)
-        tls_client.Session.__init__(self, random_tls_extension_order=True)
+    return TLSRotating
 
-    def execute_request(self, *args, **kwargs):
-        if self.proxy_cycle:
-            next_proxy = next(self.proxy_cycle)
-            if next_proxy["http"] != "http://localhost":
-                self.proxies = next_proxy
-            else:
-                self.proxies = {}
-        response = tls_client.Session.execute_request(self, *args, **kwargs)
-        response.ok = response.status_code in range(200, 400)
-        return response
+
+def __getattr__(name: str):
+    if name == "TLSRotating":
+        return _tls_rotating_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def create_session(
@@ -111,19 +229,22 @@ def create_session(
     has_retry: bool = False,
     delay: int = 1,
     clear_cookies: bool = False,
+    stats=None,
 ) -> requests.Session:
     """
     Creates a requests session with optional tls, proxy, and retry settings.
+    If stats is given, every request made through the session is recorded on it.
     :return: A session object
     """
     if is_tls:
-        session = TLSRotating(proxies=proxies)
+        session = _tls_rotating_class()(proxies=proxies, stats=stats)
     else:
         session = RequestsRotating(
             proxies=proxies,
             has_retry=has_retry,
             delay=delay,
             clear_cookies=clear_cookies,
+            stats=stats,
         )
 
     if ca_cert:
@@ -154,6 +275,8 @@ def set_logger_level(verbose: int):
 def markdown_converter(description_html: str):
     if description_html is None:
         return None
+    from markdownify import markdownify as md
+
     markdown = md(description_html)
     return markdown.strip()
 
@@ -190,7 +313,7 @@ def currency_parser(cur_str):
     else:
         num = float(cur_str)
 
-    return np.round(num, 2)
+    return round(num, 2)
 
 
 def remove_attributes(tag):
@@ -344,4 +467,6 @@ desired_order = [
     "company_num_employees",
     "company_revenue",
     "company_description",
+    "description_hash",
+    "unchanged",
 ]
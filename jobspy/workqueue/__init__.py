@@ -0,0 +1,20 @@
+"""
+jobspy.workqueue
+~~~~~~~~~~~~~~~~~~~
+
+Coordinator / worker mode for sharding searches across processes and nodes.
+A Coordinator splits search specs into (site, query, shard) tasks and puts them
+on a TaskQueue; Workers lease tasks, run the site's scraper and ship compact
+result rows back. Leases expire so crashed workers' tasks are retried, result
+rows are deduplicated on the posting id, and per-site concurrency and start
+rate limits are enforced by the queue, so they hold across every worker.
+
+The default queue is a SQLite file (shared by processes on one host); a Redis
+URL selects the Redis-backed queue for multiple nodes.
+"""
+
+from __future__ import annotations
+
+from jobspy.workqueue.base import Task, TaskQueue, TaskStatus, open_queue
+from jobspy.workqueue.coordinator import Coordinator, split_search
+from jobspy.workqueue.worker import Worker, run_worker_processes
@@ -0,0 +1,126 @@
+"""
+jobspy.workqueue.base
+~~~~~~~~~~~~~~~~~~~
+
+Task model and the TaskQueue interface implemented by the queue backends.
+"""
+
+from __future__ import annotations
+
+import uuid
+from abc import ABC, abstractmethod
+from enum import Enum
+from typing import Iterator
+
+from pydantic import BaseModel
+
+from jobspy.model import Site
+from jobspy.util import json_dumps, json_loads
+
+
+class TaskStatus(Enum):
+    QUEUED = "queued"
+    LEASED = "leased"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class Task(BaseModel):
+    id: str
+    batch: str
+    site: Site
+    # scrape_jobs-style search arguments for this site and shard
+    spec: dict
+    shard: int = 0
+    attempts: int = 0
+
+    @classmethod
+    def create(cls, batch: str, site: Site, spec: dict, shard: int = 0) -> Task:
+        return cls(id=uuid.uuid4().hex, batch=batch, site=site, spec=spec, shard=shard)
+
+    def dumps(self) -> str:
+        return json_dumps(
+            {
+                "id": self.id,
+                "batch": self.batch,
+                "site": self.site.value,
+                "spec": self.spec,
+                "shard": self.shard,
+            }
+        ).decode()
+
+    @classmethod
+    def loads(cls, data: str | bytes, attempts: int = 0) -> Task:
+        return cls(**json_loads(data), attempts=attempts)
+
+
+class TaskQueue(ABC):
+    """
+    Storage for tasks, leases, per-site limits and deduplicated result rows.
+    Implementations must be safe to use from several processes at once.
+    """
+
+    def __init__(self, max_attempts: int = 3):
+        """
+        :param max_attempts: leases a task gets before it is marked failed
+        """
+        self.max_attempts = max_attempts
+
+    @abstractmethod
+    def put(self, tasks: list[Task]) -> None: ...
+
+    @abstractmethod
+    def lease(self, worker_id: str, lease_seconds: float) -> Task | None:
+        """
+        Leases the oldest runnable task whose site is under its limits, or
+        returns None. Tasks with expired leases are runnable again.
+        """
+
+    @abstractmethod
+    def heartbeat(self, task: Task, worker_id: str, lease_seconds: float) -> bool:
+        """Extends a lease; False if the worker no longer holds it"""
+
+    @abstractmethod
+    def complete(self, task: Task, worker_id: str, rows: list[dict]) -> int | None:
+        """
+        Stores result rows, skipping ids already in the batch, and marks the
+        task done; returns the new rows, or None (storing nothing) if the
+        worker no longer holds the lease
+        """
+
+    @abstractmethod
+    def fail(self, task: Task, worker_id: str, error: str) -> None:
+        """Requeues the task, or marks it failed once out of attempts"""
+
+    @abstractmethod
+    def set_site_limit(
+        self, site: str, max_concurrent: int | None = None, min_interval: float = 0.0
+    ) -> None:
+        """
+        Caps a site across all workers: at most max_concurrent leased tasks and
+        at least min_interval seconds between task starts
+        """
+
+    @abstractmethod
+    def status(self, batch: str) -> dict[str, int]:
+        """Number of the batch's tasks per TaskStatus value"""
+
+    @abstractmethod
+    def iter_results(self, batch: str) -> Iterator[dict]: ...
+
+    def close(self) -> None:
+        pass
+
+
+def open_queue(url: str = "jobs_queue.db", **kwargs) -> TaskQueue:
+    """
+    Opens a queue from a URL: redis://... for RedisTaskQueue, otherwise a SQLite
+    path (optionally prefixed with sqlite:///)
+    """
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        from jobspy.workqueue.redis_queue import RedisTaskQueue
+
+        return RedisTaskQueue(url, **kwargs)
+    from jobspy.workqueue.sqlite_queue import SQLiteTaskQueue
+
+    return SQLiteTaskQueue(url.removeprefix("sqlite:///"), **kwargs)
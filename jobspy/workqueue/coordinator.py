@@ -0,0 +1,142 @@
+"""
+jobspy.workqueue.coordinator
+~~~~~~~~~~~~~~~~~~~
+
+Splits search specs into tasks, submits them as a batch and collects the
+batch's deduplicated rows once the workers are done.
+"""
+
+from __future__ import annotations
+
+import time
+import uuid
+from typing import TYPE_CHECKING
+
+from jobspy.model import Site
+from jobspy.results import rows_to_dataframe
+from jobspy.util import create_logger, map_str_to_site
+from jobspy.workqueue.base import Task, TaskQueue, TaskStatus
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+log = create_logger("Coordinator")
+
+# boards whose scrapers start at ScraperInput.offset without refetching the
+# pages before it, so a large search splits into offset shards
+SHARDABLE_SITES = frozenset({Site.LINKEDIN, Site.GLASSDOOR})
+
+
+def _spec_sites(spec: dict) -> list[Site]:
+    site_name = spec.get("site_name")
+    if site_name is None:
+        return list(Site)
+    if not isinstance(site_name, list):
+        site_name = [site_name]
+    return [
+        site if isinstance(site, Site) else map_str_to_site(site) for site in site_name
+    ]
+
+
+def split_search(spec: dict, batch: str, shard_size: int = 100) -> list[Task]:
+    """
+    Splits one scrape_jobs-style search spec into a task per site, and for
+    sites in SHARDABLE_SITES into a task per shard_size results
+    :param spec: scrape_jobs keyword arguments (site_name, search_term, ...)
+    :param batch: batch id the tasks belong to
+    :param shard_size: results_wanted of each shard of a shardable site
+    """
+    site_spec = {key: value for key, value in spec.items() if key != "site_name"}
+    results_wanted = spec.get("results_wanted", 15)
+    offset = spec.get("offset") or 0
+    tasks = []
+    for site in _spec_sites(spec):
+        if site not in SHARDABLE_SITES or results_wanted <= shard_size:
+            tasks.append(Task.create(batch, site, site_spec))
+            continue
+        for shard, start in enumerate(range(0, results_wanted, shard_size)):
+            shard_spec = {
+                **site_spec,
+                "offset": offset + start,
+                "results_wanted": min(shard_size, results_wanted - start),
+            }
+            tasks.append(Task.create(batch, site, shard_spec, shard=shard))
+    return tasks
+
+
+class Coordinator:
+    def __init__(self, queue: TaskQueue, shard_size: int = 100):
+        """
+        :param queue: queue shared with the workers
+        :param shard_size: results per task for sites that shard by offset
+        """
+        self.queue = queue
+        self.shard_size = shard_size
+
+    def set_site_limit(
+        self,
+        site: str | Site,
+        max_concurrent: int | None = None,
+        min_interval: float = 0.0,
+    ):
+        """Caps a site across every worker on the queue, see TaskQueue"""
+        site = site.value if isinstance(site, Site) else map_str_to_site(site).value
+        self.queue.set_site_limit(site, max_concurrent, min_interval)
+
+    def submit(self, searches: dict | list[dict]) -> str:
+        """
+        Queues one or more search specs as a single batch
+        :param searches: scrape_jobs keyword arguments, or a list of them
+        :return: batch id for status / wait / results
+        """
+        if isinstance(searches, dict):
+            searches = [searches]
+        batch = uuid.uuid4().hex
+        tasks = [
+            task
+            for spec in searches
+            for task in split_search(spec, batch, self.shard_size)
+        ]
+        self.queue.put(tasks)
+        log.info(f"batch {batch}: queued {len(tasks)} tasks")
+        return batch
+
+    def status(self, batch: str) -> dict[str, int]:
+        return self.queue.status(batch)
+
+    def is_finished(self, batch: str) -> bool:
+        counts = self.status(batch)
+        return (
+            not counts[TaskStatus.QUEUED.value] and not counts[TaskStatus.LEASED.value]
+        )
+
+    def wait(
+        self, batch: str, timeout: float | None = None, poll_interval: float = 1.0
+    ) -> bool:
+        """
+        Blocks until every task of the batch is done or failed
+        :return: False if the timeout passed first
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while not self.is_finished(batch):
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(poll_interval)
+        return True
+
+    def rows(self, batch: str) -> list[dict]:
+        return list(self.queue.iter_results(batch))
+
+    def results(self, batch: str) -> pd.DataFrame:
+        """The batch's rows as a scrape_jobs DataFrame"""
+        import pandas as pd
+
+        jobs_df = rows_to_dataframe(self.rows(batch))
+        if not jobs_df.empty:
+            # workers ship dates as ISO strings
+            jobs_df["date_posted"] = pd.to_datetime(
+                jobs_df["date_posted"], errors="coerce"
+            ).dt.date
+        counts = self.status(batch)
+        jobs_df.attrs["failed_tasks"] = counts[TaskStatus.FAILED.value]
+        return jobs_df
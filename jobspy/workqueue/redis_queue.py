@@ -0,0 +1,243 @@
+"""
+jobspy.workqueue.redis_queue
+~~~~~~~~~~~~~~~~~~~
+
+Redis-backed TaskQueue for workers spread over several nodes. Leasing,
+lease expiry and the per-site limits run as Lua scripts, so they are atomic
+on the server. Any Redis-compatible server with EVAL support works; keys are
+built inside the scripts, so Redis Cluster is not supported.
+"""
+
+from __future__ import annotations
+
+import time
+import zlib
+from typing import Iterator
+
+from jobspy.util import json_dumps, json_loads
+from jobspy.workqueue.base import Task, TaskQueue, TaskStatus
+
+try:
+    import redis
+except ImportError:  # optional dependency, only needed for redis:// queues
+    redis = None
+
+# KEYS: none; ARGV: namespace, now, lease_seconds, worker_id, max_attempts
+_LEASE_SCRIPT = """
+local ns, now, lease = ARGV[1], tonumber(ARGV[2]), tonumber(ARGV[3])
+local worker, max_attempts = ARGV[4], tonumber(ARGV[5])
+for _, id in ipairs(redis.call('ZRANGEBYSCORE', ns .. ':leases', '-inf', now)) do
+    local key = ns .. ':task:' .. id
+    local site = redis.call('HGET', key, 'site')
+    redis.call('ZREM', ns .. ':leases', id)
+    redis.call('HINCRBY', ns .. ':running', site, -1)
+    if tonumber(redis.call('HGET', key, 'attempts')) >= max_attempts then
+        redis.call('HSET', key, 'status', 'failed', 'error', 'lease expired')
+    else
+        redis.call('HSET', key, 'status', 'queued', 'error', 'lease expired')
+        redis.call('LPUSH', ns .. ':queue:' .. site, id)
+    end
+end
+local sites = redis.call('SMEMBERS', ns .. ':sites')
+table.sort(sites)
+for _, site in ipairs(sites) do
+    local limits = redis.call(
+        'HMGET', ns .. ':limits:' .. site, 'max_concurrent', 'min_interval',
+        'last_start')
+    local running = tonumber(redis.call('HGET', ns .. ':running', site) or '0')
+    local max_concurrent = tonumber(limits[1])
+    local min_interval = tonumber(limits[2] or '0')
+    local last_start = tonumber(limits[3] or '0')
+    if (max_concurrent == nil or running < max_concurrent)
+            and now - last_start >= min_interval then
+        local id = redis.call('LPOP', ns .. ':queue:' .. site)
+        if id then
+            local key = ns .. ':task:' .. id
+            local attempts = redis.call('HINCRBY', key, 'attempts', 1)
+            redis.call('HSET', key, 'status', 'leased', 'worker', worker)
+            redis.call('ZADD', ns .. ':leases', now + lease, id)
+            redis.call('HINCRBY', ns .. ':running', site, 1)
+            redis.call('HSET', ns .. ':limits:' .. site, 'last_start', now)
+            return {redis.call('HGET', key, 'payload'), attempts}
+        end
+    end
+end
+return nil
+"""
+
+# KEYS: none; ARGV: namespace, task_id, worker_id, lease_expires
+_HEARTBEAT_SCRIPT = """
+local ns, id = ARGV[1], ARGV[2]
+local key = ns .. ':task:' .. id
+local state = redis.call('HMGET', key, 'status', 'worker')
+if state[1] ~= 'leased' or state[2] ~= ARGV[3] then
+    return 0
+end
+redis.call('ZADD', ns .. ':leases', 'XX', tonumber(ARGV[4]), id)
+return 1
+"""
+
+# KEYS: none; ARGV: namespace, task_id, worker_id, batch, then job id and row
+# pairs; rows are stored only while the worker still holds the lease
+_COMPLETE_SCRIPT = """
+local ns, id = ARGV[1], ARGV[2]
+local key = ns .. ':task:' .. id
+local state = redis.call('HMGET', key, 'status', 'worker', 'site')
+if state[1] ~= 'leased' or state[2] ~= ARGV[3] then
+    return -1
+end
+local results = ns .. ':results:' .. ARGV[4]
+local inserted = 0
+for i = 5, #ARGV, 2 do
+    inserted = inserted + redis.call('HSETNX', results, ARGV[i], ARGV[i + 1])
+end
+redis.call('ZREM', ns .. ':leases', id)
+redis.call('HINCRBY', ns .. ':running', state[3], -1)
+redis.call('HSET', key, 'status', 'done', 'error', '')
+return inserted
+"""
+
+# KEYS: none; ARGV: namespace, task_id, worker_id, status, error, requeue
+_RELEASE_SCRIPT = """
+local ns, id = ARGV[1], ARGV[2]
+local key = ns .. ':task:' .. id
+local state = redis.call('HMGET', key, 'status', 'worker', 'site')
+if state[1] ~= 'leased' or state[2] ~= ARGV[3] then
+    return 0
+end
+redis.call('ZREM', ns .. ':leases', id)
+redis.call('HINCRBY', ns .. ':running', state[3], -1)
+redis.call('HSET', key, 'status', ARGV[4], 'error', ARGV[5])
+if ARGV[6] == '1' then
+    redis.call('LPUSH', ns .. ':queue:' .. state[3], id)
+end
+return 1
+"""
+
+
+class RedisTaskQueue(TaskQueue):
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379/0",
+        namespace: str = "jobspy",
+        max_attempts: int = 3,
+    ):
+        """
+        :param url: redis://, rediss:// or unix:// connection URL
+        :param namespace: prefix for every key, to share a server between queues
+        :param max_attempts: leases a task gets before it is marked failed
+        """
+        if redis is None:
+            raise ImportError(
+                "RedisTaskQueue requires the redis package: pip install redis"
+            )
+        super().__init__(max_attempts=max_attempts)
+        self.namespace = namespace
+        self.client = redis.Redis.from_url(url)
+        self._lease = self.client.register_script(_LEASE_SCRIPT)
+        self._heartbeat = self.client.register_script(_HEARTBEAT_SCRIPT)
+        self._release = self.client.register_script(_RELEASE_SCRIPT)
+        self._complete = self.client.register_script(_COMPLETE_SCRIPT)
+
+    def _key(self, *parts: str) -> str:
+        return ":".join((self.namespace, *parts))
+
+    def put(self, tasks: list[Task]) -> None:
+        pipe = self.client.pipeline()
+        for task in tasks:
+            site = task.site.value
+            pipe.hset(
+                self._key("task", task.id),
+                mapping={
+                    "payload": task.dumps(),
+                    "batch": task.batch,
+                    "site": site,
+                    "status": TaskStatus.QUEUED.value,
+                    "attempts": 0,
+                },
+            )
+            pipe.sadd(self._key("batch", task.batch), task.id)
+            pipe.sadd(self._key("sites"), site)
+            pipe.rpush(self._key("queue", site), task.id)
+        pipe.execute()
+
+    def lease(self, worker_id: str, lease_seconds: float = 300.0) -> Task | None:
+        leased = self._lease(
+            args=[
+                self.namespace,
+                time.time(),
+                lease_seconds,
+                worker_id,
+                self.max_attempts,
+            ]
+        )
+        if leased is None:
+            return None
+        payload, attempts = leased
+        return Task.loads(payload, attempts=int(attempts))
+
+    def heartbeat(self, task: Task, worker_id: str, lease_seconds: float) -> bool:
+        expires = time.time() + lease_seconds
+        return bool(self._heartbeat(args=[self.namespace, task.id, worker_id, expires]))
+
+    def complete(self, task: Task, worker_id: str, rows: list[dict]) -> int | None:
+        args = [self.namespace, task.id, worker_id, task.batch]
+        for row in rows:
+            if row.get("id"):
+                args += [row["id"], zlib.compress(json_dumps(row))]
+        inserted = self._complete(args=args)
+        return None if inserted < 0 else inserted
+
+    def fail(self, task: Task, worker_id: str, error: str) -> None:
+        requeue = task.attempts < self.max_attempts
+        status = TaskStatus.QUEUED if requeue else TaskStatus.FAILED
+        self._release(
+            args=[
+                self.namespace,
+                task.id,
+                worker_id,
+                status.value,
+                error,
+                int(requeue),
+            ]
+        )
+
+    def set_site_limit(
+        self, site: str, max_concurrent: int | None = None, min_interval: float = 0.0
+    ) -> None:
+        key = self._key("limits", site)
+        pipe = self.client.pipeline()
+        if max_concurrent is None:
+            pipe.hdel(key, "max_concurrent")
+        else:
+            pipe.hset(key, "max_concurrent", max_concurrent)
+        pipe.hset(key, "min_interval", min_interval)
+        pipe.execute()
+
+    def _task_fields(self, batch: str, field: str) -> dict[str, bytes | None]:
+        ids = [id_.decode() for id_ in self.client.smembers(self._key("batch", batch))]
+        pipe = self.client.pipeline()
+        for id_ in ids:
+            pipe.hget(self._key("task", id_), field)
+        return dict(zip(ids, pipe.execute()))
+
+    def status(self, batch: str) -> dict[str, int]:
+        counts = {status.value: 0 for status in TaskStatus}
+        for status in self._task_fields(batch, "status").values():
+            counts[status.decode()] += 1
+        return counts
+
+    def errors(self, batch: str) -> dict[str, str]:
+        """Last error per task id, for the batch's retried or failed tasks"""
+        return {
+            id_: error.decode()
+            for id_, error in self._task_fields(batch, "error").items()
+            if error
+        }
+
+    def iter_results(self, batch: str) -> Iterator[dict]:
+        for _, row in self.client.hscan_iter(self._key("results", batch), count=1000):
+            yield json_loads(zlib.decompress(row))
+
+    def close(self) -> None:
+        self.client.close()
@@ -0,0 +1,243 @@
+"""
+jobspy.workqueue.sqlite_queue
+~~~~~~~~~~~~~~~~~~~
+
+SQLite-backed TaskQueue. Leases are taken in IMMEDIATE transactions, so any
+number of worker processes on one host can share the database file.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from typing import Iterator
+
+from jobspy.util import json_dumps, json_loads
+from jobspy.workqueue.base import Task, TaskQueue, TaskStatus
+
+_schema = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    batch TEXT NOT NULL,
+    site TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_expires REAL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status, site);
+CREATE INDEX IF NOT EXISTS idx_tasks_batch ON tasks (batch);
+CREATE TABLE IF NOT EXISTS site_limits (
+    site TEXT PRIMARY KEY,
+    max_concurrent INTEGER,
+    min_interval REAL NOT NULL DEFAULT 0,
+    last_start REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS results (
+    batch TEXT NOT NULL,
+    job_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    row BLOB NOT NULL,
+    PRIMARY KEY (batch, job_id)
+);
+"""
+
+
+class SQLiteTaskQueue(TaskQueue):
+    def __init__(self, path: str = "jobs_queue.db", max_attempts: int = 3):
+        """
+        :param path: SQLite database file shared by the coordinator and workers
+        :param max_attempts: leases a task gets before it is marked failed
+        """
+        super().__init__(max_attempts=max_attempts)
+        self.path = path
+        self._lock = threading.Lock()
+        # transactions are managed explicitly, see _transaction
+        self.conn = sqlite3.connect(
+            path, timeout=60, isolation_level=None, check_same_thread=False
+        )
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self._transaction() as conn:
+            for statement in _schema.split(";"):
+                if statement.strip():
+                    conn.execute(statement)
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+
+    def put(self, tasks: list[Task]) -> None:
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT INTO tasks (id, batch, site, payload, status) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (t.id, t.batch, t.site.value, t.dumps(), TaskStatus.QUEUED.value)
+                    for t in tasks
+                ],
+            )
+
+    def _blocked_sites(self, conn: sqlite3.Connection, now: float) -> list[str]:
+        running = dict(
+            conn.execute(
+                "SELECT site, COUNT(*) FROM tasks "
+                "WHERE status = ? AND lease_expires >= ? GROUP BY site",
+                (TaskStatus.LEASED.value, now),
+            ).fetchall()
+        )
+        blocked = []
+        limits = conn.execute(
+            "SELECT site, max_concurrent, min_interval, last_start FROM site_limits"
+        )
+        for site, max_concurrent, min_interval, last_start in limits:
+            if max_concurrent is not None and running.get(site, 0) >= max_concurrent:
+                blocked.append(site)
+            elif now - last_start < min_interval:
+                blocked.append(site)
+        return blocked
+
+    def lease(self, worker_id: str, lease_seconds: float = 300.0) -> Task | None:
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE tasks SET status = ?, error = 'lease expired' "
+                "WHERE status = ? AND lease_expires < ? AND attempts >= ?",
+                (
+                    TaskStatus.FAILED.value,
+                    TaskStatus.LEASED.value,
+                    now,
+                    self.max_attempts,
+                ),
+            )
+            blocked = self._blocked_sites(conn, now)
+            row = conn.execute(
+                "SELECT id, payload, attempts FROM tasks "
+                "WHERE (status = ? OR (status = ? AND lease_expires < ?)) "
+                f"AND site NOT IN ({', '.join('?' for _ in blocked)}) "
+                "ORDER BY rowid LIMIT 1",
+                (TaskStatus.QUEUED.value, TaskStatus.LEASED.value, now, *blocked),
+            ).fetchone()
+            if row is None:
+                return None
+            task = Task.loads(row[1], attempts=row[2] + 1)
+            conn.execute(
+                "UPDATE tasks SET status = ?, worker = ?, lease_expires = ?, "
+                "attempts = ? WHERE id = ?",
+                (
+                    TaskStatus.LEASED.value,
+                    worker_id,
+                    now + lease_seconds,
+                    task.attempts,
+                    task.id,
+                ),
+            )
+            conn.execute(
+                "UPDATE site_limits SET last_start = ? WHERE site = ?",
+                (now, task.site.value),
+            )
+        return task
+
+    def heartbeat(self, task: Task, worker_id: str, lease_seconds: float) -> bool:
+        expires = time.time() + lease_seconds
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE tasks SET lease_expires = ? "
+                "WHERE id = ? AND worker = ? AND status = ?",
+                (expires, task.id, worker_id, TaskStatus.LEASED.value),
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, task: Task, worker_id: str, rows: list[dict]) -> int | None:
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE tasks SET status = ?, error = NULL, lease_expires = NULL "
+                "WHERE id = ? AND worker = ? AND status = ?",
+                (TaskStatus.DONE.value, task.id, worker_id, TaskStatus.LEASED.value),
+            )
+            if cursor.rowcount != 1:
+                return None
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO results (batch, job_id, task_id, row) "
+                "VALUES (?, ?, ?, ?)",
+                [
+                    (task.batch, row["id"], task.id, zlib.compress(json_dumps(row)))
+                    for row in rows
+                    if row.get("id")
+                ],
+            )
+            inserted = conn.total_changes - before
+        return inserted
+
+    def fail(self, task: Task, worker_id: str, error: str) -> None:
+        status = TaskStatus.QUEUED
+        if task.attempts >= self.max_attempts:
+            status = TaskStatus.FAILED
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE tasks SET status = ?, error = ?, lease_expires = NULL "
+                "WHERE id = ? AND worker = ? AND status = ?",
+                (status.value, error, task.id, worker_id, TaskStatus.LEASED.value),
+            )
+
+    def set_site_limit(
+        self, site: str, max_concurrent: int | None = None, min_interval: float = 0.0
+    ) -> None:
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO site_limits (site, max_concurrent, min_interval) "
+                "VALUES (?, ?, ?) ON CONFLICT(site) DO UPDATE SET "
+                "max_concurrent = excluded.max_concurrent, "
+                "min_interval = excluded.min_interval",
+                (site, max_concurrent, min_interval),
+            )
+
+    def status(self, batch: str) -> dict[str, int]:
+        with self._lock:
+            counts = dict(
+                self.conn.execute(
+                    "SELECT status, COUNT(*) FROM tasks "
+                    "WHERE batch = ? GROUP BY status",
+                    (batch,),
+                ).fetchall()
+            )
+        return {status.value: counts.get(status.value, 0) for status in TaskStatus}
+
+    def errors(self, batch: str) -> dict[str, str]:
+        """Last error per task id, for the batch's retried or failed tasks"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT id, error FROM tasks WHERE batch = ? AND error IS NOT NULL",
+                (batch,),
+            ).fetchall()
+        return dict(rows)
+
+    def iter_results(self, batch: str) -> Iterator[dict]:
+        with self._lock:
+            cursor = self.conn.execute(
+                "SELECT row FROM results WHERE batch = ? ORDER BY rowid", (batch,)
+            )
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(1000)
+            if not rows:
+                break
+            for (row,) in rows:
+                yield json_loads(zlib.decompress(row))
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
@@ -0,0 +1,226 @@
+"""
+jobspy.workqueue.worker
+~~~~~~~~~~~~~~~~~~~
+
+Workers lease tasks from a queue, run the site's scraper on them and ship the
+flattened rows back. A heartbeat thread keeps the lease alive while a scrape
+runs; a worker that dies simply stops heartbeating and its task is retried.
+"""
+
+from __future__ import annotations
+
+import datetime
+import multiprocessing
+import os
+import socket
+import threading
+import time
+
+from jobspy.circuit_breaker import BreakerState, get_circuit_breaker
+from jobspy.model import Country, DescriptionFormat, ScraperInput
+from jobspy.registry import get_scraper_class
+from jobspy.results import job_to_row
+from jobspy.util import create_logger, desired_order, get_enum_from_value
+from jobspy.workqueue.base import Task, TaskQueue, open_queue
+
+log = create_logger("Worker")
+
+# columns shipped back to the coordinator; everything else is dropped
+_ROW_COLUMNS = frozenset(desired_order)
+
+
+def task_input(task: Task) -> ScraperInput:
+    """The ScraperInput a task's scrape_jobs-style spec describes"""
+    spec = task.spec
+    job_type = spec.get("job_type")
+    return ScraperInput(
+        site_type=[task.site],
+        country=Country.from_string(spec.get("country_indeed", "usa")),
+        search_term=spec.get("search_term"),
+        google_search_term=spec.get("google_search_term"),
+        location=spec.get("location"),
+        distance=spec.get("distance", 50),
+        is_remote=spec.get("is_remote", False),
+        job_type=get_enum_from_value(job_type) if job_type else None,
+        easy_apply=spec.get("easy_apply"),
+        description_format=DescriptionFormat(
+            spec.get("description_format", "markdown")
+        ),
+        linkedin_fetch_description=spec.get("linkedin_fetch_description", False),
+        results_wanted=spec.get("results_wanted", 15),
+        linkedin_company_ids=spec.get("linkedin_company_ids"),
+        offset=spec.get("offset") or 0,
+        hours_old=spec.get("hours_old"),
+    )
+
+
+def compact_row(row: dict) -> dict:
+    """Keeps the non-empty scrape_jobs columns of a row, dates as ISO strings"""
+    compact = {}
+    for column, value in row.items():
+        if column not in _ROW_COLUMNS or value is None:
+            continue
+        if isinstance(value, (datetime.date, datetime.datetime)):
+            value = value.isoformat()
+        compact[column] = value
+    return compact
+
+
+class Worker:
+    def __init__(
+        self,
+        queue: TaskQueue,
+        proxies: list[str] | str | None = None,
+        ca_cert: str | None = None,
+        worker_id: str | None = None,
+        lease_seconds: float = 300.0,
+    ):
+        """
+        :param queue: queue shared with the coordinator
+        :param proxies: proxies handed to every scraper this worker creates
+        :param ca_cert: CA bundle handed to every scraper
+        :param worker_id: identifies the lease holder; defaults to host:pid
+        :param lease_seconds: lease length, renewed every third of it
+        """
+        self.queue = queue
+        self.proxies = proxies
+        self.ca_cert = ca_cert
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.lease_seconds = lease_seconds
+        self.tasks_done = 0
+        self.tasks_failed = 0
+
+    def _heartbeat(self, task: Task, stop: threading.Event):
+        while not stop.wait(self.lease_seconds / 3):
+            if not self.queue.heartbeat(task, self.worker_id, self.lease_seconds):
+                log.warning(f"lost the lease on task {task.id}")
+                return
+
+    def scrape(self, task: Task) -> list[dict]:
+        """Runs the task's scrape and returns its compact rows"""
+        scraper_input = task_input(task)
+        scraper = get_scraper_class(task.site)(
+            proxies=self.proxies, ca_cert=self.ca_cert
+        )
+        breaker = get_circuit_breaker(task.site.value)
+        admission = breaker.admit()
+        if admission is None:
+            raise RuntimeError(f"{task.site.value} circuit open")
+        scraper.circuit_breaker = breaker
+        scraper.stats.hooks = [breaker]
+        scraper.stats.start()
+        try:
+            job_response = scraper.scrape(scraper_input)
+        finally:
+            if admission == BreakerState.HALF_OPEN:
+                breaker.probe_finished()
+        scraper.stats.finish()
+        enforce_annual_salary = task.spec.get("enforce_annual_salary", False)
+        return [
+            compact_row(
+                job_to_row(
+                    job,
+                    task.site.value,
+                    scraper_input.country,
+                    enforce_annual_salary,
+                )
+            )
+            for job in job_response.jobs
+        ]
+
+    def run_task(self, task: Task) -> bool:
+        stop = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat, args=(task, stop), daemon=True
+        )
+        heartbeat.start()
+        try:
+            rows = self.scrape(task)
+        except Exception as e:
+            log.error(f"task {task.id} ({task.site.value}) failed: {e}")
+            self.queue.fail(task, self.worker_id, f"{type(e).__name__}: {e}")
+            self.tasks_failed += 1
+            return False
+        finally:
+            stop.set()
+            heartbeat.join()
+        inserted = self.queue.complete(task, self.worker_id, rows)
+        if inserted is None:
+            log.warning(
+                f"task {task.id} ({task.site.value}): lease lost before completion, "
+                f"{len(rows)} jobs discarded"
+            )
+            return False
+        log.info(
+            f"task {task.id} ({task.site.value} shard {task.shard}): "
+            f"{len(rows)} jobs, {inserted} new"
+        )
+        self.tasks_done += 1
+        return True
+
+    def run(
+        self,
+        max_tasks: int | None = None,
+        idle_timeout: float | None = None,
+        poll_interval: float = 1.0,
+    ) -> int:
+        """
+        Leases and runs tasks until max_tasks have run or the queue has had
+        nothing runnable for idle_timeout seconds (forever if both are None)
+        :return: number of tasks run
+        """
+        ran = 0
+        idle_since = time.monotonic()
+        while max_tasks is None or ran < max_tasks:
+            task = self.queue.lease(self.worker_id, self.lease_seconds)
+            if task is None:
+                if (
+                    idle_timeout is not None
+                    and time.monotonic() - idle_since >= idle_timeout
+                ):
+                    break
+                time.sleep(poll_interval)
+                continue
+            self.run_task(task)
+            ran += 1
+            idle_since = time.monotonic()
+        return ran
+
+
+def _worker_process(queue_url: str, worker_kwargs: dict, run_kwargs: dict):
+    queue = open_queue(queue_url)
+    try:
+        Worker(queue, **worker_kwargs).run(**run_kwargs)
+    finally:
+        queue.close()
+
+
+def run_worker_processes(
+    queue_url: str = "jobs_queue.db",
+    processes: int = 4,
+    max_tasks: int | None = None,
+    idle_timeout: float | None = 30.0,
+    **worker_kwargs,
+) -> None:
+    """
+    Runs Workers in separate processes, each with its own queue connection,
+    and waits for them to exit
+    :param queue_url: open_queue URL shared with the coordinator
+    :param processes: number of worker processes
+    :param max_tasks: tasks each process runs before exiting
+    :param idle_timeout: seconds without a runnable task before a process exits
+    :param worker_kwargs: further Worker arguments (proxies, ca_cert, ...)
+    """
+    run_kwargs = {"max_tasks": max_tasks, "idle_timeout": idle_timeout}
+    workers = [
+        multiprocessing.Process(
+            target=_worker_process,
+            args=(queue_url, worker_kwargs, run_kwargs),
+            name=f"jobspy-worker-{i}",
+        )
+        for i in range(processes)
+    ]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join()
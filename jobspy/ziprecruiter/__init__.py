@@ -1,29 +1,28 @@
 from __future__ import annotations
 
-import json
+import itertools
 import math
 import re
-import time
-from concurrent.futures import ThreadPoolExecutor
-from datetime import datetime
+from datetime import datetime, timezone
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 
+from jobspy.content_cache import NO_DESCRIPTION, DerivedFields, derive_description
 from jobspy.ziprecruiter.constant import headers, get_cookie_data
 from jobspy.util import (
-    extract_emails_from_text,
     create_session,
-    markdown_converter,
     remove_attributes,
     create_logger,
+    json_loads,
+    ConcurrentSet,
 )
 from jobspy.model import (
+    DESCRIPTION_FIELDS,
     JobPost,
     Compensation,
     Location,
     JobResponse,
     Country,
-    DescriptionFormat,
     Scraper,
     ScraperInput,
     Site,
@@ -46,13 +45,15 @@ class ZipRecruiter(Scraper):
         super().__init__(Site.ZIP_RECRUITER, proxies=proxies)
 
         self.scraper_input = None
-        self.session = create_session(proxies=proxies, ca_cert=ca_cert)
+        self.session = create_session(
+            proxies=proxies, ca_cert=ca_cert, stats=self.stats
+        )
         self.session.headers.update(headers)
         self._get_cookies()
 
         self.delay = 5
         self.jobs_per_page = 20
-        self.seen_urls = set()
+        self.seen_urls = ConcurrentSet()
 
     def scrape(self, scraper_input: ScraperInput) -> JobResponse:
         """
@@ -61,42 +62,79 @@ class ZipRecruiter(Scraper):
         :return: JobResponse containing a list of jobs.
         """
         self.scraper_input = scraper_input
-        job_list: list[JobPost] = []
-        continue_token = None
+        self.seen_urls = ConcurrentSet()
+        # ZipRecruiter has no offset; an interrupted run resumes from its token
+        resume = self.crawl_start()
+        job_list, continue_token = resume.jobs, resume.cursor
+        for job in job_list:
+            self.seen_urls.add(job.job_url)
+        position = resume.position
 
+        # pages the listings alone would fill; filters may need more, so paging
+        # goes on until results_wanted jobs are kept or the results run out
         max_pages = math.ceil(scraper_input.results_wanted / self.jobs_per_page)
-        for page in range(1, max_pages + 1):
-            if len(job_list) >= scraper_input.results_wanted:
+        first_page = 1 + position // self.jobs_per_page
+        # the next page, requested (after the usual delay) as soon as this page's
+        # token is known, so the wait and download overlap its detail requests
+        next_page = None
+        for page in itertools.count(first_page):
+            if len(job_list) >= scraper_input.results_wanted or resume.exhausted:
+                break
+            if self.should_stop():
+                log.warning(f"stopping early, returning after page {page - 1}")
                 break
-            if page > 1:
-                time.sleep(self.delay)
             log.info(f"search page: {page} / {max_pages}")
-            jobs_on_page, continue_token = self._find_jobs_in_page(
-                scraper_input, continue_token
+            delay = self.delay if page > first_page else 0
+            jobs_raw, continue_token = (
+                next_page.result()
+                if next_page
+                else self._fetch_jobs_page(continue_token, delay)
             )
-            if jobs_on_page:
-                job_list.extend(jobs_on_page)
-            else:
+            next_page = None
+            if (
+                continue_token
+                and len(job_list) + len(jobs_raw) < scraper_input.results_wanted
+            ):
+                next_page = self.prefetch(
+                    self._fetch_jobs_page, continue_token, self.delay
+                )
+            if not jobs_raw:
                 break
+            seen_before = len(self.seen_urls)
+            jobs_on_page = self._process_jobs_page(jobs_raw)
+            position += len(self.seen_urls) - seen_before
+            job_list.extend(jobs_on_page)
+            self.checkpoint_page(position, continue_token or None, jobs_on_page)
             if not continue_token:
                 break
+            if self.stopped_early:
+                log.info(f"reached known or old postings on page {page}")
+                break
+        if next_page is not None:
+            next_page.cancel()
         return JobResponse(jobs=job_list[: scraper_input.results_wanted])
 
-    def _find_jobs_in_page(
-        self, scraper_input: ScraperInput, continue_token: str | None = None
-    ) -> tuple[list[JobPost], str | None]:
+    def _fetch_jobs_page(
+        self, continue_token: str | None = None, delay: float = 0
+    ) -> tuple[list[dict], str | None]:
         """
-        Scrapes a page of ZipRecruiter for jobs with scraper_input criteria
-        :param scraper_input:
+        Fetches a page of ZipRecruiter search results with scraper_input criteria
         :param continue_token:
-        :return: jobs found on page
+        :param delay: seconds to wait first, spacing out search requests
+        :return: raw jobs on page, next page token
         """
+        if delay:
+            self.sleep(delay)
         jobs_list = []
-        params = add_params(scraper_input)
+        params = add_params(self.scraper_input)
         if continue_token:
             params["continue_from"] = continue_token
         try:
-            res = self.session.get(f"{self.api_url}/jobs-app/jobs", params=params)
+            res = self.session.get(
+                f"{self.api_url}/jobs-app/jobs",
+                params=params,
+                timeout_seconds=math.ceil(self.request_timeout(30)),
+            )
             if res.status_code not in range(200, 400):
                 if res.status_code == 429:
                     err = "429 Response - Blocked by ZipRecruiter for too many requests"
@@ -112,14 +150,32 @@ class ZipRecruiter(Scraper):
                 log.error(f"Indeed: {str(e)}")
             return jobs_list, ""
 
-        res_data = res.json()
-        jobs_list = res_data.get("jobs", [])
-        next_continue_token = res_data.get("continue", None)
-        with ThreadPoolExecutor(max_workers=self.jobs_per_page) as executor:
-            job_results = [executor.submit(self._process_job, job) for job in jobs_list]
+        self.stats.page_fetched()
+        with self.stats.phase("decode"):
+            res_data = json_loads(res.content)
+        return res_data.get("jobs", []), res_data.get("continue", None)
 
-        job_list = list(filter(None, (result.result() for result in job_results)))
-        return job_list, next_continue_token
+    def _process_jobs_page(self, jobs_list: list[dict]) -> list[JobPost]:
+        """
+        Processes a page of raw jobs, fetching their descriptions concurrently
+        """
+        job_results = [self.submit(self._process_job_timed, job) for job in jobs_list]
+        done = set(self.completed_before_deadline(job_results))
+
+        job_list = [
+            result.result()
+            for result in job_results
+            if result in done and result.result()
+        ]
+        self.stats.jobs_parsed(len(job_list))
+        self.observe_listings(
+            (f'zr-{job["listing_key"]}', self._posted_time(job)) for job in jobs_list
+        )
+        return job_list
+
+    def _process_job_timed(self, job: dict) -> JobPost | None:
+        with self.stats.phase("parse"):
+            return self._process_job(job)
 
     def _process_job(self, job: dict) -> JobPost | None:
         """
@@ -127,17 +183,10 @@ class ZipRecruiter(Scraper):
         """
         title = job.get("name")
         job_url = f"{self.base_url}/jobs//j?lvk={job['listing_key']}"
-        if job_url in self.seen_urls:
+        if not self.seen_urls.add(job_url):
             return
-        self.seen_urls.add(job_url)
 
-        description = job.get("job_description", "").strip()
         listing_type = job.get("buyer_type", "")
-        description = (
-            markdown_converter(description)
-            if self.scraper_input.description_format == DescriptionFormat.MARKDOWN
-            else description
-        )
         company = job.get("hiring_company", {}).get("name")
         country_value = "usa" if job.get("job_country") == "US" else "canada"
         country_enum = Country.from_string(country_value)
@@ -154,7 +203,43 @@ class ZipRecruiter(Scraper):
         comp_min = int(job["compensation_min"]) if "compensation_min" in job else None
         comp_max = int(job["compensation_max"]) if "compensation_max" in job else None
         comp_currency = job.get("compensation_currency")
-        description_full, job_url_direct = self._get_descr(job_url)
+        compensation = Compensation(
+            interval=comp_interval,
+            min_amount=comp_min,
+            max_amount=comp_max,
+            currency=comp_currency,
+        )
+        if not self.keep_listing(
+            self._posted_time(job),
+            id=f'zr-{job["listing_key"]}',
+            title=title,
+            company=company,
+            location=location,
+            compensation=compensation,
+        ):
+            return None
+
+        derived = derived_full = NO_DESCRIPTION
+        job_url_direct = None
+        if self.wants(*DESCRIPTION_FIELDS):
+            derived = derive_description(
+                job.get("job_description", "").strip(),
+                self.scraper_input.description_format,
+                self.stats,
+                self.content_cache,
+            )
+        # the job page has the full description and the direct url
+        if self.wants(*DESCRIPTION_FIELDS, "job_url_direct") and not self.should_stop():
+            with self.claim_detail(title, company, location) as claim:
+                if claim.shared:
+                    derived_full = claim.shared.derived
+                    job_url_direct = claim.shared.job_url_direct
+                else:
+                    derived_full, job_url_direct = self._get_descr(
+                        job_url, self.wants(*DESCRIPTION_FIELDS)
+                    )
+                    claim.publish(derived_full, job_url_direct)
+        final = derived_full if derived_full.description else derived
 
         return JobPost(
             id=f'zr-{job["listing_key"]}',
@@ -162,55 +247,88 @@ class ZipRecruiter(Scraper):
             company_name=company,
             location=location,
             job_type=job_type,
-            compensation=Compensation(
-                interval=comp_interval,
-                min_amount=comp_min,
-                max_amount=comp_max,
-                currency=comp_currency,
-            ),
+            compensation=compensation,
             date_posted=date_posted,
             job_url=job_url,
-            description=description_full if description_full else description,
-            emails=extract_emails_from_text(description) if description else None,
+            description=self.store_description(final.description),
+            emails=derived.emails,
             job_url_direct=job_url_direct,
             listing_type=listing_type,
+            description_hash=final.description_hash,
+            unchanged=final.unchanged,
         )
 
-    def _get_descr(self, job_url):
-        res = self.session.get(job_url, allow_redirects=True)
-        description_full = job_url_direct = None
-        if res.ok:
-            soup = BeautifulSoup(res.text, "html.parser")
-            job_descr_div = soup.find("div", class_="job_description")
-            company_descr_section = soup.find("section", class_="company_description")
-            job_description_clean = (
-                remove_attributes(job_descr_div).prettify(formatter="html")
-                if job_descr_div
-                else ""
-            )
-            company_description_clean = (
-                remove_attributes(company_descr_section).prettify(formatter="html")
-                if company_descr_section
-                else ""
-            )
-            description_full = job_description_clean + company_description_clean
-
-            try:
-                script_tag = soup.find("script", type="application/json")
-                if script_tag:
-                    job_json = json.loads(script_tag.string)
-                    job_url_val = job_json["model"].get("saveJobURL", "")
-                    m = re.search(r"job_url=(.+)", job_url_val)
-                    if m:
-                        job_url_direct = m.group(1)
-            except:
-                job_url_direct = None
-
-            if self.scraper_input.description_format == DescriptionFormat.MARKDOWN:
-                description_full = markdown_converter(description_full)
+    @staticmethod
+    def _posted_time(job: dict) -> datetime | None:
+        """posted_time (UTC) as a naive local datetime"""
+        if not job.get("posted_time"):
+            return None
+        posted = datetime.fromisoformat(job["posted_time"].rstrip("Z"))
+        return posted.replace(tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
 
+    def _get_descr(
+        self, job_url, with_description: bool = True
+    ) -> tuple[DerivedFields, str | None]:
+        """
+        Fetches a job page for its full description and direct url
+        :param with_description: False to read only the direct url, skipping
+            the description's parsing and conversion
+        """
+        self.stats.incr("detail_fetches")
+        res = self.hedged(
+            self.session.get,
+            job_url,
+            allow_redirects=True,
+            timeout_seconds=math.ceil(self.request_timeout(30)),
+        )
+        description_full, job_url_direct = NO_DESCRIPTION, None
+        if not res.ok:
+            return description_full, job_url_direct
+        if not with_description:
+            # the direct url is in the page's JSON script; nothing else is parsed
+            only_json = SoupStrainer("script", type="application/json")
+            soup = BeautifulSoup(res.text, "html.parser", parse_only=only_json)
+            return description_full, self._job_url_direct(soup)
+
+        soup = BeautifulSoup(res.text, "html.parser")
+        job_descr_div = soup.find("div", class_="job_description")
+        company_descr_section = soup.find("section", class_="company_description")
+        job_description_clean = (
+            remove_attributes(job_descr_div).prettify(formatter="html")
+            if job_descr_div
+            else ""
+        )
+        company_description_clean = (
+            remove_attributes(company_descr_section).prettify(formatter="html")
+            if company_descr_section
+            else ""
+        )
+        raw_description = job_description_clean + company_description_clean
+        job_url_direct = self._job_url_direct(soup)
+
+        description_full = derive_description(
+            raw_description,
+            self.scraper_input.description_format,
+            self.stats,
+            self.content_cache,
+        )
         return description_full, job_url_direct
 
+    @staticmethod
+    def _job_url_direct(soup: BeautifulSoup) -> str | None:
+        try:
+            script_tag = soup.find("script", type="application/json")
+            if script_tag:
+                # orjson only takes exact str, not bs4's NavigableString
+                job_json = json_loads(str(script_tag.string))
+                job_url_val = job_json["model"].get("saveJobURL", "")
+                m = re.search(r"job_url=(.+)", job_url_val)
+                if m:
+                    return m.group(1)
+        except:
+            pass
+        return None
+
     def _get_cookies(self):
         """
         Sends a session event to the API with device properties.
@@ -0,0 +1,36 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from jobspy import scrape_jobs
+from jobspy.glassdoor.constant import headers as glassdoor_headers
+
+# Stress test: many scrape_jobs calls running in parallel in one interpreter
+NUM_CALLS = 24
+SEARCHES = ["software engineer", "data engineer", "product manager", "nurse"]
+
+
+def search(i):
+    return scrape_jobs(
+        site_name=["indeed", "glassdoor", "zip_recruiter", "google"],
+        search_term=SEARCHES[i % len(SEARCHES)],
+        google_search_term=f"{SEARCHES[i % len(SEARCHES)]} jobs near New York, NY",
+        location="New York, NY",
+        results_wanted=5,
+        hours_old=72,
+        country_indeed="USA",
+        verbose=0,
+    )
+
+
+with ThreadPoolExecutor(max_workers=NUM_CALLS) as executor:
+    results = list(executor.map(search, range(NUM_CALLS)))
+
+for i, jobs in enumerate(results):
+    assert not jobs.empty, f"call {i} returned no jobs"
+    assert jobs["id"].is_unique, f"call {i} returned duplicate jobs"
+    for site, count in jobs["site"].value_counts().items():
+        assert count <= 5, f"call {i} returned {count} {site} jobs (wanted 5)"
+
+# per-call state must not leak into module-level constants
+assert "gd-csrf-token" not in glassdoor_headers
+
+print(f"{NUM_CALLS} concurrent calls returned {sum(map(len, results))} jobs")
@@ -0,0 +1,104 @@
+import pytest
+
+import jobspy
+from jobspy.checkpoint import CheckpointStore
+from jobspy.model import JobPost, JobResponse, Scraper, ScraperInput, Site
+
+
+def job(n: int) -> JobPost:
+    return JobPost(
+        id=f"in-{n}",
+        title="Engineer",
+        company_name="Acme",
+        job_url=f"https://example.com/{n}",
+        location=None,
+    )
+
+
+def search(**fields) -> ScraperInput:
+    return ScraperInput(site_type=[Site.INDEED], search_term="python", **fields)
+
+
+def test_unfinished_run_resumes_with_its_jobs_and_cursor():
+    with CheckpointStore(":memory:") as store:
+        crawl = store.crawl("indeed", search())
+        assert not crawl.start().resumed
+        crawl.save_page(2, {"page": 2}, [job(0).model_dump_json()])
+        crawl.save_page(4, {"page": 3}, [job(1).model_dump_json()])
+
+        resume = store.crawl("indeed", search()).start()
+        assert resume.resumed
+        assert (resume.base, resume.position, resume.cursor) == (0, 4, {"page": 3})
+        assert [JobPost.model_validate_json(j).id for j in resume.jobs] == [
+            "in-0",
+            "in-1",
+        ]
+
+
+def test_finished_run_keeps_its_cursors_for_offsets():
+    with CheckpointStore(":memory:") as store:
+        crawl = store.crawl("indeed", search())
+        crawl.start()
+        crawl.save_page(10, "after-10", [])
+        crawl.save_page(20, "after-20", [])
+        crawl.finish()
+        assert not store.crawl("indeed", search()).start().resumed
+
+        deep = store.crawl("indeed", search(offset=25))
+        resume = deep.start(25)
+        assert (resume.base, resume.cursor, resume.jobs) == (20, "after-20", [])
+        # a different search shares nothing
+        other = store.crawl("indeed", search(location="Berlin")).start(25)
+        assert other.cursor is None
+
+
+def test_expired_run_starts_over():
+    with CheckpointStore(":memory:", max_age=-1) as store:
+        crawl = store.crawl("indeed", search())
+        crawl.save_page(2, "next", [job(0).model_dump_json()])
+        assert not store.crawl("indeed", search()).start().resumed
+
+
+class PagedScraper(Scraper):
+    """Pages of two jobs behind an integer cursor; fails once at fail_at"""
+
+    fetched: list[int] = []
+    fail_at: int | None = None
+
+    def __init__(self, proxies=None, ca_cert=None):
+        super().__init__(Site.INDEED, proxies=proxies, ca_cert=ca_cert)
+
+    def scrape(self, scraper_input):
+        self.scraper_input = scraper_input
+        resume = self.crawl_start()
+        job_list = resume.jobs
+        cursor = resume.cursor if resume.resumed else 0
+        while len(job_list) < scraper_input.results_wanted and cursor is not None:
+            if cursor == PagedScraper.fail_at:
+                PagedScraper.fail_at = None
+                raise RuntimeError("connection reset")
+            PagedScraper.fetched.append(cursor)
+            jobs = [job(cursor * 2), job(cursor * 2 + 1)]
+            job_list += jobs
+            cursor = cursor + 1 if cursor < 4 else None
+            self.checkpoint_page(len(job_list), cursor, jobs)
+        return JobResponse(jobs=job_list[: scraper_input.results_wanted])
+
+
+def test_interrupted_scrape_resumes_from_the_checkpoint(monkeypatch, tmp_path):
+    monkeypatch.setattr(jobspy, "get_scraper_class", lambda site: PagedScraper)
+    monkeypatch.setattr(PagedScraper, "fetched", [])
+    monkeypatch.setattr(PagedScraper, "fail_at", 2)
+    kwargs = dict(site_name="indeed", search_term="python", results_wanted=6)
+    with CheckpointStore(str(tmp_path / "jobs.db")) as store:
+        with pytest.raises(RuntimeError):
+            jobspy.scrape_jobs(checkpoint=store, **kwargs)
+        assert PagedScraper.fetched == [0, 1]
+
+        jobs = jobspy.scrape_jobs(checkpoint=store, **kwargs)
+        assert PagedScraper.fetched == [0, 1, 2]
+        assert sorted(jobs["id"]) == [f"in-{n}" for n in range(6)]
+
+        # the completed run was dropped, so the same call starts over
+        jobspy.scrape_jobs(checkpoint=store, **kwargs)
+        assert PagedScraper.fetched == [0, 1, 2, 0, 1, 2]
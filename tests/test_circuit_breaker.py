@@ -0,0 +1,64 @@
+import time
+
+from jobspy.circuit_breaker import BreakerState, CircuitBreaker
+from jobspy.telemetry import ScrapeStats
+from jobspy.util import create_session
+
+
+def test_trip_statuses_open_after_threshold():
+    breaker = CircuitBreaker("linkedin", trip_threshold=3)
+    for _ in range(2):
+        breaker.on_request("linkedin", 429, 0, 0.1)
+        # a success in between doesn't clear the 429s seen
+        breaker.on_request("linkedin", 200, 0, 0.1)
+    assert breaker.state == BreakerState.CLOSED
+    breaker.on_request("linkedin", 429, 0, 0.1)
+    assert breaker.is_open
+    assert breaker.admit() is None
+
+
+def test_trip_statuses_outside_window_expire():
+    breaker = CircuitBreaker("linkedin", trip_threshold=2, trip_window=0.01)
+    breaker.on_request("linkedin", 429, 0, 0.1)
+    time.sleep(0.02)
+    breaker.on_request("linkedin", 429, 0, 0.1)
+    assert breaker.state == BreakerState.CLOSED
+
+
+def test_failures_open_after_threshold():
+    breaker = CircuitBreaker("indeed", failure_threshold=3)
+    for _ in range(2):
+        breaker.on_request("indeed", 503, 0, 0.1)
+    breaker.on_request("indeed", None, 0, 0.1)
+    assert breaker.is_open
+
+
+def test_success_resets_failures():
+    breaker = CircuitBreaker("indeed", failure_threshold=2)
+    breaker.on_request("indeed", 503, 0, 0.1)
+    breaker.on_request("indeed", 200, 0, 0.1)
+    breaker.on_request("indeed", 503, 0, 0.1)
+    assert breaker.state == BreakerState.CLOSED
+
+
+def test_half_open_probe():
+    breaker = CircuitBreaker("indeed", cooldown=0.01, trip_threshold=1)
+    breaker.on_request("indeed", 429, 0, 0.1)
+    time.sleep(0.02)
+    assert breaker.admit() == BreakerState.HALF_OPEN
+    # only one probe at a time
+    assert breaker.admit() is None
+    breaker.on_request("indeed", 200, 0, 0.1)
+    assert breaker.state == BreakerState.CLOSED
+
+
+def test_retried_429_trips_breaker(http_server):
+    http_server.status = 429
+    breaker = CircuitBreaker("linkedin", trip_threshold=2)
+    stats = ScrapeStats("linkedin", hooks=[breaker])
+    session = create_session(is_tls=False, has_retry=True, delay=0, stats=stats)
+    response = session.get(http_server.url, timeout=5)
+    assert response.status_code == 429
+    assert not breaker.is_open
+    session.get(http_server.url, timeout=5)
+    assert breaker.is_open
@@ -0,0 +1,90 @@
+import threading
+import time
+
+import pytest
+
+import jobspy
+from jobspy.content_cache import DerivedFieldCache
+from jobspy.model import JobPost, JobResponse, Scraper, Site
+
+release = threading.Event()
+
+
+def job(site: str, n: int) -> JobPost:
+    return JobPost(
+        id=f"{site}-{n}",
+        title="Engineer",
+        company_name="Acme",
+        job_url=f"https://example.com/{site}/{n}",
+        location=None,
+    )
+
+
+class FastScraper(Scraper):
+    def __init__(self, proxies=None, ca_cert=None):
+        super().__init__(Site.INDEED, proxies=proxies, ca_cert=ca_cert)
+
+    def scrape(self, scraper_input):
+        self.scraper_input = scraper_input
+        return JobResponse(jobs=[job("fast", n) for n in range(3)])
+
+
+class SlowScraper(Scraper):
+    """Collects one page, hangs past the deadline, then writes to its cache"""
+
+    errors: list[Exception] = []
+
+    def __init__(self, proxies=None, ca_cert=None):
+        super().__init__(Site.ZIP_RECRUITER, proxies=proxies, ca_cert=ca_cert)
+
+    def scrape(self, scraper_input):
+        self.scraper_input = scraper_input
+        self.crawl_start()
+        self.checkpoint_page(2, "cursor", [job("slow", 0), job("slow", 1)])
+        release.wait(10)
+        if self.content_cache is not None:
+            try:
+                self.content_cache.put("late", description="written late")
+                self.content_cache.flush()
+            except Exception as e:
+                SlowScraper.errors.append(e)
+        return JobResponse(jobs=[])
+
+
+@pytest.fixture
+def scrapers(monkeypatch):
+    classes = {Site.INDEED: FastScraper, Site.ZIP_RECRUITER: SlowScraper}
+    monkeypatch.setattr(jobspy, "get_scraper_class", classes.__getitem__)
+    release.clear()
+    yield
+    release.set()
+
+
+def test_late_site_returns_collected_jobs(scrapers):
+    jobs, stats = jobspy.scrape_jobs(
+        site_name=["indeed", "zip_recruiter"],
+        results_wanted=5,
+        deadline=0.2,
+        return_stats=True,
+    )
+    assert sorted(jobs["id"]) == ["fast-0", "fast-1", "fast-2", "slow-0", "slow-1"]
+    assert stats["indeed"]["complete"]
+    assert not stats["zip_recruiter"]["complete"]
+    assert jobs.attrs["site_complete"]["zip_recruiter"] is False
+
+
+def test_owned_stores_close_after_late_sites(scrapers, tmp_path):
+    path = str(tmp_path / "jobs.db")
+    SlowScraper.errors = []
+    jobspy.scrape_jobs(
+        site_name=["indeed", "zip_recruiter"], deadline=0.2, content_cache=path
+    )
+    release.set()
+    for _ in range(100):
+        with DerivedFieldCache(path) as cache:
+            if cache.get("late") is not None:
+                break
+        time.sleep(0.05)
+    assert SlowScraper.errors == []
+    with DerivedFieldCache(path) as cache:
+        assert cache.get("late")["description"] == "written late"
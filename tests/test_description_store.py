@@ -0,0 +1,93 @@
+import sqlite3
+
+import jobspy
+from jobspy.description_store import DescriptionRef, DescriptionStore
+from jobspy.model import JobPost, JobResponse, Scraper, Site
+
+TEXT = "Build **things**. Contact jobs@example.com"
+
+
+def test_equal_texts_share_one_ref():
+    store = DescriptionStore()
+    first, second = store.add(TEXT), store.add(TEXT)
+    other = store.add("Something else")
+    assert first is second
+    assert first != other
+    assert len({first, second, other}) == 2
+    assert len(store) == 2
+    assert str(first) == TEXT
+
+
+def test_ref_is_not_equal_to_its_text():
+    # equality and hashing both go by the content key
+    ref = DescriptionStore().add(TEXT)
+    assert ref != TEXT
+    assert str(ref) == TEXT
+    assert hash(ref) == hash(ref.key)
+
+
+def test_refs_of_different_stores_compare_by_key():
+    first, second = DescriptionStore().add(TEXT), DescriptionStore().add(TEXT)
+    assert first == second
+    assert hash(first) == hash(second)
+
+
+def test_spilled_blobs_decode(tmp_path):
+    with DescriptionStore(str(tmp_path / "spill.bin"), memory_limit=0) as store:
+        refs = [store.add(f"{TEXT} {n}") for n in range(5)]
+        assert store.memory_bytes == 0 and store.spilled_bytes > 0
+        assert [str(ref) for ref in refs] == [f"{TEXT} {n}" for n in range(5)]
+
+
+def test_job_post_holds_ref_and_serializes_text():
+    ref = DescriptionStore().add(TEXT)
+    job = JobPost(
+        title="Engineer",
+        company_name="Acme",
+        job_url="https://example.com/1",
+        location=None,
+        description=ref,
+    )
+    assert isinstance(job.description, DescriptionRef)
+    assert job.model_dump()["description"] is ref
+    assert JobPost.model_validate_json(job.model_dump_json()).description == TEXT
+
+
+def test_sqlite_stores_the_text():
+    ref = DescriptionStore().add(TEXT)
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE jobs (description TEXT)")
+    conn.execute("INSERT INTO jobs VALUES (?)", (ref,))
+    assert conn.execute("SELECT description FROM jobs").fetchone() == (TEXT,)
+
+
+class StoringScraper(Scraper):
+    def __init__(self, proxies=None, ca_cert=None):
+        super().__init__(Site.INDEED, proxies=proxies, ca_cert=ca_cert)
+
+    def scrape(self, scraper_input):
+        self.scraper_input = scraper_input
+        jobs = [
+            JobPost(
+                id=f"in-{n}",
+                title="Engineer",
+                company_name="Acme",
+                job_url=f"https://example.com/{n}",
+                location=None,
+                description=self.store_description(TEXT),
+            )
+            for n in range(3)
+        ]
+        assert all(isinstance(job.description, DescriptionRef) for job in jobs)
+        return JobResponse(jobs=jobs)
+
+
+def test_scrape_jobs_stores_descriptions_as_jobs_are_built(monkeypatch):
+    monkeypatch.setattr(jobspy, "get_scraper_class", lambda site: StoringScraper)
+    store = DescriptionStore()
+    jobs = jobspy.scrape_jobs(
+        site_name="indeed", country_indeed="germany", description_store=store
+    )
+    assert len(store) == 1
+    assert len({id(ref) for ref in jobs["description"]}) == 1
+    assert store.decode(jobs["description"]) == [TEXT] * 3
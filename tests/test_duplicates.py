@@ -0,0 +1,58 @@
+import threading
+import time
+
+from jobspy.content_cache import NO_DESCRIPTION, DerivedFields
+from jobspy.duplicates import DuplicateIndex, posting_keys
+
+DERIVED = DerivedFields("hash", "Build things", None, None, False)
+KEYS = posting_keys("Python Engineer", "Acme, Inc.", "Austin")
+
+
+def test_posting_keys_normalize_text_and_url():
+    assert posting_keys("python engineer", "ACME Inc", "austin") == KEYS
+    (url_key,) = posting_keys(
+        None, None, None, "https://Acme.example/jobs/1/?utm_source=x"
+    )
+    assert posting_keys(None, None, None, "http://acme.example/jobs/1")[0] == url_key
+
+
+def test_second_claimant_gets_published_detail():
+    index = DuplicateIndex()
+    with index.claim("indeed", KEYS) as claim:
+        assert claim.shared is None
+        claim.publish(DERIVED, "https://acme.example/jobs/1")
+    other = index.claim("linkedin", KEYS)
+    assert other.shared.derived == DERIVED and other.shared.site == "indeed"
+    # the direct url published with the details is a key of its own
+    by_url = index.claim(
+        "glassdoor", posting_keys(None, None, None, "https://acme.example/jobs/1")
+    )
+    assert by_url.shared.derived == DERIVED
+
+
+def test_second_claimant_waits_for_fetch_in_flight():
+    index = DuplicateIndex()
+    first = index.claim("indeed", KEYS)
+    results = []
+    waiter = threading.Thread(
+        target=lambda: results.append(index.claim("linkedin", KEYS).shared)
+    )
+    waiter.start()
+    time.sleep(0.05)
+    assert results == []
+    first.publish(DERIVED)
+    waiter.join(timeout=5)
+    assert results[0].derived == DERIVED
+
+
+def test_failed_fetch_releases_waiters_to_fetch_themselves():
+    index = DuplicateIndex()
+    first = index.claim("indeed", KEYS)
+    claims = []
+    waiter = threading.Thread(
+        target=lambda: claims.append(index.claim("linkedin", KEYS))
+    )
+    waiter.start()
+    first.publish(NO_DESCRIPTION)
+    waiter.join(timeout=5)
+    assert claims[0].shared is None and claims[0].owned == KEYS
@@ -0,0 +1,27 @@
+from datetime import date, datetime
+
+from jobspy.early_stop import EarlyStop
+
+CUTOFF = datetime(2026, 1, 10, 12)
+
+
+def test_stops_after_consecutive_known_listings():
+    early_stop = EarlyStop(known_ids={"li-1", "li-2", "li-3"}, consecutive=3)
+    assert not early_stop.observe([("li-0", None), ("li-1", None), ("li-2", None)])
+    # a new listing in between restarts the run
+    assert not early_stop.observe([("li-9", None), ("li-1", None)])
+    assert early_stop.observe([("li-2", None), ("li-3", None)])
+    assert early_stop.stale_seen == 5
+
+
+def test_stops_after_consecutive_old_listings():
+    early_stop = EarlyStop(posted_cutoff=CUTOFF, consecutive=2)
+    assert not early_stop.observe([("li-1", datetime(2026, 1, 10, 9))])
+    assert early_stop.observe([("li-2", datetime(2026, 1, 9))])
+    assert early_stop.triggered
+
+
+def test_date_only_listing_on_the_cutoff_day_is_not_old():
+    early_stop = EarlyStop(posted_cutoff=CUTOFF, consecutive=1)
+    assert not early_stop.observe([("li-1", date(2026, 1, 10)), ("li-2", None)])
+    assert early_stop.observe([("li-3", date(2026, 1, 9))])
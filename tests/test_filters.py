@@ -0,0 +1,115 @@
+import jobspy
+from jobspy.filters import ListingFilter
+from jobspy.model import (
+    Compensation,
+    CompensationInterval,
+    Country,
+    JobPost,
+    JobResponse,
+    Scraper,
+    Site,
+)
+from jobspy.results import scrape_fields
+
+CARDS = [
+    {"id": "in-1", "title": "Python Engineer", "company": "Acme"},
+    {"id": "in-2", "title": "Senior Python Engineer", "company": "Acme"},
+    {"id": "in-3", "title": "Python Engineer", "company": "Initech"},
+    {"id": "in-4", "title": "Java Engineer", "company": "Acme"},
+]
+
+
+def test_card_fields_the_card_lacks_pass():
+    listing_filter = ListingFilter(
+        title_include="python",
+        company_blocklist=["Initech"],
+        min_compensation=50000,
+        remote_only=True,
+    )
+    assert listing_filter({"title": "Python Engineer"})
+    assert listing_filter({})
+    assert not listing_filter({"title": "Java Engineer"})
+    assert not listing_filter({"company": " initech "})
+    assert not listing_filter({"is_remote": False})
+
+
+def test_compensation_compared_yearly():
+    listing_filter = ListingFilter(min_compensation=50000, max_compensation=90000)
+    hourly = Compensation(
+        interval=CompensationInterval.HOURLY, min_amount=20, max_amount=30
+    )
+    assert listing_filter({"compensation": hourly})  # 41,600 - 62,400 a year
+    hourly.min_amount, hourly.max_amount = 10, 20
+    assert not listing_filter({"compensation": hourly})
+    hourly.min_amount, hourly.max_amount = 50, 60
+    assert not listing_filter({"compensation": hourly})
+
+
+def test_remote_only_drops_rows_known_not_remote():
+    listing_filter = ListingFilter(remote_only=True)
+    assert listing_filter.keep_row({"title": "Engineer", "is_remote": True})
+    assert not listing_filter.keep_row({"title": "Engineer", "is_remote": False})
+    # LinkedIn, ZipRecruiter and Bayt never set is_remote
+    assert listing_filter.keep_row({"title": "Engineer", "is_remote": None})
+
+
+def test_projection_keeps_the_columns_filters_read():
+    listing_filter = ListingFilter(title_exclude="senior", remote_only=True)
+    assert listing_filter.columns == {"title", "is_remote"}
+    assert scrape_fields(["job_url"], Country.UK, listing_filter) == [
+        "is_remote",
+        "job_url",
+        "title",
+    ]
+    salary_filter = ListingFilter(min_compensation=50000)
+    assert "description" in scrape_fields(["job_url"], Country.USA, salary_filter)
+    assert scrape_fields(None, Country.USA, salary_filter) is None
+
+
+class CardScraper(Scraper):
+    """Lists CARDS, remote ones unless is_remote is left out (like Google)"""
+
+    def __init__(self, proxies=None, ca_cert=None):
+        super().__init__(Site.INDEED, proxies=proxies, ca_cert=ca_cert)
+
+    def scrape(self, scraper_input):
+        self.scraper_input = scraper_input
+        jobs = []
+        for card in CARDS:
+            if not self.keep_listing(None, **card):
+                continue
+            jobs.append(
+                JobPost(
+                    id=card["id"],
+                    title=card["title"],
+                    company_name=card["company"],
+                    job_url=f"https://example.com/{card['id']}",
+                    location=None,
+                    is_remote=self.wants("is_remote"),
+                )
+            )
+        return JobResponse(jobs=jobs)
+
+
+def scrape(monkeypatch, **kwargs):
+    monkeypatch.setattr(jobspy, "get_scraper_class", lambda site: CardScraper)
+    return jobspy.scrape_jobs(site_name="indeed", country_indeed="uk", **kwargs)
+
+
+def test_filters_and_pre_detail_filter_both_apply(monkeypatch):
+    jobs = scrape(
+        monkeypatch,
+        filters={"title_exclude": "senior", "company_blocklist": ["initech"]},
+        pre_detail_filter=lambda card: "java" not in card["title"].lower(),
+    )
+    assert list(jobs["id"]) == ["in-1"]
+
+
+def test_remote_only_filter_under_a_projection(monkeypatch):
+    jobs = scrape(
+        monkeypatch,
+        fields=["id", "title"],
+        filters=ListingFilter(title_include="python", remote_only=True),
+    )
+    assert list(jobs.columns) == ["id", "title"]
+    assert sorted(jobs["id"]) == ["in-1", "in-2", "in-3"]
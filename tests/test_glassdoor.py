@@ -0,0 +1,92 @@
+from concurrent.futures import wait
+from types import SimpleNamespace
+
+import pytest
+
+import jobspy.glassdoor as glassdoor
+from jobspy.model import ScraperInput, Site
+
+
+def listing(listing_id: int) -> dict:
+    return {
+        "jobview": {
+            "job": {"listingId": listing_id, "jobTitleText": f"Engineer {listing_id}"},
+            "header": {
+                "employerNameFromSearch": "Acme",
+                "employer": {"id": 1},
+                "locationName": "Austin, TX",
+                "ageInDays": 1,
+            },
+        }
+    }
+
+
+@pytest.fixture
+def scraper(monkeypatch):
+    monkeypatch.setattr(
+        glassdoor, "create_session", lambda **kwargs: SimpleNamespace(headers={})
+    )
+    scraper = glassdoor.Glassdoor()
+    monkeypatch.setattr(scraper, "_get_csrf_token", lambda: "token")
+    monkeypatch.setattr(scraper, "_get_location", lambda *args: (1, "CITY"))
+    scraper.pages_requested = []
+
+    def fetch_listings(location_id, location_type, page_num, cursor):
+        scraper.pages_requested.append(page_num)
+        first = page_num * 100
+        return [listing(first + i) for i in range(30)], f"cursor-{page_num + 1}"
+
+    monkeypatch.setattr(scraper, "_fetch_listings", fetch_listings)
+    return scraper
+
+
+@pytest.mark.parametrize("results_wanted", [10, 45])
+def test_scrape_pages_with_prefetch(scraper, results_wanted):
+    futures = []
+    prefetch = scraper.prefetch
+
+    def tracked_prefetch(*args):
+        futures.append(prefetch(*args))
+        return futures[-1]
+
+    scraper.prefetch = tracked_prefetch
+    response = scraper.scrape(
+        ScraperInput(
+            site_type=[Site.GLASSDOOR],
+            results_wanted=results_wanted,
+            fields=["title", "company", "job_url"],
+        )
+    )
+    assert len(response.jobs) == results_wanted
+    assert len({job.id for job in response.jobs}) == results_wanted
+    # no prefetched page is left pending
+    assert not wait(futures, timeout=5).not_done
+
+
+def test_offset_shard_starts_at_offset(scraper):
+    response = scraper.scrape(
+        ScraperInput(
+            site_type=[Site.GLASSDOOR],
+            offset=200,
+            results_wanted=100,
+            fields=["title", "company", "job_url"],
+        )
+    )
+    # page 7 holds listings 180-209; the 20 before the offset are dropped
+    assert scraper.pages_requested == [7, 8, 9, 10]
+    ids = [job.id for job in response.jobs]
+    assert len(ids) == 100
+    assert ids[0] == "gd-720" and ids[-1] == "gd-1029"
+
+
+def test_description_request_goes_through_session(scraper):
+    posted = []
+
+    def post(url, **kwargs):
+        posted.append(url)
+        return SimpleNamespace(status_code=500, content=b"")
+
+    scraper.session = SimpleNamespace(post=post)
+    scraper.base_url = "https://www.glassdoor.com/"
+    scraper._fetch_job_description(1)
+    assert posted == ["https://www.glassdoor.com//graph"]
@@ -0,0 +1,53 @@
+import threading
+import time
+
+import pytest
+
+from jobspy.governor import ExecutionGovernor
+
+
+@pytest.fixture
+def governor():
+    governor = ExecutionGovernor(
+        max_workers=8, max_sites=2, per_site_limit=2, site_limits={"indeed": 1}
+    )
+    yield governor
+    governor.shutdown()
+
+
+def run_tasks(governor, site, count):
+    lock = threading.Lock()
+    running = {"now": 0, "peak": 0}
+
+    def task():
+        with lock:
+            running["now"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+        time.sleep(0.02)
+        with lock:
+            running["now"] -= 1
+
+    futures = [governor.submit(site, task) for _ in range(count)]
+    for future in futures:
+        future.result(timeout=5)
+    return running["peak"]
+
+
+def test_per_site_limit_caps_in_flight_tasks(governor):
+    assert run_tasks(governor, "linkedin", 6) == 2
+    assert run_tasks(governor, "indeed", 3) == 1
+    metrics = governor.metrics()
+    assert metrics["completed"] == 9
+    assert metrics["in_flight"] == 0 and metrics["queue_depth"] == 0
+
+
+def test_site_at_its_limit_does_not_block_other_sites(governor):
+    release = threading.Event()
+    blocked = [governor.submit("indeed", release.wait, 5)]
+    started = time.perf_counter()
+    other = governor.submit("linkedin", lambda: "done")
+    assert other.result(timeout=5) == "done"
+    assert time.perf_counter() - started < 1
+    assert governor.metrics()["site_in_flight"]["indeed"] == 1
+    release.set()
+    blocked[0].result(timeout=5)
@@ -0,0 +1,68 @@
+import itertools
+import threading
+import time
+
+import pytest
+
+import jobspy.hedging as hedging
+from jobspy.telemetry import ScrapeStats
+
+
+@pytest.fixture(autouse=True)
+def fresh_windows(monkeypatch):
+    monkeypatch.setattr(hedging, "_windows", {})
+
+
+def make_hedger(budget, samples=100, latency=0.01):
+    stats = ScrapeStats("indeed")
+    hedger = hedging.Hedger("indeed", stats, budget=budget)
+    for _ in range(samples):
+        hedger.window.add(latency)
+    return hedger
+
+
+def test_slow_request_is_hedged_after_p90():
+    hedger = make_hedger(budget=1.0)
+    calls = itertools.count()
+
+    def fetch():
+        # the original is slow, its duplicate is not
+        if next(calls) == 0:
+            time.sleep(0.5)
+            return "primary"
+        return "hedge"
+
+    started = time.perf_counter()
+    assert hedger.run(fetch) == "hedge"
+    assert time.perf_counter() - started < 0.4
+    counts = hedger.stats.as_dict()
+    assert counts["hedged_requests"] == 1 and counts["hedge_wins"] == 1
+
+
+def test_fast_request_is_not_hedged():
+    hedger = make_hedger(budget=1.0, latency=1.0)
+    assert hedger.run(lambda: "primary") == "primary"
+    assert hedger.stats.as_dict()["hedged_requests"] == 0
+
+
+def test_no_hedging_before_min_samples():
+    hedger = make_hedger(budget=1.0, samples=5)
+    assert hedger.run(time.sleep, 0.05) is None
+    assert hedger.stats.as_dict()["hedged_requests"] == 0
+
+
+def test_duplicates_stay_within_budget():
+    hedger = make_hedger(budget=0.5)
+    lock = threading.Lock()
+    attempts = []
+
+    def fetch():
+        with lock:
+            attempts.append(1)
+        time.sleep(0.05)
+
+    for _ in range(6):
+        hedger.run(fetch)
+    # the first call has no budget yet: 1 hedge > 0.5 * 1 call
+    assert hedger.stats.as_dict()["hedged_requests"] == 3
+    assert len(attempts) == 9
@@ -0,0 +1,21 @@
+import pkgutil
+import subprocess
+import sys
+
+import pytest
+
+import jobspy
+
+MODULES = sorted(
+    module.name for module in pkgutil.walk_packages(jobspy.__path__, prefix="jobspy.")
+)
+
+
+@pytest.mark.parametrize("module", ["jobspy", *MODULES])
+def test_imports_in_fresh_interpreter(module):
+    # a fresh interpreter per module, so import cycles that only show up
+    # for one entry point aren't masked by modules already loaded
+    result = subprocess.run(
+        [sys.executable, "-c", f"import {module}"], capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
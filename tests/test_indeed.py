@@ -0,0 +1,111 @@
+import time
+
+import pytest
+
+import jobspy.indeed as indeed
+from jobspy.company_cache import CompanyCache
+from jobspy.early_stop import EarlyStop
+from jobspy.model import ScraperInput, Site
+
+
+def result(key: int, employer: str, dossier: bool) -> dict:
+    employer_data = {"name": employer, "relativeCompanyPageUrl": f"/cmp/{employer}"}
+    if dossier:
+        employer_data["dossier"] = {
+            "employerDetails": {"industry": "Software", "addresses": ["Austin"]},
+            "links": {"corporateWebsite": f"https://{employer}.example"},
+            "images": {"squareLogoUrl": f"https://{employer}.example/logo.png"},
+        }
+    return {
+        "job": {
+            "key": f"k{key}",
+            "title": "Engineer",
+            "datePublished": time.time() * 1000,
+            "employer": employer_data,
+            "location": {
+                "city": "Austin",
+                "admin1Code": "TX",
+                "countryCode": "US",
+                "formatted": {"long": "Austin, TX"},
+            },
+            "compensation": {"baseSalary": None, "estimated": None},
+            "attributes": [],
+            "recruit": None,
+            "description": {"html": "<p>Build things</p>"},
+        }
+    }
+
+
+@pytest.fixture
+def scraper(monkeypatch, tmp_path):
+    monkeypatch.setattr(indeed, "create_session", lambda **kwargs: None)
+    scraper = indeed.Indeed()
+    scraper.company_cache = CompanyCache(str(tmp_path / "jobs.db"))
+    scraper.requests = []
+
+    def fetch_page(cursor, dossier=True):
+        page = int(cursor or 0)
+        scraper.requests.append((page, dossier))
+        # employers 0-18 repeat on every page; employer 19 + page is new
+        employers = [f"e{i}" for i in range(19)] + [f"new{page}"]
+        results = [
+            result(page * 100 + i, employer, dossier)
+            for i, employer in enumerate(employers)
+        ]
+        return results, str(page + 1) if page < 3 else None
+
+    monkeypatch.setattr(scraper, "_fetch_page", fetch_page)
+    yield scraper
+    if scraper.company_cache is not None:
+        scraper.company_cache.close()
+
+
+def scrape(scraper):
+    return scraper.scrape(ScraperInput(site_type=[Site.INDEED], results_wanted=80))
+
+
+def test_warm_cache_drops_dossiers_without_refetching(scraper):
+    jobs = scrape(scraper).jobs
+    # a page's share of cached employers decides the next page's query: page
+    # 0 finds none cached, page 1 finds 95%
+    assert scraper.requests == [(0, True), (1, True), (2, False), (3, False)]
+    by_company = {job.company_name: job for job in jobs}
+    assert by_company["e3"].company_industry == "Software"
+    assert by_company["new1"].company_industry == "Software"
+    assert by_company["new2"].company_industry is None
+    assert scraper.stats.as_dict()["companies_cached"] == 38
+
+
+def test_cold_cache_keeps_dossiers(scraper):
+    scraper.company_cache.close()
+    scraper.company_cache = None
+    scrape(scraper)
+    assert scraper.requests == [(0, True), (1, True), (2, True), (3, True)]
+
+
+def test_fully_filtered_page_does_not_end_pagination(scraper):
+    # every listing on page 0 is dropped before its details
+    scraper.pre_detail_filter = lambda card: int(card["id"][4:]) >= 100
+    jobs = scraper.scrape(ScraperInput(site_type=[Site.INDEED], results_wanted=10)).jobs
+    assert [page for page, _ in scraper.requests] == [0, 1]
+    assert len(jobs) == 10
+    assert all(int(job.id[4:]) >= 100 for job in jobs)
+
+
+def test_filtered_listings_do_not_count_toward_results_wanted(scraper):
+    # half of each page's listings are kept
+    scraper.pre_detail_filter = lambda card: int(card["id"][4:]) % 2 == 0
+    jobs = scraper.scrape(ScraperInput(site_type=[Site.INDEED], results_wanted=25)).jobs
+    assert [page for page, _ in scraper.requests] == [0, 1, 2]
+    assert len(jobs) == 25
+
+
+def test_known_listings_stop_pagination(scraper):
+    # every listing of page 1 is already stored
+    known = {f"in-k{100 + i}" for i in range(20)}
+    scraper.early_stop = EarlyStop(known_ids=known, consecutive=10)
+    jobs = scrape(scraper).jobs
+    # page 2 may already have been prefetched, but is not used
+    assert 3 not in [page for page, _ in scraper.requests]
+    assert len(jobs) == 40
+    assert scraper.stats.as_dict()["stale_listings"] == 10
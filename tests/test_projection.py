@@ -0,0 +1,46 @@
+import pytest
+
+from jobspy import scrape_jobs
+from jobspy.model import Country, JobPost, ScraperInput, Site
+from jobspy.results import job_to_row, rows_to_dataframe, scrape_fields
+from jobspy.indeed import Indeed
+
+
+def test_us_salary_columns_keep_descriptions():
+    fields = ["company", "job_url", "max_amount", "min_amount", "title"]
+    assert scrape_fields(fields, Country.USA) == sorted([*fields, "description"])
+    assert scrape_fields(fields, Country.UK) == fields
+    assert scrape_fields(["title"], Country.USA) == ["title"]
+    assert scrape_fields(None, Country.USA) is None
+
+
+def test_indeed_selects_description_for_us_salaries():
+    scraper = Indeed()
+    scraper.scraper_input = ScraperInput(
+        site_type=[Site.INDEED],
+        fields=scrape_fields(["title", "min_amount"], Country.USA),
+    )
+    assert scraper.wants("description")
+    scraper.scraper_input = ScraperInput(site_type=[Site.INDEED], fields=["title"])
+    assert not scraper.wants("description")
+
+
+def test_salary_from_description_survives_projection():
+    job = JobPost(
+        id="in-1",
+        title="Engineer",
+        company_name="Acme",
+        job_url="https://example.com/1",
+        location=None,
+        description="Pay: $120,000 - $150,000 per year",
+    )
+    row = job_to_row(job, "indeed", Country.USA)
+    frame = rows_to_dataframe([row], ["title", "min_amount", "max_amount"])
+    assert list(frame.columns) == ["title", "min_amount", "max_amount"]
+    assert frame.loc[0, "min_amount"] == 120000
+    assert frame.loc[0, "max_amount"] == 150000
+
+
+def test_unknown_fields_rejected():
+    with pytest.raises(ValueError, match="Invalid fields: salary"):
+        scrape_jobs(site_name="indeed", fields=["title", "salary"])
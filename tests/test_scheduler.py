@@ -0,0 +1,49 @@
+import pandas as pd
+import pytest
+
+import jobspy
+from jobspy.scheduler import SearchScheduler
+from jobspy.storage import JobWarehouse
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    polls = []
+
+    def scrape_jobs(site_name, search_term, location, return_stats, **kwargs):
+        polls.append(search_term)
+        jobs = pd.DataFrame(
+            {"id": ["in-1", "in-2"], "site": site_name, "title": "Engineer"}
+        )
+        return jobs, {site_name: {"requests": 2, "skipped": False}}
+
+    monkeypatch.setattr(jobspy, "scrape_jobs", scrape_jobs)
+    warehouse = JobWarehouse(":memory:")
+    with SearchScheduler(warehouse, min_interval=60, initial_interval=600) as sched:
+        sched.polls = polls
+        yield sched
+    warehouse.close()
+
+
+def test_schedule_lives_in_the_warehouse(scheduler):
+    key = scheduler.add("indeed", "python", "Berlin")
+    assert scheduler.add("indeed", "python", "Berlin") == key
+    (search,) = scheduler.searches()
+    assert (search["site"], search["search_term"]) == ("indeed", "python")
+    scheduler.remove(key)
+    assert scheduler.searches() == []
+
+
+def test_poll_counts_new_postings_once(scheduler):
+    key = scheduler.add("indeed", "python")
+    (result,) = scheduler.run_pending()
+    assert result == {"key": key, "requests": 2, "new_jobs": 2, "skipped": False}
+    assert scheduler.warehouse.known_ids() == {"in-1", "in-2"}
+    (search,) = scheduler.searches()
+    assert search["runs"] == 1 and search["interval"] == 300
+
+    (result,) = scheduler.run_pending(now=search["next_run"])
+    assert result["new_jobs"] == 0
+    (search,) = scheduler.searches()
+    assert search["interval"] == 450
+    assert scheduler.polls == ["python", "python"]
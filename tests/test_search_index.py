@@ -0,0 +1,63 @@
+import pytest
+
+from jobspy.search_index import JobSearchIndex
+
+
+def row(job_id, title, description="", company="Acme", site="indeed"):
+    return {
+        "id": job_id,
+        "site": site,
+        "title": title,
+        "company": company,
+        "description": description,
+    }
+
+
+@pytest.fixture
+def index():
+    with JobSearchIndex(":memory:") as index:
+        yield index
+
+
+def ids(results):
+    return [result["id"] for result in results]
+
+
+def test_add_update_and_delete(index):
+    index.add([row("in-1", "Python Engineer"), row("in-2", "Data Analyst")])
+    assert ids(index.search("python")) == ["in-1"]
+    index.add([row("in-1", "Rust Engineer")])
+    assert index.search("python") == []
+    assert ids(index.search("rust")) == ["in-1"]
+    assert index.count() == 2
+    assert index.delete(["in-1"]) == 1
+    assert index.search("rust") == []
+    assert index.known_ids() == {"in-2"}
+
+
+def test_title_match_outranks_description_match(index):
+    index.add(
+        [
+            row("in-1", "Data Analyst", "some kubernetes work"),
+            row("in-2", "Kubernetes Engineer", "platform team"),
+        ]
+    )
+    results = index.search("kubernetes")
+    assert ids(results) == ["in-2", "in-1"]
+    assert results[0]["rank"] < results[1]["rank"]
+
+
+def test_site_filter_and_pagination(index):
+    index.add([row(f"in-{i}", "Engineer") for i in range(3)])
+    index.add([row("li-1", "Engineer", site="linkedin")])
+    assert ids(index.search("engineer", site="linkedin")) == ["li-1"]
+    assert len(index.search("engineer", limit=2)) == 2
+    assert len(index.search("engineer", limit=2, offset=2)) == 2
+
+
+def test_invalid_query_falls_back_to_quoted_terms(index):
+    index.add([row("in-1", "C++ Engineer"), row("in-2", "Engineer")])
+    # neither "c++" nor an unbalanced paren is valid FTS5
+    assert ids(index.search("c++ engineer")) == ["in-1"]
+    assert sorted(ids(index.search("(engineer"))) == ["in-1", "in-2"]
+    assert index.count("c++ engineer") == 1
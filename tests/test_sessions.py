@@ -0,0 +1,62 @@
+from types import SimpleNamespace
+
+import requests
+import tls_client
+
+from jobspy.util import create_session
+
+PROXIES = ["10.0.0.1:8080", "10.0.0.2:8080"]
+
+
+def test_tls_session_passes_proxy_per_request(monkeypatch):
+    sent = []
+
+    def execute_request(self, method, url, **kwargs):
+        sent.append(kwargs.get("proxy"))
+        return SimpleNamespace(status_code=200, content=b"")
+
+    monkeypatch.setattr(tls_client.Session, "execute_request", execute_request)
+    session = create_session(proxies=PROXIES)
+    proxies_before = session.proxies
+    for _ in range(3):
+        session.execute_request("GET", "https://example.com")
+    assert [proxy["http"] for proxy in sent] == [
+        "http://10.0.0.1:8080",
+        "http://10.0.0.2:8080",
+        "http://10.0.0.1:8080",
+    ]
+    # the shared session itself is never pointed at a proxy
+    assert session.proxies == proxies_before
+
+
+def test_tls_session_localhost_goes_direct(monkeypatch):
+    sent = []
+
+    def execute_request(self, method, url, **kwargs):
+        sent.append(kwargs.get("proxy"))
+        return SimpleNamespace(status_code=200, content=b"")
+
+    monkeypatch.setattr(tls_client.Session, "execute_request", execute_request)
+    session = create_session(proxies=["localhost"])
+    session.execute_request("GET", "https://example.com")
+    assert sent == [None]
+
+
+def test_requests_session_passes_proxy_per_request(monkeypatch):
+    sent = []
+
+    def request(self, method, url, **kwargs):
+        sent.append(kwargs.get("proxies"))
+        response = requests.Response()
+        response.status_code = 200
+        return response
+
+    monkeypatch.setattr(requests.Session, "request", request)
+    session = create_session(proxies=PROXIES, is_tls=False)
+    for _ in range(2):
+        session.get("https://example.com")
+    assert [proxy["https"] for proxy in sent] == [
+        "http://10.0.0.1:8080",
+        "http://10.0.0.2:8080",
+    ]
+    assert not session.proxies
@@ -0,0 +1,64 @@
+from datetime import datetime
+
+from jobspy.storage import JobWarehouse
+
+FIRST = datetime(2026, 1, 1)
+LATER = datetime(2026, 1, 2)
+
+
+def row(**fields):
+    return {
+        "id": "in-1",
+        "site": "indeed",
+        "title": "Engineer",
+        "company": "Acme",
+        "description": "Build things",
+        "min_amount": 100000.0,
+        "date_posted": "2026-01-01",
+        **fields,
+    }
+
+
+def stored(warehouse):
+    (job,) = warehouse.iter_rows(
+        columns=["title", "min_amount", "unchanged", "first_seen", "last_seen"]
+    )
+    return job
+
+
+def test_unchanged_row_is_only_touched():
+    with JobWarehouse(":memory:") as warehouse:
+        warehouse.upsert([row()], seen_at=FIRST)
+        (hash_before,) = warehouse.conn.execute(
+            "SELECT content_hash FROM jobs"
+        ).fetchone()
+        assert warehouse.upsert([row(unchanged=True)], seen_at=LATER) == 1
+        job = stored(warehouse)
+        assert job["unchanged"] == 1
+        assert job["first_seen"] == FIRST.isoformat()
+        assert job["last_seen"] == LATER.isoformat()
+        (hash_after,) = warehouse.conn.execute(
+            "SELECT content_hash FROM jobs"
+        ).fetchone()
+        assert hash_after == hash_before
+
+
+def test_unchanged_description_with_new_salary_is_rewritten():
+    with JobWarehouse(":memory:") as warehouse:
+        warehouse.upsert([row()], seen_at=FIRST)
+        warehouse.upsert(
+            [row(unchanged=True, min_amount=120000.0, title="Senior Engineer")],
+            seen_at=LATER,
+        )
+        job = stored(warehouse)
+        assert job["min_amount"] == 120000.0
+        assert job["title"] == "Senior Engineer"
+        assert job["first_seen"] == FIRST.isoformat()
+        assert job["last_seen"] == LATER.isoformat()
+
+
+def test_unchanged_row_not_yet_stored_is_inserted():
+    with JobWarehouse(":memory:", batch_size=1) as warehouse:
+        assert warehouse.upsert([row(unchanged=True)], seen_at=FIRST) == 1
+        assert stored(warehouse)["title"] == "Engineer"
+        assert warehouse.count() == 1
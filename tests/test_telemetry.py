@@ -0,0 +1,35 @@
+from jobspy.telemetry import MetricsHook, ScrapeStats
+from jobspy.util import create_session
+
+
+def test_session_counts_retries_and_429s(http_server):
+    http_server.status = 429
+    stats = ScrapeStats("linkedin")
+    session = create_session(is_tls=False, has_retry=True, delay=0, stats=stats)
+    session.get(http_server.url, timeout=5)
+    counts = stats.as_dict()
+    assert http_server.hits == 4
+    assert counts["requests"] == 1
+    assert counts["retries"] == 3
+    assert counts["status_429"] == 1
+    assert counts["errors"] == 0
+
+
+def test_unanswered_request_reported_without_status():
+    class Recorder(MetricsHook):
+        def __init__(self):
+            self.statuses = []
+
+        def on_request(self, site, status_code, num_bytes, elapsed):
+            self.statuses.append(status_code)
+
+    recorder = Recorder()
+    stats = ScrapeStats("linkedin", hooks=[recorder])
+    session = create_session(is_tls=False, stats=stats)
+    try:
+        session.get("http://127.0.0.1:9/", timeout=1)
+    except Exception:
+        pass
+    counts = stats.as_dict()
+    assert counts["errors"] == 1 and counts["status_429"] == 0
+    assert recorder.statuses == [None]
@@ -0,0 +1,83 @@
+import time
+
+import pytest
+
+from jobspy.model import Site
+from jobspy.workqueue.base import Task, TaskStatus
+from jobspy.workqueue.coordinator import split_search
+from jobspy.workqueue.sqlite_queue import SQLiteTaskQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = SQLiteTaskQueue(str(tmp_path / "queue.db"), max_attempts=2)
+    yield queue
+    queue.close()
+
+
+def put_task(queue, site=Site.INDEED) -> Task:
+    task = Task.create("batch", site, {"search_term": "python"})
+    queue.put([task])
+    return task
+
+
+def test_lease_and_complete(queue):
+    task = put_task(queue)
+    leased = queue.lease("w1")
+    assert leased.id == task.id and leased.attempts == 1
+    assert queue.lease("w2") is None
+    rows = [{"id": "in-1"}, {"id": "in-2"}, {"id": None}]
+    assert queue.complete(leased, "w1", rows) == 2
+    assert queue.status("batch")[TaskStatus.DONE.value] == 1
+    assert [row["id"] for row in queue.iter_results("batch")] == ["in-1", "in-2"]
+
+
+def test_complete_skips_ids_already_in_batch(queue):
+    for _ in range(2):
+        put_task(queue)
+    first, second = queue.lease("w1"), queue.lease("w2")
+    assert queue.complete(first, "w1", [{"id": "in-1"}]) == 1
+    assert queue.complete(second, "w2", [{"id": "in-1"}, {"id": "in-2"}]) == 1
+
+
+def test_complete_after_lease_reclaimed_is_rejected(queue):
+    put_task(queue)
+    stale = queue.lease("w1", lease_seconds=0.01)
+    time.sleep(0.02)
+    current = queue.lease("w2")
+    assert current.id == stale.id and current.attempts == 2
+    assert queue.complete(stale, "w1", [{"id": "in-1"}]) is None
+    assert list(queue.iter_results("batch")) == []
+    assert queue.complete(current, "w2", [{"id": "in-2"}]) == 1
+    assert queue.status("batch")[TaskStatus.DONE.value] == 1
+
+
+def test_fail_requeues_until_out_of_attempts(queue):
+    put_task(queue)
+    queue.fail(queue.lease("w1"), "w1", "boom")
+    assert queue.status("batch")[TaskStatus.QUEUED.value] == 1
+    queue.fail(queue.lease("w1"), "w1", "boom")
+    assert queue.status("batch")[TaskStatus.FAILED.value] == 1
+    assert queue.lease("w1") is None
+
+
+def test_fail_by_former_holder_is_ignored(queue):
+    put_task(queue)
+    stale = queue.lease("w1", lease_seconds=0.01)
+    time.sleep(0.02)
+    queue.lease("w2")
+    queue.fail(stale, "w1", "late")
+    assert queue.status("batch")[TaskStatus.LEASED.value] == 1
+
+
+def test_split_search_shards_by_offset():
+    spec = {"site_name": ["linkedin", "indeed"], "results_wanted": 250, "offset": 10}
+    tasks = split_search(spec, "batch", shard_size=100)
+    shards = [
+        (task.spec["offset"], task.spec["results_wanted"])
+        for task in tasks
+        if task.site == Site.LINKEDIN
+    ]
+    assert shards == [(10, 100), (110, 100), (210, 50)]
+    indeed = [task for task in tasks if task.site == Site.INDEED]
+    assert len(indeed) == 1 and indeed[0].spec["results_wanted"] == 250
@@ -0,0 +1,63 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+import jobspy.ziprecruiter as ziprecruiter
+from jobspy.content_cache import derive_description
+from jobspy.model import ScraperInput, Site
+
+PAGE = """
+<html><body>
+<div class="job_description"><p>Build things</p></div>
+<script type="application/json">
+{"model": {"saveJobURL": "/save?job_url=https://acme.example/jobs/1"}}
+</script>
+</body></html>
+"""
+
+
+@pytest.fixture
+def scraper(monkeypatch):
+    session = SimpleNamespace(
+        headers={}, get=lambda url, **kwargs: SimpleNamespace(ok=True, text=PAGE)
+    )
+    monkeypatch.setattr(ziprecruiter, "create_session", lambda **kwargs: session)
+    monkeypatch.setattr(ziprecruiter.ZipRecruiter, "_get_cookies", lambda self: None)
+    derived = []
+
+    def counting_derive(*args, **kwargs):
+        derived.append(args[0])
+        return derive_description(*args, **kwargs)
+
+    monkeypatch.setattr(ziprecruiter, "derive_description", counting_derive)
+    scraper = ziprecruiter.ZipRecruiter()
+    scraper.derived = derived
+    return scraper
+
+
+def process(scraper, fields):
+    scraper.scraper_input = ScraperInput(site_type=[Site.ZIP_RECRUITER], fields=fields)
+    posted = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+    return scraper._process_job(
+        {
+            "name": "Engineer",
+            "listing_key": "abc",
+            "posted_time": posted,
+            "hiring_company": {"name": "Acme"},
+        }
+    )
+
+
+def test_direct_url_alone_skips_the_description(scraper):
+    job = process(scraper, ["job_url_direct"])
+    assert job.job_url_direct == "https://acme.example/jobs/1"
+    assert job.description is None
+    assert scraper.derived == []
+
+
+def test_description_is_derived_when_wanted(scraper):
+    job = process(scraper, ["description", "job_url_direct"])
+    assert job.job_url_direct == "https://acme.example/jobs/1"
+    assert "Build things" in job.description
+    assert len(scraper.derived) == 2  # the search card's, then the job page's